@@ -0,0 +1,25 @@
+"""Authentication backends for the accounts app."""
+
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class UserProfileBackend(ModelBackend):
+    """``ModelBackend`` that loads ``user.userprofile`` alongside the user.
+
+    ``AuthenticationMiddleware`` resolves ``request.user`` through the
+    backend's ``get_user()``. The navbar reads ``user.userprofile`` on every
+    authenticated page, so joining the profile here saves one SELECT per
+    request.
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related("userprofile").get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -76,3 +76,33 @@ class TestProfile:
         assert resp.status_code == 302
         user.userprofile.refresh_from_db()
         assert user.userprofile.bio == "I build things."
+
+
+@pytest.mark.django_db
+class TestAuthenticatedQueryCount:
+    def test_navbar_profile_loaded_with_user(self, client, employer, django_assert_num_queries):
+        client.force_login(employer)
+        # One for the session, one for the user joined with its profile.
+        with django_assert_num_queries(2):
+            resp = client.get(reverse("core:about"))
+        assert b"My gigs" in resp.content
+
+    def test_profile_page_reuses_joined_profile(self, client, user, django_assert_num_queries):
+        client.force_login(user)
+        with django_assert_num_queries(2):
+            client.get(reverse("accounts:profile"))
+
+    # Recovery path: get_or_create's lookup and insert are on top of the budget.
+    @pytest.mark.query_budget_exempt
+    def test_missing_profile_is_recreated(self, client, user):
+        UserProfile.objects.filter(user=user).delete()
+        client.force_login(user)
+        resp = client.get(reverse("accounts:profile"))
+        assert resp.status_code == 200
+        assert UserProfile.objects.filter(user=user).exists()
+
+    def test_inactive_user_is_anonymous(self, client, user):
+        client.force_login(user)
+        type(user).objects.filter(pk=user.pk).update(is_active=False)
+        resp = client.get(reverse("accounts:profile"))
+        assert resp.status_code == 302
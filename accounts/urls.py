@@ -1,13 +1,21 @@
 from django.contrib.auth import views as auth_views
 from django.urls import path
 
+from core.ratelimit import rate_limit
+
 from . import views
 
 app_name = "accounts"
 
 urlpatterns = [
     path("signup/", views.SignUpView.as_view(), name="signup"),
-    path("login/", auth_views.LoginView.as_view(template_name="accounts/login.html"), name="login"),
+    path(
+        "login/",
+        rate_limit("login", "ip", "username")(
+            auth_views.LoginView.as_view(template_name="accounts/login.html")
+        ),
+        name="login",
+    ),
     path("logout/", auth_views.LogoutView.as_view(), name="logout"),
     path("choose-role/", views.choose_role, name="choose_role"),
     path("profile/", views.profile_view, name="profile"),
@@ -9,13 +9,26 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import HttpResponseBadRequest
 from django.shortcuts import redirect, render
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views.decorators.http import require_http_methods
 from django.views.generic import CreateView, UpdateView
 
+from core.ratelimit import rate_limit
+
 from .forms import SignUpForm, UserProfileForm
 from .models import UserProfile
 
 
+def _profile_for(user) -> UserProfile:
+    """The user's profile (already joined by UserProfileBackend), created if missing."""
+    try:
+        return user.userprofile
+    except UserProfile.DoesNotExist:
+        # get_or_create: a concurrent request may have just made it.
+        return UserProfile.objects.get_or_create(user=user)[0]
+
+
+@method_decorator(rate_limit("signup", "ip"), name="dispatch")
 class SignUpView(CreateView):
     form_class = SignUpForm
     success_url = reverse_lazy("accounts:choose_role")
@@ -35,7 +48,7 @@ class SignUpView(CreateView):
 @login_required
 @require_http_methods(["GET", "POST"])
 def choose_role(request):
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
+    profile = _profile_for(request.user)
 
     if request.method == "POST":
         role = request.POST.get("role")
@@ -55,7 +68,7 @@ def choose_role(request):
 
 @login_required
 def profile_view(request):
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
+    profile = _profile_for(request.user)
     return render(
         request,
         "accounts/profile.html",
@@ -70,8 +83,7 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
     success_url = reverse_lazy("accounts:profile")
 
     def get_object(self, queryset=None):
-        profile, _ = UserProfile.objects.get_or_create(user=self.request.user)
-        return profile
+        return _profile_for(self.request.user)
 
     def form_valid(self, form):
         messages.success(self.request, "Profile updated.")
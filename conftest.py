@@ -6,13 +6,54 @@ from decimal import Decimal
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 
 from accounts.models import UserProfile
+from core.metrics import request_measured
 from gigs.models import Application, Gig
 
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    # Cached blocks outlive the per-test DB rollback; start every test cold.
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _enforce_query_budgets(request):
+    # RequestMetricsMiddleware reports every request made through the test
+    # client; fail the test if any view ran more queries than QUERY_BUDGETS
+    # allows. Tests that overspend on purpose opt out with the marker.
+    if request.node.get_closest_marker("query_budget_exempt"):
+        yield
+        return
+
+    overspent = []
+
+    def check(sender, metrics, **kwargs):
+        # Each test runs in a transaction, so a view's atomic() blocks become
+        # SAVEPOINT / RELEASE pairs. Served for real they are BEGIN / COMMIT,
+        # which aren't counted, so budgets leave them out.
+        queries = metrics.queries - metrics.savepoints
+        if metrics.budget is not None and queries > metrics.budget:
+            overspent.append(
+                f"{metrics.view_name} ran {queries} queries "
+                f"(budget {metrics.budget}) for {metrics.method} {metrics.path}"
+            )
+
+    request_measured.connect(check, weak=False, dispatch_uid="query_budgets")
+    try:
+        yield
+    finally:
+        request_measured.disconnect(dispatch_uid="query_budgets")
+    if overspent:
+        pytest.fail("Query budget exceeded:\n  " + "\n  ".join(overspent), pytrace=False)
+
+
 @pytest.fixture
 def user(db):
     return User.objects.create_user(
@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self) -> None:
+        # Import side-effect: register signal handlers.
+        from . import signals  # noqa: F401
+
+        if settings.REQUEST_METRICS:
+            from django.db.backends.signals import connection_created
+
+            from .metrics import install_query_timer
+
+            connection_created.connect(install_query_timer, dispatch_uid="query_timer")
@@ -0,0 +1,75 @@
+"""Helpers for async views.
+
+Under ASGI (entrypoint mode ``web-asgi``) the hot read pages (home, gig
+list, gig detail) are async views: they await the async ORM, so a slow
+query or client doesn't pin a worker thread. Under WSGI Django runs the
+same views in a one-off event loop, and their ORM calls still execute on
+the request's thread.
+
+Three Django 5.1 gaps are filled here:
+
+* ``method_decorator`` only wraps an async view correctly if the
+  decorated method is a coroutine function; ``AsyncDispatchMixin``
+  provides an async ``dispatch`` for ``name="dispatch"`` decorators.
+* ``condition()`` calls its validator functions synchronously, which
+  raises ``SynchronousOnlyOperation`` when they query. ``condition`` below
+  runs them on the request's thread with one ``sync_to_async`` call.
+* ``request.auser()`` and ``request.user`` cache the user separately, so
+  mixing them queries twice. ``auser`` shares one cache between them.
+"""
+
+from __future__ import annotations
+
+import datetime
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+async def auser(request):
+    """``request.user``, loaded with the async ORM unless already loaded."""
+    if not hasattr(request, "_cached_user"):
+        # AuthenticationMiddleware's lazy request.user reads this attribute.
+        request._cached_user = await request.auser()
+    return request.user
+
+
+class AsyncDispatchMixin:
+    """Give an async class-based view a coroutine ``dispatch`` to decorate."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        return await super().dispatch(request, *args, **kwargs)
+
+
+def condition(etag_func=None, last_modified_func=None):
+    """``django.views.decorators.http.condition`` for async views."""
+
+    def validators(request, *args, **kwargs):
+        etag = etag_func(request, *args, **kwargs) if etag_func else None
+        last_modified = None
+        if last_modified_func and (dt := last_modified_func(request, *args, **kwargs)):
+            if not timezone.is_aware(dt):
+                dt = timezone.make_aware(dt, datetime.UTC)
+            last_modified = int(dt.timestamp())
+        return (quote_etag(etag) if etag is not None else None), last_modified
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            etag, last_modified = await sync_to_async(validators)(request, *args, **kwargs)
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if request.method in ("GET", "HEAD"):
+                if last_modified and not response.has_header("Last-Modified"):
+                    response.headers["Last-Modified"] = http_date(last_modified)
+                if etag:
+                    response.headers.setdefault("ETag", etag)
+            return response
+
+        return wrapper
+
+    return decorator
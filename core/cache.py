@@ -0,0 +1,80 @@
+"""Cache helpers shared by the site's cached blocks.
+
+``cached()`` is get-or-set that also counts hits and misses. The counters
+live in the cache itself, so every worker contributes to the same numbers
+when the backend is shared (file / Redis); with the default local-memory
+backend they are per process. ``manage.py cache_stats`` prints them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from django.core.cache import cache
+
+STATS_PREFIX = "stats"
+
+# Block names whose counters ``cache_stats`` reports. Modules that define
+# cached blocks add to this at import time via ``track()``.
+TRACKED: list[str] = []
+
+_MISSING = object()
+
+
+def track(*names: str) -> None:
+    for name in names:
+        if name not in TRACKED:
+            TRACKED.append(name)
+
+
+def _stat_key(name: str, outcome: str) -> str:
+    return f"{STATS_PREFIX}:{name}:{outcome}"
+
+
+def record(name: str, *, hit: bool, count: int = 1) -> None:
+    if count <= 0:
+        return
+    key = _stat_key(name, "hits" if hit else "misses")
+    if cache.add(key, count, timeout=None):
+        return
+    try:
+        cache.incr(key, count)
+    except ValueError:
+        # Evicted between add() and incr(); losing one sample is fine.
+        cache.add(key, count, timeout=None)
+
+
+def cached(name: str, builder: Callable[[], Any], timeout: int | None) -> Any:
+    """Return the cached value for ``name``, building and storing it on a miss."""
+    value = cache.get(name, _MISSING)
+    if value is not _MISSING:
+        record(name, hit=True)
+        return value
+    record(name, hit=False)
+    value = builder()
+    cache.set(name, value, timeout)
+    return value
+
+
+def stats(names: list[str] | None = None) -> dict[str, dict[str, float]]:
+    """Hit/miss counts and hit ratio for each tracked block."""
+    names = names or TRACKED
+    keys = [_stat_key(n, o) for n in names for o in ("hits", "misses")]
+    values = cache.get_many(keys)
+    result = {}
+    for name in names:
+        hits = values.get(_stat_key(name, "hits"), 0)
+        misses = values.get(_stat_key(name, "misses"), 0)
+        total = hits + misses
+        result[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / total if total else 0.0,
+        }
+    return result
+
+
+def reset_stats(names: list[str] | None = None) -> None:
+    names = names or TRACKED
+    cache.delete_many([_stat_key(n, o) for n in names for o in ("hits", "misses")])
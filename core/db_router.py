@@ -0,0 +1,99 @@
+"""Primary/replica database routing.
+
+Writes always go to ``default``, the primary. When ``DATABASE_REPLICAS``
+lists replica aliases (configured from ``DATABASE_REPLICA_URLS``), ordinary
+reads such as listings, dashboards and admin changelists go to a random
+replica. Reads stay on the primary in three cases:
+
+* **Inside a transaction.** A transaction must see its own rows, and
+  ``select_for_update`` / ``get_or_create`` are routed as writes anyway.
+* **After a write in the same request.** ``db_for_write`` pins the rest of
+  the request to the primary.
+* **For a short window after a client's write** (read-your-writes).
+  ``ReplicaPinMiddleware`` sets a cookie for ``REPLICA_PIN_SECONDS`` once a
+  request has written anything. While the cookie is present, that client's
+  requests read from the primary. This covers the redirect after
+  ``apply_to_gig`` or ``GigCreateView``, which would otherwise race the
+  replica's lag.
+
+Sessions are always read from the primary. A session that is briefly
+missing on a replica would log the user out.
+"""
+
+from __future__ import annotations
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = "qg_primary"
+PRIMARY_ONLY_APPS = {"sessions"}
+
+_pinned: ContextVar[bool] = ContextVar("quickgigs_db_pinned", default=False)
+_wrote: ContextVar[bool] = ContextVar("quickgigs_db_wrote", default=False)
+
+
+def pinned() -> bool:
+    """True if reads in the current context must go to the primary."""
+    return _pinned.get()
+
+
+def pin_primary() -> None:
+    """Send the rest of this request's (or task's) reads to the primary."""
+    _pinned.set(True)
+
+
+@contextmanager
+def request_scope(pin: bool = False):
+    """Fresh routing state for one request; yields a callable "did it write?"."""
+    tokens = (_pinned.set(pin), _wrote.set(False))
+    try:
+        yield _wrote.get
+    finally:
+        _pinned.reset(tokens[0])
+        _wrote.reset(tokens[1])
+
+
+@contextmanager
+def use_primary():
+    """Read from the primary inside the block."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def _in_transaction() -> bool:
+    # Test cases wrap every test in atomic blocks of their own; ignore those.
+    blocks = connections[DEFAULT_DB_ALIAS].atomic_blocks
+    return any(not getattr(block, "_from_testcase", False) for block in blocks)
+
+
+class PrimaryReplicaRouter:
+    """Route reads to ``DATABASE_REPLICAS`` and everything else to ``default``."""
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            not replicas
+            or _pinned.get()
+            or model._meta.app_label in PRIMARY_ONLY_APPS
+            or _in_transaction()
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        _pinned.set(True)
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
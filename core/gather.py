@@ -0,0 +1,129 @@
+"""Run independent queries at the same time.
+
+A page that needs several unrelated result sets, such as the home page's
+blocks or ``my_gigs``' rows plus its summary aggregate, waits for the sum
+of their round trips when it runs them one after another.
+``gather(*calls)`` runs each zero-argument callable on a small per-process
+thread pool (``QUERY_GATHER_WORKERS`` threads) and returns their results
+in order. ``agather`` is the same for async views. Django's async ORM
+executes every call on the request's single thread, so awaiting several
+queries at once doesn't overlap them; handing them to the pool does.
+
+Each call runs:
+
+* in a copy of the caller's context, so replica pinning
+  (``core.db_router``) and request metrics (``core.metrics``) carry over;
+* on the worker thread's own database connection, which is recycled
+  afterwards like a request's (``close_old_connections``), so a pooled
+  connection goes straight back to the pool.
+
+Calls run one after another on the caller's thread when the pool is
+disabled (``QUERY_GATHER_WORKERS=0``), when there is a single call, or
+when the caller is inside a transaction: another connection could not see
+its uncommitted rows (this includes test cases' wrapping transaction).
+
+The request's ``RequestMetrics`` records the wall-clock time of each
+gather and the sum of its calls' own times; the difference is the saving
+(``Server-Timing: gather``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from . import metrics
+
+_executors: dict[int, ThreadPoolExecutor] = {}
+_executor_lock = threading.Lock()
+_worker = threading.local()
+
+
+def _pool() -> ThreadPoolExecutor | None:
+    size = settings.QUERY_GATHER_WORKERS
+    if size <= 0:
+        return None
+    if size not in _executors:
+        with _executor_lock:
+            if size not in _executors:
+                _executors[size] = ThreadPoolExecutor(
+                    max_workers=size, thread_name_prefix="query-gather"
+                )
+    return _executors[size]
+
+
+def _in_transaction() -> bool:
+    return any(conn.in_atomic_block for conn in connections.all(initialized_only=True))
+
+
+def _timed(call: Callable[[], Any]) -> tuple[Any, float]:
+    started = time.perf_counter()
+    return call(), (time.perf_counter() - started) * 1000
+
+
+def _on_worker(call: Callable[[], Any]) -> tuple[Any, float]:
+    _worker.active = True
+    close_old_connections()
+    try:
+        return _timed(call)
+    finally:
+        close_old_connections()
+        _worker.active = False
+
+
+def _serially(calls, pool) -> list[tuple[Any, float]] | None:
+    """Run ``calls`` here and now if they can't go to the pool, else return None."""
+    if (
+        pool is not None
+        and len(calls) > 1
+        and not _in_transaction()
+        # A gather inside a pool worker would wait on its own pool.
+        and not getattr(_worker, "active", False)
+    ):
+        return None
+    return [_timed(call) for call in calls]
+
+
+def _record(timings: list[float], wall_ms: float) -> None:
+    measured = metrics.current()
+    if measured is not None:
+        measured.record_gather(len(timings), sum(timings), wall_ms)
+
+
+def gather(*calls: Callable[[], Any]) -> list[Any]:
+    """Run ``calls`` concurrently and return their results in order."""
+    started = time.perf_counter()
+    pool = _pool()
+    results = _serially(calls, pool)
+    if results is None:
+        futures = [pool.submit(contextvars.copy_context().run, _on_worker, call) for call in calls]
+        results = [future.result() for future in futures]
+    _record([ms for _, ms in results], (time.perf_counter() - started) * 1000)
+    return [value for value, _ in results]
+
+
+async def agather(*calls: Callable[[], Any]) -> list[Any]:
+    """``gather`` for async code: the event loop waits while the pool works."""
+    started = time.perf_counter()
+    pool = _pool()
+    # Runs on the request's own thread, where its transaction is visible.
+    results = await sync_to_async(_serially)(calls, pool)
+    if results is None:
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(pool, contextvars.copy_context().run, _on_worker, call)
+                for call in calls
+            )
+        )
+    _record([ms for _, ms in results], (time.perf_counter() - started) * 1000)
+    return [value for value, _ in results]
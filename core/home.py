@@ -0,0 +1,105 @@
+"""Cached building blocks for the home page.
+
+The home page is the highest-traffic URL and every block on it is the same
+for every visitor, so each block is cached independently and dropped by
+the signals in ``core/signals.py`` when the rows behind it change. A
+short ``HOME_CACHE_TTL`` covers writes that bypass signals.
+
+``ablocks()`` is the async ``HomeView``'s way in: one ``get_many`` for
+every block, then any misses rebuilt at the same time (``core.gather``).
+"""
+
+from __future__ import annotations
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from accounts.models import UserProfile
+from gigs.models import Gig
+
+from .cache import cached, record, track
+from .gather import agather
+
+FEATURED_KEY = "home:featured_gigs"
+RECENT_KEY = "home:recent_gigs"
+GIG_COUNT_KEY = "home:total_gigs"
+PROFILE_COUNTS_KEY = "home:profile_counts"
+
+GIG_KEYS = (FEATURED_KEY, RECENT_KEY, GIG_COUNT_KEY)
+
+track(*GIG_KEYS, PROFILE_COUNTS_KEY)
+
+
+def _available_gigs():
+    return Gig.objects.available().select_related("employer")
+
+
+def _featured():
+    return _available_gigs().featured().order_by("-created_at")[:3]
+
+
+def _recent():
+    return _available_gigs().order_by("-created_at")[:6]
+
+
+ROLE_COUNTS = {
+    "employers": Count("pk", filter=Q(user_type=UserProfile.Role.EMPLOYER)),
+    "freelancers": Count("pk", filter=Q(user_type=UserProfile.Role.FREELANCER)),
+}
+
+
+def _build_profile_counts() -> dict[str, int]:
+    counts = UserProfile.objects.aggregate(**ROLE_COUNTS)
+    return {role: n or 0 for role, n in counts.items()}
+
+
+BUILDERS = {
+    FEATURED_KEY: lambda: list(_featured()),
+    RECENT_KEY: lambda: list(_recent()),
+    GIG_COUNT_KEY: lambda: _available_gigs().count(),
+    PROFILE_COUNTS_KEY: _build_profile_counts,
+}
+
+
+def featured_gigs() -> list[Gig]:
+    return cached(FEATURED_KEY, BUILDERS[FEATURED_KEY], settings.HOME_CACHE_TTL)
+
+
+def recent_gigs() -> list[Gig]:
+    return cached(RECENT_KEY, BUILDERS[RECENT_KEY], settings.HOME_CACHE_TTL)
+
+
+def total_gigs() -> int:
+    return cached(GIG_COUNT_KEY, BUILDERS[GIG_COUNT_KEY], settings.HOME_CACHE_TTL)
+
+
+def profile_counts() -> dict[str, int]:
+    return cached(PROFILE_COUNTS_KEY, BUILDERS[PROFILE_COUNTS_KEY], settings.HOME_CACHE_TTL)
+
+
+def _record_lookups(found) -> None:
+    for key in BUILDERS:
+        record(key, hit=key in found)
+
+
+async def ablocks() -> dict:
+    """Every home-page block, keyed by its cache key."""
+    blocks = await cache.aget_many(BUILDERS)
+    await sync_to_async(_record_lookups)(blocks.keys())
+    missing = [key for key in BUILDERS if key not in blocks]
+    if missing:
+        built = await agather(*(BUILDERS[key] for key in missing))
+        fresh = dict(zip(missing, built, strict=True))
+        await cache.aset_many(fresh, settings.HOME_CACHE_TTL)
+        blocks.update(fresh)
+    return blocks
+
+
+def invalidate_gigs() -> None:
+    cache.delete_many(GIG_KEYS)
+
+
+def invalidate_profiles() -> None:
+    cache.delete(PROFILE_COUNTS_KEY)
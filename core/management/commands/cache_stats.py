@@ -0,0 +1,28 @@
+"""Print hit/miss counters for the site's cached blocks."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from core import cache as block_cache
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counts and hit ratio for each cached block."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset", action="store_true", help="Zero the counters after printing."
+        )
+
+    def handle(self, *args, reset: bool, **options):
+        rows = block_cache.stats()
+        width = max((len(name) for name in rows), default=10)
+        self.stdout.write(f"{'block':<{width}}  {'hits':>8}  {'misses':>8}  hit ratio")
+        for name, row in rows.items():
+            self.stdout.write(
+                f"{name:<{width}}  {row['hits']:>8}  {row['misses']:>8}  {row['hit_ratio']:9.1%}"
+            )
+        if reset:
+            block_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
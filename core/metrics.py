@@ -0,0 +1,132 @@
+"""Per-request performance metrics.
+
+``core.middleware.RequestMetricsMiddleware`` opens a ``RequestMetrics``
+for each request and publishes it in a context variable while the view
+runs. Query timing comes from ``QueryTimer``, an ``execute_wrapper`` that
+``install_query_timer`` adds to every database connection as it opens.
+Template timing comes from ``core.template_backend``, which charges each
+top-level ``render()`` to the current request. Both look the request up
+through the context variable, so work done on ``sync_to_async`` threads
+on behalf of an async view is still counted. When the response is ready
+the middleware sends ``request_measured`` with the finished metrics.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from django.dispatch import Signal
+
+# Sent with ``metrics=RequestMetrics`` once per measured request.
+request_measured = Signal()
+
+_current: ContextVar[RequestMetrics | None] = ContextVar("request_metrics", default=None)
+
+
+@dataclass
+class RequestMetrics:
+    method: str
+    path: str
+    view_name: str = ""
+    status: int = 0
+    queries: int = 0
+    # SAVEPOINT / RELEASE / ROLLBACK TO statements, also counted in queries.
+    savepoints: int = 0
+    db_ms: float = 0.0
+    template_ms: float = 0.0
+    total_ms: float = 0.0
+    budget: int | None = None
+    # core.gather: wall-clock time of concurrent query batches, and the
+    # sum of their calls' own times (what running them in turn would cost).
+    gathered_calls: int = 0
+    gather_ms: float = 0.0
+    gather_serial_ms: float = 0.0
+    started: float = field(default_factory=time.perf_counter, repr=False)
+    # Set while a template renders, so templates rendered from inside it
+    # (e.g. cached fragments built by a tag) aren't counted twice.
+    rendering: bool = field(default=False, repr=False)
+    # Gathered queries update the counters from several threads at once.
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.queries > self.budget
+
+    def record_gather(self, calls: int, serial_ms: float, wall_ms: float) -> None:
+        with self.lock:
+            self.gathered_calls += calls
+            self.gather_serial_ms += serial_ms
+            self.gather_ms += wall_ms
+
+    def server_timing(self) -> str:
+        entries = [
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} queries"',
+            f"tpl;dur={self.template_ms:.1f}",
+            f"total;dur={self.total_ms:.1f}",
+        ]
+        if self.gathered_calls:
+            entries.append(
+                f"gather;dur={self.gather_ms:.1f};"
+                f'desc="{self.gathered_calls} calls, {self.gather_serial_ms:.1f} ms serial"'
+            )
+        return ", ".join(entries)
+
+    def log_fields(self) -> dict:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "view": self.view_name,
+            "status": self.status,
+            "queries": self.queries,
+            "db_ms": round(self.db_ms, 2),
+            "template_ms": round(self.template_ms, 2),
+            "total_ms": round(self.total_ms, 2),
+            "gather_ms": round(self.gather_ms, 2),
+            "gather_saved_ms": round(self.gather_serial_ms - self.gather_ms, 2),
+        }
+
+
+def current() -> RequestMetrics | None:
+    """The metrics of the request being handled, if it is being measured."""
+    return _current.get()
+
+
+def start(metrics: RequestMetrics):
+    return _current.set(metrics)
+
+
+def stop(token) -> None:
+    _current.reset(token)
+
+
+SAVEPOINT_STATEMENTS = ("SAVEPOINT ", "RELEASE SAVEPOINT ", "ROLLBACK TO SAVEPOINT ")
+
+
+class QueryTimer:
+    """``execute_wrapper`` that charges every query to the current request."""
+
+    def __call__(self, execute, sql, params, many, context):
+        metrics = _current.get()
+        if metrics is None:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            with metrics.lock:
+                metrics.queries += 1
+                metrics.savepoints += isinstance(sql, str) and sql.startswith(SAVEPOINT_STATEMENTS)
+                metrics.db_ms += elapsed
+
+
+query_timer = QueryTimer()
+
+
+def install_query_timer(sender, connection, **kwargs) -> None:
+    """``connection_created`` receiver: time this connection's queries."""
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
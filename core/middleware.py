@@ -0,0 +1,139 @@
+"""Middleware for the core app.
+
+Both classes are sync- and async-capable so that, under ASGI, async views
+run without a thread hop per middleware.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import db_router, metrics
+
+logger = logging.getLogger("quickgigs.metrics")
+
+
+class RequestMetricsMiddleware:
+    """Measure queries, DB time, template time and total time per request.
+
+    Results go out three ways:
+
+    * a ``Server-Timing`` header (visible in the browser's network panel);
+    * one ``quickgigs.metrics`` log line per request, with the numbers as
+      ``key=value`` pairs and as ``extra`` fields for structured handlers;
+    * the ``core.metrics.request_measured`` signal, which ``conftest.py``
+      uses to fail tests whose views exceed their ``QUERY_BUDGETS`` entry.
+
+    Enabled by ``REQUEST_METRICS=True`` (always on under pytest). Put it
+    first in ``MIDDLEWARE`` so the totals include every other middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        measured = metrics.RequestMetrics(method=request.method, path=request.path)
+        token = metrics.start(measured)
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.stop(token)
+        return self.report(request, response, measured)
+
+    async def __acall__(self, request):
+        measured = metrics.RequestMetrics(method=request.method, path=request.path)
+        token = metrics.start(measured)
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.stop(token)
+        return self.report(request, response, measured)
+
+    def report(self, request, response, measured):
+        measured.total_ms = (time.perf_counter() - measured.started) * 1000
+        measured.status = response.status_code
+        match = getattr(request, "resolver_match", None)
+        measured.view_name = match.view_name if match else ""
+        measured.budget = settings.QUERY_BUDGETS.get(measured.view_name)
+
+        response["Server-Timing"] = measured.server_timing()
+        fields = measured.log_fields()
+        message = " ".join(f"{key}={value}" for key, value in fields.items())
+        if measured.over_budget:
+            logger.warning(
+                "query budget exceeded (%s > %s) %s",
+                measured.queries,
+                measured.budget,
+                message,
+                extra=fields,
+            )
+        else:
+            logger.info("request %s", message, extra=fields)
+
+        metrics.request_measured.send(sender=self.__class__, metrics=measured)
+        return response
+
+
+class ReplicaPinMiddleware:
+    """Read-your-writes for ``core.db_router.PrimaryReplicaRouter``.
+
+    Each request starts unpinned, unless the client wrote something in the
+    last ``REPLICA_PIN_SECONDS`` (the ``qg_primary`` cookie is present). In
+    that case all of the request's reads go to the primary. A request that
+    writes gets the cookie (re)set. Without replicas this does nothing.
+
+    Place it before ``SessionMiddleware`` so session saves count as writes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        with db_router.request_scope(pin=db_router.PIN_COOKIE in request.COOKIES) as wrote:
+            response = self.get_response(request)
+            if wrote():
+                self.pin(response)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        # Writes happen on sync_to_async threads; asgiref copies their
+        # context changes back, so wrote() sees them here.
+        with db_router.request_scope(pin=db_router.PIN_COOKIE in request.COOKIES) as wrote:
+            response = await self.get_response(request)
+            if wrote():
+                self.pin(response)
+        return response
+
+    def pin(self, response):
+        response.set_cookie(
+            db_router.PIN_COOKIE,
+            "1",
+            max_age=settings.REPLICA_PIN_SECONDS,
+            httponly=True,
+            samesite="Lax",
+            secure=settings.SESSION_COOKIE_SECURE,
+        )
@@ -0,0 +1,199 @@
+"""Full-page cache for anonymous visitors.
+
+Public pages look the same to every anonymous visitor with the same URL,
+so ``cache_anonymous_page`` stores the whole rendered response and
+serves repeats without touching the view, the templates or the database.
+The cache key is the URL name, the path, and a normalised query string
+built from the gig listing's filters (``CACHED_PARAMS``) and ``page``.
+
+A request is passed straight through to the view, uncached, when:
+
+* the visitor is logged in;
+* flash messages are waiting to be shown;
+* the method isn't GET/HEAD, or the query string carries anything else
+  (e.g. ``?cursor=``);
+* the response isn't a plain 200, sets a cookie, or used a CSRF token.
+
+Any gig write bumps a generation number that is part of every key, which
+retires all cached pages at once (``invalidate()``, wired in
+``core/signals.py``). TTLs are per URL name: ``PAGE_CACHE_TTLS``, falling
+back to ``PAGE_CACHE_TTL``. ``PAGE_CACHE_TTL=0`` turns the cache off.
+Hit/miss counts appear in ``manage.py cache_stats`` as ``page:<url name>``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from .cache import record, track
+
+GENERATION_KEY = "page:generation"
+CACHED_PARAMS = (
+    "search",
+    "category",
+    "budget_min",
+    "budget_max",
+    "location",
+    "deadline_before",
+    "sort",
+    "page",
+)
+
+
+def has_pending_messages(request) -> bool:
+    """True if the messages framework has something to show on this response."""
+    storage = getattr(request, "_messages", None)
+    return storage is not None and len(storage) > 0
+
+
+def ttl(name: str) -> int:
+    if settings.PAGE_CACHE_TTL <= 0:
+        return 0
+    return settings.PAGE_CACHE_TTLS.get(name, settings.PAGE_CACHE_TTL)
+
+
+def generation() -> int:
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def invalidate() -> None:
+    """Retire every cached page."""
+    # A fresh timestamp rather than incr(): if the key is evicted, restarting
+    # from a counter could resurrect pages cached under an old generation.
+    cache.set(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def page_key(request, name: str) -> str | None:
+    """Cache key for this request, or None if its query string isn't cacheable."""
+    params = []
+    for param in request.GET:
+        if param not in CACHED_PARAMS:
+            return None
+        value = " ".join(request.GET.get(param, "").split())
+        if value and not (param == "page" and value == "1"):
+            params.append((param, value))
+    url = f"{request.path}?{urlencode(sorted(params))}"
+    digest = hashlib.md5(url.encode()).hexdigest()
+    return f"page:{generation()}:{name}:{digest}"
+
+
+def _cacheable(request, response) -> bool:
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        # The page embeds this visitor's CSRF token.
+        and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        and not has_pending_messages(request)
+    )
+
+
+def _restore(request, stored) -> HttpResponse:
+    status, content, headers = stored
+    response = HttpResponse(content, status=status)
+    for header, value in headers:
+        response[header] = value
+    # Cached pages still honour If-None-Match / If-Modified-Since.
+    response = get_conditional_response(
+        request,
+        etag=response.get("ETag"),
+        last_modified=parse_http_date_safe(response.get("Last-Modified", "")),
+        response=response,
+    )
+    response["X-Page-Cache"] = "hit"
+    return response
+
+
+def cache_anonymous_page(name: str):
+    """Cache a view's anonymous GET responses under the URL name ``name``.
+
+    Works on sync and async views.
+    """
+    stats_name = f"page:{name}"
+    track(stats_name)
+
+    def lookup(request) -> tuple[str | None, tuple | None]:
+        """(key, stored page) for this request. A None key means "don't cache"."""
+        if (
+            request.method not in ("GET", "HEAD")
+            or request.user.is_authenticated
+            or has_pending_messages(request)
+            or (key := page_key(request, name)) is None
+        ):
+            return None, None
+        stored = cache.get(key)
+        record(stats_name, hit=stored is not None)
+        return key, stored
+
+    def storer(request, key: str, timeout: int):
+        def store(response):
+            if _cacheable(request, response):
+                headers = [(h, v) for h, v in response.items() if h.lower() != "set-cookie"]
+                cache.set(key, (response.status_code, response.content, headers), timeout)
+            response["X-Page-Cache"] = "miss"
+
+        return store
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                timeout = ttl(name)
+                if timeout <= 0:
+                    return await view(request, *args, **kwargs)
+                # One thread hop for the user, messages and cache reads;
+                # Django's async cache API would hop once per call.
+                key, stored = await sync_to_async(lookup)(request)
+                if key is None:
+                    return await view(request, *args, **kwargs)
+                if stored is not None:
+                    return _restore(request, stored)
+
+                response = await view(request, *args, **kwargs)
+                store = storer(request, key, timeout)
+                if getattr(response, "is_rendered", True):
+                    await sync_to_async(store)(response)
+                else:
+                    # Django renders the response on the request's thread.
+                    response.add_post_render_callback(store)
+                return response
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            timeout = ttl(name)
+            if timeout <= 0:
+                return view(request, *args, **kwargs)
+            key, stored = lookup(request)
+            if key is None:
+                return view(request, *args, **kwargs)
+            if stored is not None:
+                return _restore(request, stored)
+
+            response = view(request, *args, **kwargs)
+            store = storer(request, key, timeout)
+            if getattr(response, "is_rendered", True):
+                store(response)
+            else:
+                response.add_post_render_callback(store)
+            return response
+
+        return wrapper
+
+    return decorator
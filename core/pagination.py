@@ -0,0 +1,158 @@
+"""Keyset (cursor) pagination.
+
+Django's ``Paginator`` pages with ``OFFSET`` and runs a ``COUNT(*)`` over
+the whole filtered set, so page N costs O(N) and every page pays for the
+count. ``CursorPaginator`` instead remembers the sort key of the last row
+it returned and asks for "rows after this key", which an index on the
+same columns answers in O(page size) no matter how deep you are. It never
+counts.
+
+Cursors are opaque url-safe tokens. They are not signed: a tampered cursor
+can only move you to a different position in the same filtered queryset.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime as dt
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from django.http import Http404
+
+
+class InvalidCursor(ValueError):
+    """Raised for cursors that don't decode against the paginator's ordering."""
+
+
+def _dump(value):
+    # Full-precision text: DjangoJSONEncoder truncates datetimes to
+    # milliseconds, which would break the equality half of the keyset.
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, dt.date):
+        return value.isoformat()
+    return value
+
+
+def _sort_key(queryset: QuerySet, name: str):
+    """The attribute and field holding sort key ``name``: a model field or an annotation."""
+    if name in queryset.query.annotations:
+        return name, queryset.query.annotations[name].output_field
+    field = queryset.model._meta.get_field(name)
+    return field.attname, field
+
+
+@dataclass
+class CursorPage:
+    object_list: list
+    next_cursor: str | None = None
+    previous_cursor: str | None = None
+    paginator: CursorPaginator | None = field(default=None, repr=False)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Page through ``queryset`` in ``ordering`` order, ``per_page`` rows at a time.
+
+    ``ordering`` must be a total order over non-null columns or annotations
+    (end it with the primary key) and should match an index for the
+    queries to stay cheap.
+    """
+
+    def __init__(self, queryset: QuerySet, ordering: Sequence[str], per_page: int):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.per_page = per_page
+        keys = [_sort_key(queryset, name.lstrip("-")) for name in self.ordering]
+        self._attnames = [attname for attname, _ in keys]
+        self._fields = [field for _, field in keys]
+
+    # -- Cursor encoding --------------------------------------------------
+
+    def encode_cursor(self, obj, direction: str) -> str:
+        """A cursor at ``obj``: a model instance, or a ``.values()`` row holding the sort keys."""
+        if isinstance(obj, dict):
+            values = [_dump(obj[attname]) for attname in self._attnames]
+        else:
+            values = [_dump(getattr(obj, attname)) for attname in self._attnames]
+        raw = json.dumps([direction, values], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> tuple[str, list]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            direction, values = json.loads(raw)
+            if direction not in ("n", "p") or len(values) != len(self._fields):
+                raise InvalidCursor(cursor)
+            return direction, [f.to_python(v) for f, v in zip(self._fields, values, strict=True)]
+        except (binascii.Error, ValueError, TypeError, ValidationError) as exc:
+            raise InvalidCursor(cursor) from exc
+
+    # -- Paging -----------------------------------------------------------
+
+    def _after(self, values: list, forward: bool) -> Q:
+        """Rows strictly after ``values`` in ordering (or before, if not ``forward``)."""
+        condition = Q()
+        equal = Q()
+        for name, value in zip(self.ordering, values, strict=True):
+            column = name.lstrip("-")
+            descending = name.startswith("-")
+            lookup = "lt" if descending == forward else "gt"
+            condition |= equal & Q(**{f"{column}__{lookup}": value})
+            equal &= Q(**{column: value})
+        return condition
+
+    def page(self, cursor: str | None = None) -> CursorPage:
+        qs = self.queryset
+        direction, values = self.decode_cursor(cursor) if cursor else ("n", None)
+        forward = direction == "n"
+
+        if values is not None:
+            qs = qs.filter(self._after(values, forward))
+        if forward:
+            qs = qs.order_by(*self.ordering)
+        else:
+            qs = qs.order_by(*(o[1:] if o.startswith("-") else f"-{o}" for o in self.ordering))
+
+        rows = list(qs[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if not forward:
+            rows.reverse()
+
+        page = CursorPage(object_list=rows, paginator=self)
+        if rows:
+            if has_more or not forward:
+                page.next_cursor = self.encode_cursor(rows[-1], "n")
+            if values is not None and (forward or has_more):
+                page.previous_cursor = self.encode_cursor(rows[0], "p")
+        return page
+
+
+def cursor_page(request, queryset: QuerySet, ordering: Sequence[str], per_page: int) -> CursorPage:
+    """The page named by ``?cursor=`` (first page if absent); 404 on a bad cursor."""
+    paginator = CursorPaginator(queryset, ordering, per_page)
+    try:
+        return paginator.page(request.GET.get("cursor") or None)
+    except InvalidCursor as exc:
+        raise Http404("Invalid cursor.") from exc
@@ -0,0 +1,170 @@
+"""Token-bucket rate limits for the expensive write paths.
+
+``rate_limit("apply", "user", "ip", "gig")`` guards a view with one bucket
+per kind of key, configured in ``settings.RATE_LIMITS["apply"]``. A rule
+``"N/period"`` (e.g. ``"10/m"``, ``"5/h"``, ``"20/10m"``) lets a burst of
+N requests through, then refills at N per period. Keys:
+
+* ``ip``: the client address (``REMOTE_ADDR``, or the last entry of the
+  header named by ``RATE_LIMIT_IP_HEADER`` behind a proxy);
+* ``gig``: the gig in the URL (``pk`` / ``gig_id``);
+* ``username``: the ``username`` field of the POST body (login);
+* ``user``: the logged-in user. Anonymous requests skip this bucket.
+
+Each bucket is one cache entry holding the time at which it will be full
+again (the GCRA form of a token bucket), so a request costs one
+``get_many`` (two with a ``user`` bucket) and, if allowed, one
+``set_many``. A request over any limit
+gets a 429 with ``Retry-After`` and takes no tokens from the others. The
+``ip``, ``gig`` and ``username`` buckets are checked before the session or
+the database is touched. ``user`` needs the session, which the view's
+``login_required`` loads anyway.
+
+Buckets live in the default cache: local memory in tests and development,
+and a shared cache (``CACHE_URL=redis://...``) in production so that every
+worker draws from the same bucket. Reads and writes aren't atomic, so
+requests racing on one bucket may let a few extra through; that is fine
+for absorbing floods. ``RATE_LIMIT_ENABLED=False`` turns it all off.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import re
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+
+logger = logging.getLogger("quickgigs.ratelimit")
+
+KEY_PREFIX = "ratelimit"
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+_RULE_RE = re.compile(r"^(\d+)/(\d*)([smhd])$")
+
+
+def parse_rule(rule: str) -> tuple[int, int]:
+    """``"20/10m"`` -> ``(20, 600)``: burst size and seconds to refill it."""
+    match = _RULE_RE.match(rule.replace(" ", ""))
+    if not match or int(match[1]) <= 0:
+        raise ImproperlyConfigured(f"Bad rate limit {rule!r}; expected e.g. '10/m' or '20/10m'.")
+    return int(match[1]), int(match[2] or 1) * PERIODS[match[3]]
+
+
+def client_ip(request) -> str:
+    header = settings.RATE_LIMIT_IP_HEADER
+    if header and (forwarded := request.META.get(header)):
+        # The last hop was added by our own proxy; earlier ones are client-supplied.
+        return forwarded.rsplit(",", 1)[-1].strip()
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _identity(kind: str, request, kwargs) -> str | None:
+    if kind == "ip":
+        return client_ip(request)
+    if kind == "gig":
+        pk = kwargs.get("pk", kwargs.get("gig_id"))
+        return None if pk is None else str(pk)
+    if kind == "username":
+        username = request.POST.get("username", "").strip().lower()
+        return username or None
+    if kind == "user":
+        return str(request.user.pk) if request.user.is_authenticated else None
+    raise ImproperlyConfigured(f"Unknown rate limit key {kind!r}.")
+
+
+def _bucket_key(scope: str, kind: str, identity: str) -> str:
+    digest = hashlib.md5(identity.encode()).hexdigest()
+    return f"{KEY_PREFIX}:{scope}:{kind}:{digest}"
+
+
+def _buckets(scope, kinds, request, kwargs) -> dict[str, tuple[int, int]]:
+    rules = settings.RATE_LIMITS.get(scope, {})
+    buckets = {}
+    for kind in kinds:
+        if kind in rules and (identity := _identity(kind, request, kwargs)) is not None:
+            buckets[_bucket_key(scope, kind, identity)] = parse_rule(rules[kind])
+    return buckets
+
+
+def _take(buckets, now: float) -> tuple[float, dict[str, float]]:
+    """Seconds to wait (0 if every bucket has a token) and the buckets' new state."""
+    full_at = cache.get_many(buckets)
+    wait = 0.0
+    updates = {}
+    for key, (burst, period) in buckets.items():
+        next_full_at = max(full_at.get(key, now), now) + period / burst
+        # More than a whole bucket's worth of refill owed: no token left.
+        if next_full_at - now > period:
+            wait = max(wait, next_full_at - period - now)
+        updates[key] = next_full_at
+    return wait, updates
+
+
+def check(scope: str, kinds: tuple[str, ...], request, kwargs=None) -> float:
+    """Take a token from each of ``scope``'s buckets for this request.
+
+    Returns 0 if the request may proceed, else the seconds until it may.
+    """
+    kwargs = kwargs or {}
+    now = time.time()
+    # The session-free buckets first, so a flood is turned away before
+    # request.user costs a query.
+    cheap = _buckets(scope, [kind for kind in kinds if kind != "user"], request, kwargs)
+    wait, updates = _take(cheap, now) if cheap else (0.0, {})
+    if wait:
+        return wait
+    per_user = _buckets(scope, ["user"], request, kwargs) if "user" in kinds else {}
+    if per_user:
+        wait, user_updates = _take(per_user, now)
+        if wait:
+            return wait
+        updates |= user_updates
+    if updates:
+        periods = [period for _, period in (cheap | per_user).values()]
+        cache.set_many(updates, timeout=max(periods))
+    return 0
+
+
+def too_many_requests(wait: float) -> HttpResponse:
+    seconds = max(1, math.ceil(wait))
+    response = HttpResponse(
+        f"Too many requests. Try again in {seconds} seconds.\n",
+        status=429,
+        content_type="text/plain; charset=utf-8",
+    )
+    response["Retry-After"] = str(seconds)
+    return response
+
+
+def rate_limit(scope: str, *kinds: str, methods: tuple[str, ...] | None = ("POST",)):
+    """Answer 429 when a request exceeds any of ``scope``'s buckets.
+
+    Only ``methods`` are limited (all methods if None). Put it outermost,
+    above ``login_required``, so the cheap buckets run before anything else.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if settings.RATE_LIMIT_ENABLED and (methods is None or request.method in methods):
+                wait = check(scope, kinds, request, kwargs)
+                if wait:
+                    logger.warning(
+                        "rate limited scope=%s path=%s ip=%s retry_after=%.1f",
+                        scope,
+                        request.path,
+                        client_ip(request),
+                        wait,
+                    )
+                    return too_many_requests(wait)
+            return view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
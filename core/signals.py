@@ -0,0 +1,38 @@
+"""Signals for the core app: drop cached home-page blocks and pages on writes.
+
+Blocks are dropped immediately and again once the transaction commits, so
+a request that rebuilt a block from pre-commit data in between can't leave
+it stale until the TTL runs out.
+"""
+
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import UserProfile
+from gigs.models import Gig
+
+from . import home, page_cache
+
+
+@receiver(post_save, sender=Gig)
+@receiver(post_delete, sender=Gig)
+def invalidate_home_gigs(sender, **kwargs):
+    home.invalidate_gigs()
+    page_cache.invalidate()
+    transaction.on_commit(home.invalidate_gigs)
+    transaction.on_commit(page_cache.invalidate)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_home_profiles(sender, update_fields=None, **kwargs):
+    # Bio/skills edits can't move the employer/freelancer counts.
+    if update_fields is not None and "user_type" not in update_fields:
+        return
+    home.invalidate_profiles()
+    page_cache.invalidate()
+    transaction.on_commit(home.invalidate_profiles)
+    transaction.on_commit(page_cache.invalidate)
@@ -0,0 +1,42 @@
+"""Django template backend that reports render time to ``core.metrics``.
+
+Identical to ``django.template.backends.django.DjangoTemplates`` except
+that each outermost ``render()`` is timed and added to the current
+request's ``template_ms``. Includes and templates rendered from inside
+another (e.g. by a template tag) are part of their parent's time. Outside
+a measured request it costs one context-variable lookup.
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.template import TemplateDoesNotExist
+from django.template.backends import django as django_backend
+
+from . import metrics
+
+
+class Template(django_backend.Template):
+    def render(self, context=None, request=None):
+        current = metrics.current()
+        if current is None or current.rendering:
+            return super().render(context, request)
+        current.rendering = True
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            current.rendering = False
+            current.template_ms += (time.perf_counter() - started) * 1000
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            django_backend.reraise(exc, self)
@@ -0,0 +1,93 @@
+"""The async read views served through Django's ASGI handler (AsyncClient)."""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+
+from core import async_views
+
+
+@pytest.fixture
+def aclient():
+    return AsyncClient()
+
+
+def get(aclient, url, **extra):
+    return async_to_sync(aclient.get)(url, **extra)
+
+
+def queries(response) -> int:
+    return int(re.search(r'desc="(\d+) queries"', response["Server-Timing"]).group(1))
+
+
+@pytest.mark.django_db
+class TestAsyncReadViews:
+    def test_home(self, aclient, gig, settings):
+        settings.PAGE_CACHE_TTL = 0
+        resp = get(aclient, reverse("core:home"))
+        assert resp.status_code == 200
+        assert gig.title in resp.content.decode()
+        assert resp.context["total_gigs"] == 1
+        # Blocks come from the cache the second time round.
+        assert queries(get(aclient, reverse("core:home"))) == 0
+
+    def test_list_pages_and_counts(self, aclient, gig):
+        resp = get(aclient, reverse("gigs:gig_list"))
+        assert resp.status_code == 200
+        assert resp.context["paginator"].count == 1
+        assert list(resp.context["gigs"]) == [gig]
+        # Query timing reaches the ORM calls made on sync_to_async threads.
+        assert queries(resp) > 0
+
+    def test_list_cursor_mode(self, aclient, gig):
+        resp = get(aclient, reverse("gigs:gig_list"), QUERY_STRING="cursor=")
+        assert resp.status_code == 200
+        assert resp.context["cursor_mode"]
+
+    def test_detail_for_logged_in_user(self, aclient, gig, freelancer, application):
+        aclient.force_login(freelancer)
+        resp = get(aclient, reverse("gigs:gig_detail", args=[gig.pk]))
+        assert resp.status_code == 200
+        assert resp.context["user_application"] == application
+        assert not resp.has_header("X-Page-Cache")
+
+    def test_detail_404(self, aclient, db):
+        assert get(aclient, reverse("gigs:gig_detail", args=[999])).status_code == 404
+
+    def test_conditional_get(self, aclient, gig):
+        url = reverse("gigs:gig_detail", args=[gig.pk])
+        etag = get(aclient, url)["ETag"]
+        assert get(aclient, url, headers={"If-None-Match": etag}).status_code == 304
+
+    def test_page_cache_hit(self, aclient, gig):
+        url = reverse("gigs:gig_list")
+        assert get(aclient, url)["X-Page-Cache"] == "miss"
+        resp = get(aclient, url)
+        assert resp["X-Page-Cache"] == "hit"
+        assert queries(resp) == 0
+
+
+@pytest.mark.django_db
+def test_auser_shares_the_sync_cache(rf, freelancer, django_assert_num_queries):
+    from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+    from django.contrib.auth.middleware import AuthenticationMiddleware
+    from django.contrib.sessions.backends.db import SessionStore
+
+    session = SessionStore()
+    session[SESSION_KEY] = str(freelancer.pk)
+    session[BACKEND_SESSION_KEY] = "accounts.backends.UserProfileBackend"
+    session[HASH_SESSION_KEY] = freelancer.get_session_auth_hash()
+    session.save()
+    request = rf.get("/")
+    request.session = SessionStore(session.session_key)
+    AuthenticationMiddleware(lambda request: None)(request)
+
+    user = async_to_sync(async_views.auser)(request)
+    assert user == freelancer
+    with django_assert_num_queries(0):
+        assert request.user.pk == freelancer.pk
@@ -0,0 +1,49 @@
+"""Tests for the DB_POOL connection settings (quickgigs_project/settings.py)."""
+
+from __future__ import annotations
+
+import copy
+
+import pytest
+
+from quickgigs_project import settings as project_settings
+
+POSTGRES = {
+    "ENGINE": "django.db.backends.postgresql",
+    "NAME": "quickgigs",
+    "USER": "quickgigs",
+    "PASSWORD": "",
+    "HOST": "localhost",
+    "PORT": "5432",
+    "OPTIONS": {},
+    "TIME_ZONE": None,
+    "AUTOCOMMIT": True,
+    "ATOMIC_REQUESTS": False,
+}
+
+
+def test_pool_builds_from_settings(monkeypatch):
+    pool_module = pytest.importorskip("psycopg_pool")
+    from django.db.backends.postgresql.base import DatabaseWrapper
+
+    monkeypatch.setenv("DB_POOL", "True")
+    db = project_settings._tune_connections(copy.deepcopy(POSTGRES))
+    assert db["CONN_MAX_AGE"] == 0
+    assert db["CONN_HEALTH_CHECKS"] is True
+
+    # Django builds the pool lazily and without connecting (open=False).
+    wrapper = DatabaseWrapper(db, alias="pool_settings_test")
+    try:
+        pool = wrapper.pool
+        assert isinstance(pool, pool_module.ConnectionPool)
+        assert pool.max_size == project_settings.env("DB_POOL_MAX_SIZE")
+    finally:
+        DatabaseWrapper._connection_pools.pop("pool_settings_test", None)
+
+
+def test_persistent_connections_without_pool(monkeypatch):
+    monkeypatch.setenv("DB_POOL", "False")
+    db = project_settings._tune_connections(copy.deepcopy(POSTGRES))
+    assert "pool" not in db["OPTIONS"]
+    assert db["CONN_MAX_AGE"] == project_settings.env("DB_CONN_MAX_AGE")
+    assert db["CONN_HEALTH_CHECKS"] is True
@@ -0,0 +1,105 @@
+"""Tests for primary/replica routing (core/db_router.py).
+
+The test settings define a ``replica`` alias backed by its own SQLite file
+that never receives the primary's writes, i.e. a replica with infinite lag.
+Whichever database served a read is therefore visible in the response.
+"""
+
+from __future__ import annotations
+
+import pytest
+from django.db import transaction
+from django.urls import reverse
+
+from accounts.models import UserProfile
+from core import db_router
+from gigs.models import Gig
+
+pytestmark = pytest.mark.django_db(databases=["default", "replica"])
+
+router = db_router.PrimaryReplicaRouter()
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+    # Keep whole-page caching out of the way of reads we want to observe.
+    settings.PAGE_CACHE_TTL = 0
+
+
+def replicate(*objs):
+    """Copy rows to the replica, as replication eventually would."""
+    for obj in objs:
+        type(obj).objects.using("replica").bulk_create([obj])
+
+
+def replicate_user(user):
+    replicate(user, UserProfile.objects.get(user=user))
+
+
+class TestRouter:
+    def test_everything_on_primary_without_replicas(self):
+        assert router.db_for_read(Gig) == "default"
+
+    def test_reads_go_to_replica(self, replicas):
+        with db_router.request_scope():
+            assert router.db_for_read(Gig) == "replica"
+
+    def test_write_pins_rest_of_request(self, replicas):
+        with db_router.request_scope() as wrote:
+            assert router.db_for_write(Gig) == "default"
+            assert wrote()
+            assert router.db_for_read(Gig) == "default"
+        with db_router.request_scope():
+            assert router.db_for_read(Gig) == "replica"
+
+    def test_reads_inside_transaction_stay_on_primary(self, replicas):
+        with db_router.request_scope(), transaction.atomic():
+            assert router.db_for_read(Gig) == "default"
+
+    def test_sessions_stay_on_primary(self, replicas):
+        from django.contrib.sessions.models import Session
+
+        with db_router.request_scope():
+            assert router.db_for_read(Session) == "default"
+
+    def test_use_primary(self, replicas):
+        with db_router.request_scope():
+            with db_router.use_primary():
+                assert router.db_for_read(Gig) == "default"
+            assert router.db_for_read(Gig) == "replica"
+
+
+class TestRouting:
+    def test_listing_reads_replica(self, client, gig, replicas):
+        assert gig.title not in client.get(reverse("gigs:gig_list")).content.decode()
+
+        replicate_user(gig.employer)
+        replicate(gig)
+        assert gig.title in client.get(reverse("gigs:gig_list")).content.decode()
+
+    def test_reads_follow_a_write_to_the_primary(self, client, gig, freelancer, replicas):
+        replicate_user(gig.employer)
+        replicate_user(freelancer)
+        replicate(gig)
+        client.force_login(freelancer)
+
+        resp = client.post(
+            reverse("gigs:apply_to_gig", args=[gig.pk]),
+            {"cover_letter": "I've built plenty of these; happy to start this week."},
+        )
+        assert resp.status_code == 302
+        assert db_router.PIN_COOKIE in resp.cookies
+
+        # Pinned: the new application is read back from the primary.
+        page = client.get(reverse("gigs:my_applications")).content.decode()
+        assert gig.title in page
+
+        # Once the pin lapses the (lagging) replica answers.
+        del client.cookies[db_router.PIN_COOKIE]
+        page = client.get(reverse("gigs:my_applications")).content.decode()
+        assert gig.title not in page
+
+    def test_reads_alone_do_not_pin(self, client, gig, replicas):
+        resp = client.get(reverse("gigs:gig_list"))
+        assert db_router.PIN_COOKIE not in resp.cookies
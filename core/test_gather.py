@@ -0,0 +1,91 @@
+"""Tests for core/gather.py."""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from core import metrics
+from core.gather import agather, gather
+from gigs.models import Gig
+
+marker: contextvars.ContextVar[str] = contextvars.ContextVar("marker", default="")
+
+
+def nap(value, seconds=0.1):
+    def call():
+        time.sleep(seconds)
+        return value
+
+    return call
+
+
+# Transactional, so calls can leave the test's thread: pool workers recycle
+# their connections around each call.
+@pytest.mark.django_db(transaction=True)
+class TestGather:
+    def test_results_in_order(self):
+        assert gather(nap(1, 0.05), nap(2, 0.01), nap(3, 0)) == [1, 2, 3]
+
+    def test_calls_overlap(self):
+        started = time.perf_counter()
+        gather(nap("a"), nap("b"), nap("c"))
+        assert time.perf_counter() - started < 0.25
+
+    def test_async_calls_overlap(self):
+        started = time.perf_counter()
+        assert async_to_sync(agather)(nap("a"), nap("b"), nap("c")) == ["a", "b", "c"]
+        assert time.perf_counter() - started < 0.25
+
+    def test_disabled_pool_runs_in_turn(self, settings):
+        settings.QUERY_GATHER_WORKERS = 0
+        threads = gather(threading.get_ident, threading.get_ident)
+        assert threads == [threading.get_ident()] * 2
+
+    def test_context_is_copied(self):
+        marker.set("request-1")
+        assert gather(marker.get, marker.get) == ["request-1", "request-1"]
+
+    def test_nested_gather_does_not_deadlock(self, settings):
+        settings.QUERY_GATHER_WORKERS = 1
+        assert gather(lambda: gather(nap(1, 0), nap(2, 0)), nap(3, 0)) == [[1, 2], 3]
+
+    def test_errors_propagate(self):
+        def boom():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            gather(nap(1, 0), boom)
+
+    def test_timing_is_recorded(self):
+        measured = metrics.RequestMetrics(method="GET", path="/")
+        token = metrics.start(measured)
+        try:
+            gather(nap(1), nap(2), nap(3))
+        finally:
+            metrics.stop(token)
+        assert measured.gathered_calls == 3
+        assert measured.gather_serial_ms >= 300
+        assert measured.gather_ms < measured.gather_serial_ms
+        assert 'desc="3 calls' in measured.server_timing()
+
+
+@pytest.mark.django_db
+def test_runs_in_turn_inside_a_transaction(gig):
+    # Another connection couldn't see the test's uncommitted gig.
+    counts = gather(lambda: Gig.objects.count(), lambda: Gig.objects.filter(pk=gig.pk).count())
+    assert counts == [1, 1]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_queries_run_on_worker_connections(gig):
+    def count_with_thread():
+        return Gig.objects.count(), threading.get_ident()
+
+    (first, t1), (second, t2) = gather(count_with_thread, count_with_thread)
+    assert first == second == 1
+    assert threading.get_ident() not in (t1, t2)
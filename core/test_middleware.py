@@ -0,0 +1,88 @@
+"""Tests for RequestMetricsMiddleware."""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+from django.db import transaction
+from django.urls import reverse
+
+from core import metrics as request_metrics
+from core.metrics import request_measured
+from gigs.models import Gig
+
+
+@pytest.fixture
+def measured():
+    seen = []
+
+    def record(sender, metrics, **kwargs):
+        seen.append(metrics)
+
+    request_measured.connect(record, weak=False, dispatch_uid="test_measured")
+    yield seen
+    request_measured.disconnect(dispatch_uid="test_measured")
+
+
+@pytest.fixture
+def metrics_log(caplog):
+    # "quickgigs" doesn't propagate to the root logger caplog listens on.
+    logger = logging.getLogger("quickgigs.metrics")
+    logger.addHandler(caplog.handler)
+    caplog.set_level(logging.INFO, logger="quickgigs.metrics")
+    yield caplog
+    logger.removeHandler(caplog.handler)
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+    def test_server_timing_header(self, client, gig):
+        resp = client.get(reverse("gigs:gig_list"))
+        timing = resp["Server-Timing"]
+        assert timing.startswith("db;dur=")
+        assert "tpl;dur=" in timing
+        assert "total;dur=" in timing
+
+    def test_counts_queries_and_template_time(self, client, gig, measured):
+        client.get(reverse("gigs:gig_detail", args=[gig.pk]))
+        (metrics,) = measured
+        assert metrics.view_name == "gigs:gig_detail"
+        assert metrics.status == 200
+        assert metrics.queries >= 1
+        assert metrics.template_ms > 0
+        assert metrics.total_ms >= metrics.template_ms
+        assert f'desc="{metrics.queries} queries"' in metrics.server_timing()
+
+    def test_counts_savepoints_separately(self):
+        metrics = request_metrics.RequestMetrics(method="GET", path="/")
+        token = request_metrics.start(metrics)
+        try:
+            # Inside the test's transaction, atomic() is a savepoint pair.
+            with transaction.atomic():
+                Gig.objects.count()
+        finally:
+            request_metrics.stop(token)
+        assert (metrics.queries, metrics.savepoints) == (3, 2)
+
+    def test_logs_one_line_per_request(self, client, metrics_log):
+        client.get(reverse("core:about"))
+        (record,) = metrics_log.records
+        assert "view=core:about" in record.getMessage()
+        assert record.status == 200
+        assert record.queries == 0
+
+    @pytest.mark.query_budget_exempt
+    def test_over_budget_logs_warning(self, client, gig, settings, metrics_log, measured):
+        settings.QUERY_BUDGETS = {"gigs:gig_list": 0}
+        client.get(reverse("gigs:gig_list"))
+        assert measured[0].over_budget
+        (record,) = metrics_log.records
+        assert record.levelno == logging.WARNING
+        assert "query budget exceeded" in record.getMessage()
+
+    def test_unmeasured_render_is_untouched(self, measured):
+        from django.template.loader import render_to_string
+
+        assert "QuickGigs" in render_to_string("core/about.html")
+        assert measured == []
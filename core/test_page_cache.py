@@ -0,0 +1,142 @@
+"""Tests for the anonymous full-page cache (core/page_cache.py)."""
+
+from __future__ import annotations
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.cache import SessionStore
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory
+from django.urls import reverse
+
+from core import page_cache
+from core.cache import stats
+from gigs.models import Gig
+
+
+def _anonymous(path="/somewhere/", **params):
+    request = RequestFactory().get(path, params)
+    request.user = AnonymousUser()
+    return request
+
+
+@pytest.mark.django_db
+class TestAnonymousPageCache:
+    def test_repeat_visit_served_without_queries(self, client, gig, django_assert_num_queries):
+        url = reverse("gigs:gig_list")
+        assert client.get(url)["X-Page-Cache"] == "miss"
+        with django_assert_num_queries(0):
+            resp = client.get(url)
+        assert resp["X-Page-Cache"] == "hit"
+        assert gig.title.encode() in resp.content
+        assert "Cookie" in resp["Vary"]
+        assert stats(["page:gigs:gig_list"])["page:gigs:gig_list"]["hits"] == 1
+
+    def test_logged_in_visitors_bypass(self, client, gig, freelancer):
+        client.force_login(freelancer)
+        url = reverse("gigs:gig_list")
+        client.get(url)
+        assert not client.get(url).has_header("X-Page-Cache")
+
+    def test_gig_write_retires_cached_pages(self, client, gig):
+        url = reverse("gigs:gig_detail", args=[gig.pk])
+        client.get(url)
+        gig.title = "Renamed gig"
+        gig.save()
+        resp = client.get(url)
+        assert resp["X-Page-Cache"] == "miss"
+        assert b"Renamed gig" in resp.content
+
+    def test_cached_page_still_answers_304(self, client, gig):
+        url = reverse("gigs:gig_detail", args=[gig.pk])
+        etag = client.get(url)["ETag"]
+        resp = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert resp.status_code == 304
+        assert resp["X-Page-Cache"] == "hit"
+
+    def test_ttl_zero_disables(self, client, gig, settings):
+        settings.PAGE_CACHE_TTLS = {"gigs:gig_list": 0}
+        url = reverse("gigs:gig_list")
+        client.get(url)
+        assert not client.get(url).has_header("X-Page-Cache")
+
+
+@pytest.mark.django_db
+class TestPageKey:
+    def test_query_string_is_normalised(self):
+        a = page_cache.page_key(_anonymous(search="  landing   page ", category="web_dev"), "v")
+        b = page_cache.page_key(_anonymous(category="web_dev", search="landing page"), "v")
+        assert a == b
+
+    def test_first_page_is_the_bare_url(self):
+        assert page_cache.page_key(_anonymous(page="1"), "v") == page_cache.page_key(
+            _anonymous(), "v"
+        )
+        assert page_cache.page_key(_anonymous(page="2"), "v") != page_cache.page_key(
+            _anonymous(), "v"
+        )
+
+    def test_other_parameters_are_not_cached(self):
+        assert page_cache.page_key(_anonymous(cursor="abc"), "v") is None
+
+    def test_invalidate_changes_every_key(self):
+        before = page_cache.page_key(_anonymous(), "v")
+        page_cache.invalidate()
+        assert page_cache.page_key(_anonymous(), "v") != before
+
+
+@pytest.mark.django_db
+class TestUncacheableResponses:
+    def _view(self, body):
+        calls = []
+
+        @page_cache.cache_anonymous_page("test:view")
+        def view(request):
+            calls.append(request)
+            return body(request)
+
+        return view, calls
+
+    def test_pending_messages_bypass(self):
+        view, calls = self._view(lambda request: HttpResponse("ok"))
+        request = _anonymous()
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        request._messages.add(20, "Saved!")
+        view(request)
+        view(request)
+        assert len(calls) == 2
+
+    def test_pages_with_a_csrf_token_are_not_stored(self):
+        def body(request):
+            return HttpResponse(get_token(request))
+
+        view, calls = self._view(body)
+        view(_anonymous())
+        view(_anonymous())
+        assert len(calls) == 2
+
+    def test_errors_are_not_stored(self):
+        view, calls = self._view(lambda request: HttpResponse(status=500))
+        view(_anonymous())
+        view(_anonymous())
+        assert len(calls) == 2
+
+    def test_plain_page_is_stored(self):
+        view, calls = self._view(lambda request: HttpResponse("ok"))
+        view(_anonymous())
+        assert view(_anonymous()).content == b"ok"
+        assert len(calls) == 1
+
+
+def test_featured_expiry_retires_pages(db, gig):
+    from django.utils import timezone
+
+    from gigs.featured import expire_featured
+
+    Gig.objects.filter(pk=gig.pk).update(is_featured=True, featured_until=timezone.now())
+    before = page_cache.page_key(_anonymous(), "v")
+    expire_featured()
+    assert page_cache.page_key(_anonymous(), "v") != before
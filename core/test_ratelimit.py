@@ -0,0 +1,125 @@
+"""Tests for core/ratelimit.py and the views it guards."""
+
+from __future__ import annotations
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse
+
+from core import ratelimit
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(ratelimit.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def limits(settings):
+    settings.RATE_LIMITS = {"test": {"ip": "3/m", "gig": "5/m", "user": "2/m"}}
+    return settings.RATE_LIMITS
+
+
+class TestParseRule:
+    @pytest.mark.parametrize(
+        "rule, parsed",
+        [("10/m", (10, 60)), ("5/h", (5, 3600)), ("20/10m", (20, 600)), ("1 / s", (1, 1))],
+    )
+    def test_valid(self, rule, parsed):
+        assert ratelimit.parse_rule(rule) == parsed
+
+    @pytest.mark.parametrize("rule", ["10", "0/m", "ten/m", "5/w"])
+    def test_invalid(self, rule):
+        with pytest.raises(ImproperlyConfigured):
+            ratelimit.parse_rule(rule)
+
+
+class TestBucket:
+    def test_burst_then_refill(self, rf, clock, limits):
+        request = rf.post("/")
+        assert [ratelimit.check("test", ("ip",), request) for _ in range(3)] == [0, 0, 0]
+        assert ratelimit.check("test", ("ip",), request) == pytest.approx(20)
+        clock[0] += 20
+        assert ratelimit.check("test", ("ip",), request) == 0
+        assert ratelimit.check("test", ("ip",), request) == pytest.approx(20)
+
+    def test_buckets_are_per_key(self, rf, clock, limits):
+        for _ in range(3):
+            ratelimit.check("test", ("ip",), rf.post("/"))
+        other = rf.post("/", REMOTE_ADDR="10.0.0.2")
+        assert ratelimit.check("test", ("ip",), other) == 0
+
+    def test_rejected_request_takes_no_tokens(self, rf, clock, limits):
+        request = rf.post("/")
+        for pk in range(3):
+            ratelimit.check("test", ("ip", "gig"), request, {"pk": pk})
+        assert ratelimit.check("test", ("ip", "gig"), request, {"pk": 0})
+        # The gig buckets were untouched by the refusal: 4 more fit in gig 0's 5.
+        for _ in range(4):
+            assert ratelimit.check("test", ("gig",), request, {"pk": 0}) == 0
+        assert ratelimit.check("test", ("gig",), request, {"pk": 0})
+
+    def test_user_bucket_skips_anonymous(self, rf, clock, limits):
+        from django.contrib.auth.models import AnonymousUser
+
+        request = rf.post("/")
+        request.user = AnonymousUser()
+        assert all(ratelimit.check("test", ("user",), request) == 0 for _ in range(5))
+
+    def test_forwarded_header(self, rf, settings):
+        settings.RATE_LIMIT_IP_HEADER = "HTTP_X_FORWARDED_FOR"
+        request = rf.post("/", HTTP_X_FORWARDED_FOR="1.1.1.1, 203.0.113.9")
+        assert ratelimit.client_ip(request) == "203.0.113.9"
+
+
+@pytest.mark.django_db
+class TestGuardedViews:
+    def test_apply_flood_gets_429_before_any_query(
+        self, client, gig, settings, django_assert_num_queries
+    ):
+        settings.RATE_LIMITS = {"apply": {"gig": "2/m"}}
+        url = reverse("gigs:apply_to_gig", kwargs={"pk": gig.pk})
+        for _ in range(2):
+            client.post(url, {"cover_letter": "x" * 60})
+        with django_assert_num_queries(0):
+            resp = client.post(url, {"cover_letter": "x" * 60})
+        assert resp.status_code == 429
+        assert int(resp["Retry-After"]) == 30
+
+    def test_apply_per_user(self, client, gig, freelancer, settings):
+        settings.RATE_LIMITS = {"apply": {"user": "1/h"}}
+        client.force_login(freelancer)
+        url = reverse("gigs:apply_to_gig", kwargs={"pk": gig.pk})
+        assert client.post(url, {"cover_letter": "x" * 60}).status_code == 302
+        assert client.post(url, {"cover_letter": "x" * 60}).status_code == 429
+        # GETs aren't limited.
+        assert client.get(url).status_code == 302
+
+    def test_login_per_username(self, client, settings, db):
+        settings.RATE_LIMITS = {"login": {"username": "2/m"}}
+        url = reverse("accounts:login")
+        for _ in range(2):
+            assert client.post(url, {"username": "Alice", "password": "x"}).status_code == 200
+        assert client.post(url, {"username": "alice", "password": "y"}).status_code == 429
+        assert client.post(url, {"username": "bob", "password": "y"}).status_code == 200
+
+    def test_signup_per_ip(self, client, settings):
+        settings.RATE_LIMITS = {"signup": {"ip": "1/h"}}
+        url = reverse("accounts:signup")
+        client.post(url, {"username": "spam1"})
+        assert client.post(url, {"username": "spam2"}).status_code == 429
+
+    def test_checkout_any_method(self, client, gig, settings):
+        settings.RATE_LIMITS = {"checkout": {"user": "1/h"}}
+        client.force_login(gig.employer)
+        url = reverse("payments:feature_gig_checkout", kwargs={"gig_id": gig.pk})
+        client.get(url)
+        assert client.get(url).status_code == 429
+
+    def test_disabled(self, client, gig, settings):
+        settings.RATE_LIMIT_ENABLED = False
+        settings.RATE_LIMITS = {"apply": {"gig": "1/h"}}
+        url = reverse("gigs:apply_to_gig", kwargs={"pk": gig.pk})
+        assert [client.post(url).status_code for _ in range(3)] == [302] * 3
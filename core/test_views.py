@@ -5,6 +5,9 @@ from __future__ import annotations
 import pytest
 from django.urls import reverse
 
+from core import cache as block_cache
+from core import home
+
 
 @pytest.mark.django_db
 class TestStaticPages:
@@ -21,3 +24,39 @@ class TestStaticPages:
     def test_home_includes_site_meta_context(self, client):
         resp = client.get(reverse("core:home"))
         assert b"QuickGigs" in resp.content
+
+
+@pytest.mark.django_db
+class TestHomeCache:
+    def test_second_hit_served_from_cache(self, client, gig, django_assert_num_queries):
+        client.get(reverse("core:home"))
+        with django_assert_num_queries(0):
+            resp = client.get(reverse("core:home"))
+        assert gig.title.encode() in resp.content
+
+    def test_gig_save_invalidates(self, client, gig):
+        client.get(reverse("core:home"))
+        gig.title = "Renamed gig"
+        gig.save()
+        resp = client.get(reverse("core:home"))
+        assert b"Renamed gig" in resp.content
+
+    def test_gig_delete_invalidates(self, client, gig):
+        client.get(reverse("core:home"))
+        gig.delete()
+        resp = client.get(reverse("core:home"))
+        assert resp.context["total_gigs"] == 0
+
+    def test_role_change_invalidates_profile_counts(self, client, user):
+        assert client.get(reverse("core:home")).context["total_employers"] == 0
+        user.userprofile.user_type = "employer"
+        user.userprofile.save(update_fields=["user_type", "updated_at"])
+        assert client.get(reverse("core:home")).context["total_employers"] == 1
+
+    def test_hit_and_miss_counters(self, client, db, settings):
+        # Exercise the blocks, not the anonymous page cache in front of them.
+        settings.PAGE_CACHE_TTL = 0
+        client.get(reverse("core:home"))
+        client.get(reverse("core:home"))
+        row = block_cache.stats([home.RECENT_KEY])[home.RECENT_KEY]
+        assert (row["hits"], row["misses"], row["hit_ratio"]) == (1, 1, 0.5)
@@ -2,36 +2,38 @@
 
 from __future__ import annotations
 
-from django.db.models import Count, Q
+from django.utils.decorators import method_decorator
 from django.views.generic import TemplateView
 
-from accounts.models import UserProfile
-from gigs.models import Gig
+from . import home
+from .async_views import AsyncDispatchMixin
+from .page_cache import cache_anonymous_page
 
 
-class HomeView(TemplateView):
+@method_decorator(cache_anonymous_page("core:home"), name="dispatch")
+class HomeView(AsyncDispatchMixin, TemplateView):
     template_name = "core/home.html"
 
-    def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
-
-        active = Gig.objects.filter(is_active=True).select_related("employer")
-        ctx["featured_gigs"] = list(active.filter(is_featured=True).order_by("-created_at")[:3])
-        ctx["recent_gigs"] = list(active.order_by("-created_at")[:6])
-
-        profile_counts = UserProfile.objects.aggregate(
-            employers=Count("pk", filter=Q(user_type="employer")),
-            freelancers=Count("pk", filter=Q(user_type="freelancer")),
+    async def get(self, request, *args, **kwargs):
+        # Each block is cached and invalidated on its own — see core/home.py.
+        blocks = await home.ablocks()
+        profile_counts = blocks[home.PROFILE_COUNTS_KEY]
+        context = self.get_context_data(
+            featured_gigs=blocks[home.FEATURED_KEY],
+            recent_gigs=blocks[home.RECENT_KEY],
+            total_gigs=blocks[home.GIG_COUNT_KEY],
+            total_employers=profile_counts["employers"],
+            total_freelancers=profile_counts["freelancers"],
+            **kwargs,
         )
-        ctx["total_gigs"] = active.count()
-        ctx["total_employers"] = profile_counts["employers"] or 0
-        ctx["total_freelancers"] = profile_counts["freelancers"] or 0
-        return ctx
+        return self.render_to_response(context)
 
 
+@method_decorator(cache_anonymous_page("core:about"), name="dispatch")
 class AboutView(TemplateView):
     template_name = "core/about.html"
 
 
+@method_decorator(cache_anonymous_page("core:contact"), name="dispatch")
 class ContactView(TemplateView):
     template_name = "core/contact.html"
@@ -1,6 +1,10 @@
 """Admin registrations for the gigs app."""
 
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib import admin
+from django.utils import timezone
 
 from .models import Application, Gig
 
@@ -14,6 +18,9 @@ class GigAdmin(admin.ModelAdmin):
         "category",
         "is_active",
         "is_featured",
+        "featured_until",
+        "application_count",
+        "pending_count",
         "created_at",
     )
     list_filter = ("category", "is_active", "is_featured", "created_at")
@@ -23,6 +30,12 @@ class GigAdmin(admin.ModelAdmin):
     ordering = ("-created_at",)
     autocomplete_fields = ("employer",)
 
+    def save_model(self, request, obj, form, change):
+        # Featuring by hand gets the same lifetime as a paid upgrade.
+        if obj.is_featured and obj.featured_until is None:
+            obj.featured_until = timezone.now() + timedelta(days=settings.FEATURED_GIG_DAYS)
+        super().save_model(request, obj, form, change)
+
 
 @admin.register(Application)
 class ApplicationAdmin(admin.ModelAdmin):
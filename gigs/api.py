@@ -0,0 +1,192 @@
+"""Read-only JSON API for gigs, version 1 (``/api/v1/``).
+
+* ``gigs/``: available gigs, live featured ones first, with the HTML
+  listing's filters (``gigs/listing.py``: ``search``, ``category``,
+  ``budget_min``, ``budget_max``, ``location``, ``deadline_before``,
+  ``sort``). Paged by cursor (``next`` / ``previous`` URLs in the body),
+  ``limit`` rows at a time (default 20, at most 100). ``sort=closing``
+  pages in the default order, as the listing's cursor pages do. A gig
+  whose feature lapses mid-way through paging may be skipped or repeated.
+* ``gigs/<id>/``: one available gig.
+* ``categories/``: every category with its number of available gigs,
+  from the listing's cached facet counts.
+
+``fields=title,budget,...`` picks the fields of each gig (``FIELDS``);
+without it lists leave out ``description``. Rows come straight from
+``.values()`` with only the columns asked for, and are sent as compact
+JSON. Errors are ``{"error": "..."}`` with a 400 or 404.
+
+Responses carry an ETag built from the data they show (the number of
+gigs matched and their newest ``updated_at``, or the one gig's
+``updated_at``), the page cache's generation, today's date and the query
+string. The generation alone isn't enough: with a per-process cache,
+another worker's writes don't bump it. A revalidation (``If-None-Match``)
+is answered 304 after that one indexed aggregate. ``application_count``
+and the like aren't exposed: they change without touching ``updated_at``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from urllib.parse import urlencode
+
+from django.db.models import Count, Max
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import condition, require_safe
+
+from core import page_cache
+from core.pagination import CursorPaginator, InvalidCursor
+
+from . import facets, listing
+from .models import Gig
+
+# Public name -> .values() lookup.
+FIELDS = {
+    "id": "id",
+    "title": "title",
+    "description": "description",
+    "budget": "budget",
+    "location": "location",
+    "category": "category",
+    "deadline": "deadline",
+    "days_left": "days_left",
+    "is_featured": "featured_now",
+    "employer": "employer__username",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+}
+LIST_FIELDS = tuple(name for name in FIELDS if name != "description")
+# As GigListView.cursor_ordering: featured_now follows the clock, so a
+# feature lapsing between two page requests can skip or repeat that gig.
+CURSOR_ORDERING = ("-featured_now", "-created_at", "id")
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+JSON_PARAMS = {"separators": (",", ":")}
+
+
+class BadRequest(ValueError):
+    """A query parameter the API can't honour; answered with a 400."""
+
+
+def _json(data, status: int = 200) -> JsonResponse:
+    return JsonResponse(data, status=status, json_dumps_params=JSON_PARAMS)
+
+
+def _error(message: str, status: int) -> JsonResponse:
+    return _json({"error": message}, status=status)
+
+
+def _fields(request, default: tuple[str, ...]) -> list[str]:
+    raw = request.GET.get("fields", "")
+    if not raw.strip():
+        return list(default)
+    names = list(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    unknown = [name for name in names if name not in FIELDS]
+    if unknown:
+        raise BadRequest(
+            f"Unknown field(s): {', '.join(unknown)}. Choose from: {', '.join(FIELDS)}."
+        )
+    return names
+
+
+def _limit(request) -> int:
+    raw = request.GET.get("limit", "")
+    if not raw:
+        return DEFAULT_LIMIT
+    if not raw.isdigit() or not 1 <= int(raw) <= MAX_LIMIT:
+        raise BadRequest(f"limit must be a whole number from 1 to {MAX_LIMIT}.")
+    return int(raw)
+
+
+def _rows(queryset, fields: list[str], extra: tuple[str, ...] = ()):
+    """``.values()`` of ``fields`` plus the ``extra`` columns paging needs."""
+    lookups = list(
+        dict.fromkeys([FIELDS[name] for name in fields] + [c.lstrip("-") for c in extra])
+    )
+    return queryset.values(*lookups)
+
+
+def _shape(row: dict, fields: list[str]) -> dict:
+    return {name: row[FIELDS[name]] for name in fields}
+
+
+def _page_url(request, cursor: str | None) -> str | None:
+    if cursor is None:
+        return None
+    params = request.GET.copy()
+    params["cursor"] = cursor
+    return request.build_absolute_uri(f"{request.path}?{urlencode(sorted(params.items()))}")
+
+
+def _etag(request, queryset) -> str:
+    """ETag for a response built from ``queryset`` (see the module docstring)."""
+    state = queryset.order_by().aggregate(count=Count("pk"), last=Max("updated_at"))
+    parts = [
+        state["count"],
+        state["last"],
+        page_cache.generation(),
+        timezone.now().date(),
+        request.path,
+        sorted(request.GET.lists()),
+    ]
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def gig_list_etag(request) -> str:
+    return _etag(request, listing.apply(Gig.objects.available(), listing.parse(request.GET)))
+
+
+def gig_detail_etag(request, pk: int) -> str:
+    return _etag(request, Gig.objects.available().filter(pk=pk))
+
+
+def categories_etag(request) -> str:
+    return _etag(request, Gig.objects.available())
+
+
+@require_safe
+@condition(etag_func=gig_list_etag)
+def gig_list(request):
+    try:
+        fields = _fields(request, LIST_FIELDS)
+        limit = _limit(request)
+    except BadRequest as exc:
+        return _error(str(exc), 400)
+    filters = listing.parse(request.GET)
+    ordering = listing.cursor_ordering(filters) or CURSOR_ORDERING
+    rows = _rows(listing.apply(Gig.objects.available(), filters), fields, ordering)
+    paginator = CursorPaginator(rows, ordering, limit)
+    try:
+        page = paginator.page(request.GET.get("cursor") or None)
+    except InvalidCursor:
+        return _error("Invalid cursor.", 404)
+    return _json(
+        {
+            "results": [_shape(row, fields) for row in page],
+            "next": _page_url(request, page.next_cursor),
+            "previous": _page_url(request, page.previous_cursor),
+        }
+    )
+
+
+@require_safe
+@condition(etag_func=gig_detail_etag)
+def gig_detail(request, pk: int):
+    try:
+        fields = _fields(request, tuple(FIELDS))
+    except BadRequest as exc:
+        return _error(str(exc), 400)
+    row = _rows(Gig.objects.available().filter(pk=pk), fields).first()
+    if row is None:
+        return _error("No such gig.", 404)
+    return _json(_shape(row, fields))
+
+
+@require_safe
+@condition(etag_func=categories_etag)
+def categories(request):
+    counts = facets.for_listing(listing.parse({}))["category"]
+    return _json(
+        {"results": [{"id": f.value, "name": f.label, "gig_count": f.count} for f in counts]}
+    )
@@ -0,0 +1,13 @@
+"""URL routes for version 1 of the read-only JSON API (gigs/api.py)."""
+
+from django.urls import path
+
+from . import api
+
+app_name = "api"
+
+urlpatterns = [
+    path("gigs/", api.gig_list, name="gig_list"),
+    path("gigs/<int:pk>/", api.gig_detail, name="gig_detail"),
+    path("categories/", api.categories, name="categories"),
+]
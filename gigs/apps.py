@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GigsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "gigs"
+
+    def ready(self) -> None:
+        # Import side-effect: register signal handlers.
+        from . import signals  # noqa: F401
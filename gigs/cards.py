@@ -0,0 +1,74 @@
+"""Cached HTML for gig cards (``gigs/_gig_card.html``).
+
+A card changes only when its gig is saved, when its days-left countdown
+ticks over, when its paid feature lapses, when its employer is renamed,
+or when the template changes. Each of those is part of the card's cache
+key:
+
+    gig-card:<template hash>:<pk>:<updated_at>:<days_left>:<featured_now>:
+        <employer id>:<employer username>
+
+so a stale card is never served. Nothing is deleted on write; old keys age
+out after ``GIG_CARD_CACHE_TTL``. ``render_cards`` fetches a whole page of
+cards with one ``get_many``, renders only the misses and stores them with
+one ``set_many``. Hit/miss counts are reported as ``gig_cards`` by
+``manage.py cache_stats``.
+
+Cards must not depend on who is looking. Keep per-user markup out of
+``_gig_card.html``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.safestring import SafeString, mark_safe
+
+from core.cache import record, track
+
+from .models import Gig
+
+CARD_TEMPLATE = "gigs/_gig_card.html"
+STATS_NAME = "gig_cards"
+
+track(STATS_NAME)
+
+
+def template_version(template) -> str:
+    """Short hash of the card template's source; editing it retires old cards."""
+    return hashlib.sha1(template.template.source.encode()).hexdigest()[:10]
+
+
+def card_key(gig: Gig, version: str) -> str:
+    updated = gig.updated_at.timestamp() if gig.updated_at else 0
+    return (
+        f"gig-card:{version}:{gig.pk}:{updated}:"
+        f"{getattr(gig, 'days_left', None)}:{getattr(gig, 'featured_now', None)}:"
+        # The card shows the username; callers select_related("employer").
+        f"{gig.employer_id}:{gig.employer.username}"
+    )
+
+
+def render_cards(gigs: Iterable[Gig]) -> SafeString:
+    """Render ``gigs`` as concatenated card HTML, reusing cached fragments."""
+    gigs = list(gigs)
+    template = get_template(CARD_TEMPLATE)
+    version = template_version(template)
+    keys = [card_key(gig, version) for gig in gigs]
+
+    fragments = cache.get_many(keys)
+    missing = {}
+    for gig, key in zip(gigs, keys, strict=True):
+        if key not in fragments:
+            missing[key] = template.render({"gig": gig})
+    if missing:
+        cache.set_many(missing, settings.GIG_CARD_CACHE_TTL)
+        fragments.update(missing)
+
+    record(STATS_NAME, hit=True, count=len(gigs) - len(missing))
+    record(STATS_NAME, hit=False, count=len(missing))
+    return mark_safe("".join(fragments[key] for key in keys))
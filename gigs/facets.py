@@ -0,0 +1,139 @@
+"""Facet counts for the gig listing's sidebar.
+
+For the listing's current filters, every available gig is counted by
+category, location (remote or on-site) and budget band in one grouped
+query:
+
+    SELECT category, <remote?>, <band>, COUNT(*) ... GROUP BY 1, 2, 3
+
+That gives at most categories x 2 x bands rows, which are summed in Python
+into the three facets. Only the category facet leaves out its own
+filter: the category counts show what picking another category would
+give, while the location and band counts apply every filter, their own
+included, and are summed for the selected category. So the rows depend on
+every filter but the category and are cached per normalised set of them
+(the same search terms in any order or case share an entry). Changing
+category then costs no query at all. "Remote" means a location of exactly
+that, in any case, as for the listing's ``location`` filter.
+
+Entries are keyed on the page cache's generation (``core.page_cache``),
+which every gig write bumps, and on today's date, since deadlines drop
+gigs at midnight. ``FACET_CACHE_TTL`` bounds anything else. Hits and
+misses show in ``manage.py cache_stats`` as ``facets``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, Value, When
+from django.utils import timezone
+
+from core import page_cache
+from core.cache import record, track
+
+from . import listing, search
+from .models import Gig
+
+# (key, label, upper bound exclusive); the last band is open-ended.
+BUDGET_BANDS = (
+    ("under-100", "Under £100", Decimal("100")),
+    ("100-500", "£100 – £500", Decimal("500")),
+    ("500-1000", "£500 – £1,000", Decimal("1000")),
+    ("1000-plus", "£1,000+", None),
+)
+LOCATIONS = (("remote", "Remote"), ("onsite", "On-site"))
+
+STATS_NAME = "facets"
+track(STATS_NAME)
+
+
+@dataclass
+class Facet:
+    value: str
+    label: str
+    count: int
+    selected: bool = False
+
+
+def _band_expression():
+    whens = [
+        When(budget__lt=upper, then=Value(key))
+        for key, _, upper in BUDGET_BANDS
+        if upper is not None
+    ]
+    return Case(*whens, default=Value(BUDGET_BANDS[-1][0]), output_field=CharField())
+
+
+def _location_expression():
+    return Case(
+        When(location__iexact="remote", then=Value("remote")),
+        default=Value("onsite"),
+        output_field=CharField(),
+    )
+
+
+def _grouped_counts(filters: dict) -> list[tuple[str, str, str, int]]:
+    queryset = listing.apply(Gig.objects.available(), filters, ignore=("category",))
+    return list(
+        queryset.order_by()
+        .annotate(remote=_location_expression(), band=_band_expression())
+        .values_list("category", "remote", "band")
+        .annotate(n=Count("pk"))
+    )
+
+
+def cache_key(filters: dict) -> str:
+    normalised = [
+        " ".join(sorted(set(search.tokenize(filters["search"])))),
+        filters["budget_min"],
+        filters["budget_max"],
+        filters["location"].lower(),
+        filters["deadline_before"],
+    ]
+    digest = hashlib.md5(repr(normalised).encode()).hexdigest()
+    today = timezone.now().date().isoformat()
+    return f"facets:{page_cache.generation()}:{today}:{digest}"
+
+
+def counts(filters: dict) -> list[tuple[str, str, str, int]]:
+    """The grouped (category, location, band, count) rows for ``filters``."""
+    key = cache_key(filters)
+    rows = cache.get(key)
+    record(STATS_NAME, hit=rows is not None)
+    if rows is None:
+        rows = _grouped_counts(filters)
+        cache.set(key, rows, settings.FACET_CACHE_TTL)
+    return rows
+
+
+def for_listing(filters: dict) -> dict[str, list[Facet]]:
+    """The sidebar's facets for the listing's ``filters`` (``listing.parse()``)."""
+    rows = counts(filters)
+    category = filters["category"]
+    location = filters["location"].lower()
+
+    by_category: dict[str, int] = {}
+    by_location: dict[str, int] = {}
+    by_band: dict[str, int] = {}
+    for row_category, remote, band, n in rows:
+        by_category[row_category] = by_category.get(row_category, 0) + n
+        if not category or row_category == category:
+            by_location[remote] = by_location.get(remote, 0) + n
+            by_band[band] = by_band.get(band, 0) + n
+
+    return {
+        "category": [
+            Facet(value, label, by_category.get(value, 0), value == category)
+            for value, label in Gig.Category.choices
+        ],
+        "location": [
+            Facet(value, label, by_location.get(value, 0), value == location)
+            for value, label in LOCATIONS
+        ],
+        "budget": [Facet(key, label, by_band.get(key, 0)) for key, label, _ in BUDGET_BANDS],
+    }
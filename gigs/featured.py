@@ -0,0 +1,97 @@
+"""Featured-gig lifetime.
+
+A paid upgrade features a gig for ``FEATURED_GIG_DAYS`` days. When the
+upgrade is applied, ``feature_gig`` sets ``featured_until``.
+``expire_featured`` later clears ``is_featured`` on every lapsed gig in a
+single UPDATE. It is run by ``manage.py expire_featured_gigs`` (cron) or by
+``ExpiryRunner``, a background thread started from the WSGI/ASGI entry
+point and the webhook worker when ``FEATURED_EXPIRY_INTERVAL`` is set.
+
+Nothing that shows "featured" gigs reads ``is_featured`` alone: the home
+page filters on ``featured_until > now`` (``GigQuerySet.featured()``) and
+listings sort and badge on ``featured_now`` (``live_feature()``), so a gig
+drops out the moment it lapses, even if the job hasn't run yet. The job
+keeps the flag in step and bumps ``updated_at``, which retires cached
+pages and ETags that still show the gig as featured.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from core import home, page_cache
+
+from .models import Gig
+
+logger = logging.getLogger("quickgigs.gigs")
+
+
+def feature_gig(gig: Gig, days: int | None = None) -> None:
+    """Feature ``gig`` for ``days``, extending any time it has left."""
+    days = settings.FEATURED_GIG_DAYS if days is None else days
+    now = timezone.now()
+    start = now
+    if gig.is_featured and gig.featured_until and gig.featured_until > now:
+        start = gig.featured_until
+    gig.is_featured = True
+    gig.featured_until = start + timedelta(days=days)
+    gig.save(update_fields=["is_featured", "featured_until", "updated_at"])
+
+
+def expire_featured(now: datetime | None = None) -> int:
+    """Un-feature every gig whose ``featured_until`` has passed. Returns the count."""
+    now = now or timezone.now()
+    expired = Gig.objects.filter(is_featured=True, featured_until__lte=now).update(
+        is_featured=False, updated_at=now
+    )
+    if expired:
+        # The UPDATE bypasses post_save, which normally drops these.
+        home.invalidate_gigs()
+        page_cache.invalidate()
+        logger.info("Expired %s featured gig(s)", expired)
+    return expired
+
+
+class ExpiryRunner(threading.Thread):
+    """Daemon thread that calls ``expire_featured`` every ``interval`` seconds.
+
+    Every worker process may run one; the UPDATE is idempotent, so
+    overlapping runs only cost a cheap indexed no-op.
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(name="featured-expiry", daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            try:
+                expire_featured()
+            except Exception:
+                logger.exception("Featured-gig expiry failed")
+            finally:
+                close_old_connections()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+
+_runner: ExpiryRunner | None = None
+
+
+def start_expiry_runner() -> ExpiryRunner | None:
+    """Start the per-process runner if ``FEATURED_EXPIRY_INTERVAL`` > 0."""
+    global _runner
+    interval = settings.FEATURED_EXPIRY_INTERVAL
+    if interval <= 0 or _runner is not None:
+        return _runner
+    _runner = ExpiryRunner(interval)
+    _runner.start()
+    return _runner
@@ -106,6 +106,105 @@ class ApplicationForm(forms.ModelForm):
         return value
 
 
+class GigFilterForm(forms.Form):
+    """The gig listing's query-string filters (see gigs/listing.py).
+
+    Nothing is required, and the listing drops any value that doesn't
+    validate rather than showing an error.
+    """
+
+    SORT_CHOICES = [
+        ("", "Featured first"),
+        ("newest", "Newest"),
+        ("budget_asc", "Budget: low to high"),
+        ("budget_desc", "Budget: high to low"),
+        ("closing", "Closing soon"),
+    ]
+
+    search = forms.CharField(required=False)
+    category = forms.ChoiceField(
+        choices=[("", "All categories"), *Gig.Category.choices], required=False
+    )
+    budget_min = forms.DecimalField(required=False, min_value=0, max_digits=10, decimal_places=2)
+    budget_max = forms.DecimalField(required=False, min_value=0, max_digits=10, decimal_places=2)
+    location = forms.CharField(required=False, max_length=100)
+    deadline_before = forms.DateField(required=False)
+    sort = forms.ChoiceField(choices=SORT_CHOICES, required=False)
+
+
+class GigImportForm(forms.Form):
+    """Upload a CSV or JSON Lines file of gigs (see gigs/transfer.py)."""
+
+    MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+
+    file = forms.FileField(
+        help_text="CSV with a header row, or JSON Lines (.jsonl). Columns: title, "
+        "description, budget, location, category, deadline (YYYY-MM-DD, optional).",
+        widget=forms.ClearableFileInput(attrs={"class": INPUT_CLASSES, "accept": ".csv,.jsonl"}),
+    )
+    dry_run = forms.BooleanField(required=False, label="Only check the file; don't create any gigs")
+
+    def clean_file(self):
+        upload = self.cleaned_data["file"]
+        if upload.size > self.MAX_UPLOAD_BYTES:
+            raise forms.ValidationError(
+                "Files over 5 MB can be imported with manage.py import_gigs."
+            )
+        return upload
+
+
+class IdListField(forms.Field):
+    """IDs from repeated inputs and/or comma-separated values, as a list of ints.
+
+    Commas let a client send thousands of IDs without tripping
+    ``DATA_UPLOAD_MAX_NUMBER_FIELDS``.
+    """
+
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        if not value:
+            return []
+        try:
+            return sorted({int(v) for item in value for v in item.split(",") if v.strip()})
+        except (TypeError, ValueError):
+            raise forms.ValidationError("Select applications from the list.") from None
+
+
+class BulkApplicationStatusForm(forms.Form):
+    """Employer triage of many applications to one gig at once.
+
+    Applies ``status`` to the ticked ``applications``, or with
+    ``all_pending`` to every pending application on the gig, including
+    those on later pages.
+    """
+
+    MAX_APPLICATIONS = 5000
+    STATUS_CHOICES = [
+        choice for choice in Application.Status.choices if choice[0] != Application.Status.WITHDRAWN
+    ]
+
+    status = forms.ChoiceField(
+        choices=STATUS_CHOICES, widget=forms.Select(attrs={"class": INPUT_CLASSES})
+    )
+    applications = IdListField(required=False)
+    all_pending = forms.BooleanField(required=False, widget=forms.HiddenInput)
+
+    def clean_applications(self):
+        ids = self.cleaned_data["applications"]
+        if len(ids) > self.MAX_APPLICATIONS:
+            raise forms.ValidationError(
+                f"Update at most {self.MAX_APPLICATIONS} applications at a time."
+            )
+        return ids
+
+    def clean(self):
+        cleaned = super().clean()
+        if not cleaned.get("applications") and not cleaned.get("all_pending"):
+            raise forms.ValidationError("Select at least one application.")
+        return cleaned
+
+
 class ApplicationStatusForm(forms.ModelForm):
     """Employer-facing form to triage applications."""
 
@@ -0,0 +1,87 @@
+"""Filters and sort orders for the public gig listing.
+
+``GigListView``, its ETag and the sidebar's facet counts read the same
+query-string parameters, validated by ``GigFilterForm``:
+
+* ``search``: full-text terms (``gigs/search.py``);
+* ``category``: one of ``Gig.Category``;
+* ``budget_min`` / ``budget_max``: inclusive bounds in GBP;
+* ``location``: a location, matched case-insensitively; ``Remote`` is
+  just a location;
+* ``deadline_before``: gigs due on or before this date (undated gigs
+  drop out);
+* ``sort``: a key of ``SORTS``. Without one, gigs whose paid feature is
+  live (``featured_now``, from ``featured_until``) lead, then search
+  relevance (when searching), then the newest.
+
+A value that doesn't validate is ignored. Every filter and sort has a
+partial ``WHERE is_active`` index on ``Gig`` shaped for it (see
+``Gig.Meta.indexes``); ``scripts/bench_listing_plans.py`` checks the
+plans on Postgres. The default order can't be read off an index, since
+the featured band moves with the clock: it sorts the filtered rows.
+"""
+
+from __future__ import annotations
+
+from django.db.models import F
+
+from . import search
+from .forms import GigFilterForm
+
+# Each ordering ends with the primary key so it is total. The ones made of
+# non-null columns also serve as keyset orderings for cursor pages.
+SORTS = {
+    "newest": ("-created_at", "-id"),
+    "budget_asc": ("budget", "id"),
+    "budget_desc": ("-budget", "-id"),
+    "closing": (F("deadline").asc(nulls_last=True), "id"),
+}
+
+
+def parse(params) -> dict:
+    """The valid filters in ``params`` (a ``QueryDict`` or dict)."""
+    form = GigFilterForm(params)
+    form.is_valid()
+    filters = {name: form.cleaned_data.get(name) for name in form.fields}
+    for name in ("search", "location"):
+        filters[name] = " ".join((filters[name] or "").split())
+    return filters
+
+
+def apply(queryset, filters: dict, *, ignore: tuple[str, ...] = ()):
+    """Filter ``queryset`` by ``filters`` (from ``parse``), skipping those named in ``ignore``."""
+
+    def wanted(name):
+        return name not in ignore and filters.get(name) not in (None, "")
+
+    if wanted("category"):
+        queryset = queryset.filter(category=filters["category"])
+    if wanted("budget_min"):
+        queryset = queryset.filter(budget__gte=filters["budget_min"])
+    if wanted("budget_max"):
+        queryset = queryset.filter(budget__lte=filters["budget_max"])
+    if wanted("location"):
+        queryset = queryset.filter(location__iexact=filters["location"])
+    if wanted("deadline_before"):
+        queryset = queryset.filter(deadline__lte=filters["deadline_before"])
+    if wanted("search"):
+        queryset = search.search(queryset, filters["search"])
+    return queryset
+
+
+def filter_listing(queryset, params):
+    """Apply the listing's query-string filters to ``queryset``."""
+    return apply(queryset, parse(params))
+
+
+def ordering(filters: dict) -> tuple | None:
+    """The ``order_by()`` for ``filters``' sort, or None for the default."""
+    return SORTS.get(filters.get("sort"))
+
+
+def cursor_ordering(filters: dict) -> tuple[str, ...] | None:
+    """``ordering()`` if it can key cursor pages (no nullable columns), else None."""
+    order = ordering(filters)
+    if order and all(isinstance(key, str) for key in order):
+        return order
+    return None
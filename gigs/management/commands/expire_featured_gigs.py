@@ -0,0 +1,18 @@
+"""Un-feature gigs whose paid feature period has ended."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from gigs.featured import expire_featured
+
+
+class Command(BaseCommand):
+    help = (
+        "Clear is_featured on every gig whose featured_until has passed, in one "
+        "UPDATE. Safe to run as often as you like, e.g. from cron every few minutes."
+    )
+
+    def handle(self, *args, **options):
+        expired = expire_featured()
+        self.stdout.write(self.style.SUCCESS(f"Expired {expired} featured gig(s)."))
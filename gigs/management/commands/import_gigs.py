@@ -0,0 +1,77 @@
+"""Create gigs in bulk from a CSV or JSON Lines file."""
+
+from __future__ import annotations
+
+import sys
+from contextlib import nullcontext
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from gigs import transfer
+
+
+def _open(path: str):
+    if path == "-":
+        return nullcontext(sys.stdin)
+    return open(path, encoding="utf-8-sig", newline="")
+
+
+class Command(BaseCommand):
+    help = (
+        "Import gigs for one employer from CSV (with a header row) or JSON Lines. "
+        "Rows are validated like the 'Post a gig' form; bad rows are reported and "
+        "skipped, the rest are inserted in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for stdin.")
+        parser.add_argument("--employer", required=True, help="Username that will own the gigs.")
+        parser.add_argument(
+            "--format",
+            choices=transfer.FORMATS,
+            default=None,
+            help="File format (default: from the file extension; csv for stdin).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=transfer.IMPORT_BATCH_SIZE,
+            help=f"Gigs per INSERT batch (default: {transfer.IMPORT_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Validate every row without creating gigs."
+        )
+        parser.add_argument("--database", default=None, help="Database alias to import into.")
+
+    def handle(self, *args, path, employer, format, batch_size, dry_run, database, **options):
+        User = get_user_model()
+        try:
+            owner = User.objects.db_manager(database).get_by_natural_key(employer)
+        except User.DoesNotExist:
+            raise CommandError(f"No user named {employer!r}.") from None
+
+        fmt = format or transfer.format_for(path)
+        try:
+            with _open(path) as stream:
+                result = transfer.import_gigs(
+                    transfer.read_rows(stream, fmt),
+                    owner,
+                    batch_size=batch_size,
+                    dry_run=dry_run,
+                    using=database,
+                )
+        except (OSError, transfer.ImportFormatError) as exc:
+            raise CommandError(str(exc)) from None
+
+        for error in result.errors:
+            self.stderr.write(str(error))
+        verb = "Would import" if dry_run else "Imported"
+        style = self.style.WARNING if result.errors or result.stopped else self.style.SUCCESS
+        self.stdout.write(
+            style(
+                f"{verb} {result.created} of {result.rows} row(s); {len(result.errors)} error(s)."
+            )
+        )
+        if result.stopped:
+            raise CommandError(result.stopped)
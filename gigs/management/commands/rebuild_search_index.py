@@ -0,0 +1,27 @@
+"""Repopulate the gig full-text search index from scratch."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from gigs import search
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the search document for every gig. Run after bulk loads, "
+        "raw-SQL edits or restoring a dump that skipped the search index."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Gigs per UPDATE/INSERT batch (default: 5000).",
+        )
+        parser.add_argument("--database", default=None, help="Database alias to rebuild.")
+
+    def handle(self, *args, batch_size: int, database: str | None, **options):
+        total = search.rebuild_index(batch_size=batch_size, using=database)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} gig(s)."))
@@ -0,0 +1,53 @@
+"""Repair drift in the denormalised Gig application counters."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from gigs.models import Gig
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Gig.application_count / pending_count from the applications "
+        "table for every gig whose stored counters have drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Report drifted gigs without fixing them."
+        )
+        parser.add_argument(
+            "--all", action="store_true", help="Rewrite every gig, not just drifted ones."
+        )
+
+    def handle(self, *args, dry_run: bool, all: bool, **options):
+        drifted = (
+            Gig.objects.with_true_counts()
+            .exclude(
+                application_count=F("true_application_count"),
+                pending_count=F("true_pending_count"),
+            )
+            .order_by()
+            .values_list(
+                "pk",
+                "application_count",
+                "true_application_count",
+                "pending_count",
+                "true_pending_count",
+            )
+        )
+        rows = list(drifted)
+        for pk, stored, true, stored_pending, true_pending in rows:
+            self.stdout.write(
+                f"gig {pk}: applications {stored} -> {true}, pending {stored_pending} -> {true_pending}"
+            )
+
+        if dry_run:
+            self.stdout.write(f"{len(rows)} gig(s) drifted (dry run, nothing changed).")
+            return
+
+        targets = Gig.objects.all() if all else Gig.objects.filter(pk__in=[r[0] for r in rows])
+        updated = targets.recount_applications()
+        self.stdout.write(self.style.SUCCESS(f"Recounted {updated} gig(s)."))
@@ -0,0 +1,51 @@
+# Full-text search storage for Gig — see gigs/search.py.
+#
+# Postgres gets a weighted tsvector column behind a GIN index; SQLite gets
+# an FTS5 table keyed on the gig id. Neither lives on the Django model, so
+# ordinary Gig queries never drag the search document along.
+
+from django.db import migrations
+
+PG_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("ALTER TABLE gigs_gig ADD COLUMN search_vector tsvector")
+        schema_editor.execute(f"UPDATE gigs_gig SET search_vector = {PG_VECTOR_SQL}")
+        schema_editor.execute(
+            "CREATE INDEX gigs_gig_search_vector_gin ON gigs_gig USING gin (search_vector)"
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE gigs_gig_fts USING fts5("
+            "title, description, tokenize = 'porter unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            "INSERT INTO gigs_gig_fts (rowid, title, description) "
+            "SELECT id, title, description FROM gigs_gig"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS gigs_gig_search_vector_gin")
+        schema_editor.execute("ALTER TABLE gigs_gig DROP COLUMN IF EXISTS search_vector")
+    elif vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS gigs_gig_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gigs', '0007_alter_gig_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
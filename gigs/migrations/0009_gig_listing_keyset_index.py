@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gigs', '0008_gig_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='gig',
+            options={'ordering': ['-is_featured', '-created_at', 'id']},
+        ),
+        migrations.AddIndex(
+            model_name='gig',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-is_featured', '-created_at', 'id'], name='gig_active_listing_idx'),
+        ),
+    ]
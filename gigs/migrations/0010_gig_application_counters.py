@@ -0,0 +1,45 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:06
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Gig = apps.get_model("gigs", "Gig")
+    Application = apps.get_model("gigs", "Application")
+
+    def count(**filters):
+        return Coalesce(
+            Subquery(
+                Application.objects.filter(gig=OuterRef("pk"), **filters)
+                .order_by()
+                .values("gig")
+                .annotate(n=Count("pk"))
+                .values("n")
+            ),
+            0,
+        )
+
+    Gig.objects.update(application_count=count(), pending_count=count(status="pending"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gigs', '0009_gig_listing_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gig',
+            name='application_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='gig',
+            name='pending_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
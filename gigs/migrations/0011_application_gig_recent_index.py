@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gigs', '0010_gig_application_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['gig', '-created_at', '-id'], name='gigs_applic_gig_id_c930c1_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:18
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def start_featured_clock(apps, schema_editor):
+    # Gigs featured before featured_until was honoured get a full term from
+    # today rather than vanishing from the featured block.
+    Gig = apps.get_model("gigs", "Gig")
+    Gig.objects.filter(is_featured=True, featured_until__isnull=True).update(
+        featured_until=timezone.now() + timedelta(days=settings.FEATURED_GIG_DAYS)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gigs', '0011_application_gig_recent_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gig',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['featured_until'], name='gig_featured_until_idx'),
+        ),
+        migrations.RunPython(start_featured_clock, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gigs', '0012_gig_featured_until_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gig',
+            index=models.Index(fields=['is_active', 'deadline'], name='gig_active_deadline_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:05
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gigs', '0013_gig_active_deadline_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gig',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['budget', 'id'], name='gig_active_budget_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gig',
+            index=models.Index(django.db.models.functions.text.Upper('location'), models.OrderBy(models.F('is_featured'), descending=True), models.OrderBy(models.F('created_at'), descending=True), models.F('id'), condition=models.Q(('is_active', True)), name='gig_active_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gig',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['deadline', 'id'], name='gig_active_closing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gig',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='gig_active_newest_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:21
+
+import django.db.models.functions.datetime
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gigs', '0014_gig_listing_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='gig',
+            options={'ordering': [models.OrderBy(models.Case(models.When(models.Q(('featured_until__gt', django.db.models.functions.datetime.Now()), ('is_featured', True)), then=models.Value(True)), default=models.Value(False), output_field=models.BooleanField()), descending=True), '-created_at', 'id']},
+        ),
+        migrations.RemoveIndex(
+            model_name='gig',
+            name='gig_active_listing_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='gig',
+            name='gig_active_location_idx',
+        ),
+        migrations.AddIndex(
+            model_name='gig',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_featured', True)), fields=['-created_at', 'id'], name='gig_active_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gig',
+            index=models.Index(django.db.models.functions.text.Upper('location'), models.OrderBy(models.F('created_at'), descending=True), models.F('id'), condition=models.Q(('is_active', True)), name='gig_active_location_idx'),
+        ),
+    ]
@@ -6,10 +6,113 @@ from decimal import Decimal
 
 from django.conf import settings
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import IntegrityError, models, router, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest, Now, Upper
 from django.urls import reverse
 from django.utils import timezone
 
+# Denormalised per-gig totals maintained by Application.save() and the
+# post_delete handler in gigs/signals.py. Never written by a plain Gig.save().
+COUNTER_FIELDS = ("application_count", "pending_count")
+
+
+class DaysUntil(models.Func):
+    """Whole days from ``today`` until a date column; negative once it has passed."""
+
+    output_field = models.IntegerField()
+
+    def __init__(self, expression, today):
+        super().__init__(expression, models.Value(today, output_field=models.DateField()))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # Postgres: date - date is already an integer number of days.
+        return super().as_sql(
+            compiler, connection, template="(%(expressions)s)", arg_joiner=" - ", **extra_context
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler,
+            connection,
+            function="julianday",
+            template="CAST(julianday(%(expressions)s) AS INTEGER)",
+            arg_joiner=") - julianday(",
+            **extra_context,
+        )
+
+
+def live_feature(now=None) -> models.Case:
+    """True while a gig's paid feature is live: the listing's "featured" band.
+
+    Read from ``featured_until`` at query time (``now`` defaults to the
+    database clock), so a lapsed gig leaves the band before
+    ``expire_featured`` clears its ``is_featured`` (see gigs/featured.py).
+    """
+    return models.Case(
+        models.When(
+            models.Q(is_featured=True, featured_until__gt=now or Now()),
+            then=models.Value(True),
+        ),
+        default=models.Value(False),
+        output_field=models.BooleanField(),
+    )
+
+
+class GigQuerySet(models.QuerySet):
+    def available(self, today=None):
+        """Active gigs whose deadline (if any) hasn't passed, with ``days_left``.
+
+        ``days_left`` is computed by the database from one ``today`` for the
+        whole query (``None`` for undated gigs), replacing the per-row
+        ``is_available`` / ``days_remaining`` properties in listings.
+        ``featured_now`` comes from ``with_featured_now()``.
+        """
+        today = today or timezone.now().date()
+        return (
+            self.filter(
+                models.Q(deadline__isnull=True) | models.Q(deadline__gte=today), is_active=True
+            )
+            .annotate(days_left=DaysUntil("deadline", today))
+            .with_featured_now()
+        )
+
+    def featured(self, now=None):
+        """Gigs whose paid feature is live right now (see gigs/featured.py)."""
+        return self.filter(is_featured=True, featured_until__gt=now or timezone.now())
+
+    def with_featured_now(self, now=None):
+        """Annotate ``featured_now``: whether the gig's paid feature is live.
+
+        Listings sort and badge on this, never on the stored ``is_featured``.
+        """
+        return self.annotate(featured_now=live_feature(now or timezone.now()))
+
+    def with_true_counts(self):
+        """Annotate the counters recomputed from the applications table."""
+        return self.annotate(
+            true_application_count=_application_count_subquery(),
+            true_pending_count=_application_count_subquery(status=Application.Status.PENDING),
+        )
+
+    def recount_applications(self) -> int:
+        """Rewrite the counters for every gig in the queryset from scratch."""
+        return self.update(
+            application_count=_application_count_subquery(),
+            pending_count=_application_count_subquery(status=Application.Status.PENDING),
+        )
+
+
+def _application_count_subquery(**filters):
+    counts = (
+        Application.objects.filter(gig=OuterRef("pk"), **filters)
+        .order_by()
+        .values("gig")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    return Coalesce(Subquery(counts), 0)
+
 
 class Gig(models.Model):
     """A job posting created by an employer."""
@@ -48,20 +151,83 @@ class Gig(models.Model):
     is_featured = models.BooleanField(default=False)
     featured_until = models.DateTimeField(null=True, blank=True)
 
+    application_count = models.PositiveIntegerField(default=0, editable=False)
+    pending_count = models.PositiveIntegerField(default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = GigQuerySet.as_manager()
+
     class Meta:
-        ordering = ["-is_featured", "-created_at"]
+        ordering = [live_feature().desc(), "-created_at", "id"]
         indexes = [
             models.Index(fields=["employer", "-created_at"]),
             models.Index(fields=["is_active", "is_featured"]),
+            models.Index(fields=["is_active", "deadline"], name="gig_active_deadline_idx"),
             models.Index(fields=["category"]),
+            # The listing's featured band (live_feature()): the few gigs with
+            # a paid feature, newest first, featured_until checked per row.
+            # The band follows the clock, so no index can lead with it; the
+            # default order sorts the filtered rows rather than scanning one.
+            models.Index(
+                fields=["-created_at", "id"],
+                condition=models.Q(is_active=True, is_featured=True),
+                name="gig_active_featured_idx",
+            ),
+            # One per listing filter/sort (gigs/listing.py), each over active
+            # gigs only: the filter's column leads, the sort key follows.
+            # budget range / budget_asc / budget_desc (scanned backwards).
+            models.Index(
+                fields=["budget", "id"],
+                condition=models.Q(is_active=True),
+                name="gig_active_budget_idx",
+            ),
+            # location=... (iexact, i.e. UPPER(location) = UPPER(%s)), newest
+            # first; the featured band is sorted out of the matching rows.
+            models.Index(
+                Upper("location"),
+                F("created_at").desc(),
+                "id",
+                condition=models.Q(is_active=True),
+                name="gig_active_location_idx",
+            ),
+            # deadline_before range / closing (NULLS LAST is the default for ASC).
+            models.Index(
+                fields=["deadline", "id"],
+                condition=models.Q(is_active=True),
+                name="gig_active_closing_idx",
+            ),
+            # sort=newest.
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="gig_active_newest_idx",
+            ),
+            # Serves both featured() (> now) and the expiry UPDATE (<= now).
+            models.Index(
+                fields=["featured_until"],
+                condition=models.Q(is_featured=True),
+                name="gig_featured_until_idx",
+            ),
         ]
 
     def __str__(self) -> str:
         return self.title
 
+    def save(self, *args, **kwargs):
+        # A full save (e.g. from GigForm) would write back whatever counters
+        # were loaded with the instance, clobbering applications that arrived
+        # since. Leave them out unless the caller names them explicitly.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                f.name
+                for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in COUNTER_FIELDS and f.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self) -> str:
         return reverse("gigs:gig_detail", kwargs={"pk": self.pk})
 
@@ -83,6 +249,51 @@ class Gig(models.Model):
         return max(0, delta.days)
 
 
+class ApplicationQuerySet(models.QuerySet):
+    def submit(self, application: Application) -> tuple[Application, bool]:
+        """Insert a new ``application``, or return the one already on file.
+
+        No existence check first: the ``unique_application_per_gig``
+        constraint decides, so two simultaneous submissions can't both get
+        past a check and then collide. The loser's INSERT (and its counter
+        update) is rolled back and it gets the winner's row. Returns
+        ``(application, created)`` like ``get_or_create``.
+        """
+        using = self._db or router.db_for_write(self.model)
+        try:
+            application.save(using=using)
+        except IntegrityError:
+            existing = (
+                self.using(using)
+                .filter(gig_id=application.gig_id, applicant_id=application.applicant_id)
+                .first()
+            )
+            if existing is None:
+                raise
+            return existing, False
+        return application, True
+
+    def set_status(self, status: str) -> int:
+        """Move every application in the queryset to ``status`` in one UPDATE.
+
+        Withdrawn applications and those already at ``status`` are left
+        alone. The counters of the gigs involved are then recounted from
+        the applications table rather than adjusted per row, in the same
+        transaction. Returns the number of applications changed.
+        """
+        using = self._db or router.db_for_write(self.model)
+        with transaction.atomic(using=using):
+            changed = self.using(using).exclude(status__in=[status, Application.Status.WITHDRAWN])
+            # Taken before the UPDATE: afterwards a status filter in the
+            # queryset may no longer match the changed rows.
+            gig_ids = list(changed.order_by().values_list("gig_id", flat=True).distinct())
+            if not gig_ids:
+                return 0
+            count = changed.update(status=status, updated_at=timezone.now())
+            Gig.objects.using(using).filter(pk__in=gig_ids).recount_applications()
+        return count
+
+
 class Application(models.Model):
     """A freelancer's application to a gig."""
 
@@ -118,6 +329,8 @@ class Application(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ApplicationQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         constraints = [
@@ -129,11 +342,42 @@ class Application(models.Model):
         indexes = [
             models.Index(fields=["applicant", "-created_at"]),
             models.Index(fields=["gig", "status"]),
+            # gig_applications pages by (-created_at, -id) within one gig.
+            models.Index(fields=["gig", "-created_at", "-id"]),
         ]
 
     def __str__(self) -> str:
         return f"{self.applicant.username} → {self.gig.title}"
 
+    def save(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(Application, instance=self)
+        update_fields = kwargs.get("update_fields")
+        with transaction.atomic(using=using):
+            if self._state.adding:
+                old_status = None
+            elif update_fields is not None and "status" not in update_fields:
+                old_status = self.status
+            else:
+                # Lock the row so concurrent status changes can't both
+                # apply the same pending -> X delta.
+                old_status = (
+                    Application.objects.using(using)
+                    .select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list("status", flat=True)
+                    .first()
+                )
+            adding = self._state.adding
+            super().save(*args, **kwargs)
+
+            pending = self.Status.PENDING
+            pending_delta = (self.status == pending) - (old_status == pending)
+            if adding or pending_delta:
+                Gig.objects.using(using).filter(pk=self.gig_id).update(
+                    application_count=F("application_count") + int(adding),
+                    pending_count=Greatest(F("pending_count") + pending_delta, 0),
+                )
+
     def get_absolute_url(self) -> str:
         return reverse("gigs:application_detail", kwargs={"pk": self.pk})
 
@@ -0,0 +1,194 @@
+"""Full-text search for gigs.
+
+``GigListView`` used to run ``title__icontains OR description__icontains``,
+which is a sequential scan over every active gig's description. Instead we
+keep a precomputed search document per gig and match against that:
+
+* **Postgres** — a weighted ``tsvector`` in ``gigs_gig.search_vector``
+  (title = A, description = B) behind a GIN index.
+* **SQLite** — an FTS5 table ``gigs_gig_fts`` whose ``rowid`` is the gig id.
+* Anything else falls back to the old ``icontains`` filter.
+
+The column / table are created by ``gigs/migrations/0008_gig_search_index``
+and kept current by the ``post_save`` / ``post_delete`` handlers in
+``gigs/signals.py``. Bulk inserts that bypass signals (``gigs/transfer.py``)
+call ``index_gigs`` for their batch; ``manage.py rebuild_search_index``
+repopulates everything after raw-SQL edits or restores.
+
+Every term is prefix-matched and all terms must match, so "land pag" finds
+"Build a landing page" while the user is still typing.
+"""
+
+from __future__ import annotations
+
+import re
+
+from django.db import connections, router
+from django.db.models import BooleanField, FloatField, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Gig
+
+PG_CONFIG = "english"
+PG_VECTOR_SQL = (
+    f"setweight(to_tsvector('{PG_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{PG_CONFIG}', coalesce(description, '')), 'B')"
+)
+FTS_TABLE = "gigs_gig_fts"
+
+# Title hits weigh ten times more than description hits in bm25().
+FTS_WEIGHTS = "10.0, 1.0"
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(query: str) -> list[str]:
+    """Split a raw search box value into safe, lower-cased terms."""
+    return [t.lower() for t in _TOKEN_RE.findall(query or "")]
+
+
+def _vendor(using: str) -> str:
+    return connections[using].vendor
+
+
+# ---------------------------------------------------------------------------
+# Querying
+# ---------------------------------------------------------------------------
+
+
+def search(queryset: QuerySet, query: str) -> QuerySet:
+    """Filter ``queryset`` to gigs matching ``query``, annotated with ``search_rank``.
+
+    Higher ``search_rank`` means a better match on every backend. The
+    queryset's ordering is left alone — callers decide where rank sits
+    relative to featured/recency.
+    """
+    terms = tokenize(query)
+    if not terms:
+        return queryset.none()
+
+    vendor = _vendor(queryset.db)
+    if vendor == "postgresql":
+        tsquery = " & ".join(f"{t}:*" for t in terms)
+        table = Gig._meta.db_table
+        return queryset.filter(
+            RawSQL(
+                f'"{table}"."search_vector" @@ to_tsquery(%s::regconfig, %s)',
+                (PG_CONFIG, tsquery),
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f'ts_rank_cd("{table}"."search_vector", to_tsquery(%s::regconfig, %s))',
+                (PG_CONFIG, tsquery),
+                output_field=FloatField(),
+            )
+        )
+
+    if vendor == "sqlite":
+        # Join the FTS5 table directly so bm25() is computed once per hit;
+        # a correlated subquery re-runs the MATCH for every row.
+        match = " ".join(f'"{t}"*' for t in terms)
+        return queryset.extra(
+            # bm25() is "lower is better"; negate so ordering is uniform.
+            select={"search_rank": f"-bm25({FTS_TABLE}, {FTS_WEIGHTS})"},
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = {Gig._meta.db_table}.id", f"{FTS_TABLE} MATCH %s"],
+            params=[match],
+        )
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(description__icontains=term)
+    return queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+# ---------------------------------------------------------------------------
+# Index maintenance
+# ---------------------------------------------------------------------------
+
+
+def index_gig(gig: Gig) -> None:
+    """(Re)compute the search document for one gig."""
+    using = router.db_for_write(Gig, instance=gig)
+    vendor = _vendor(using)
+    with connections[using].cursor() as cursor:
+        if vendor == "postgresql":
+            cursor.execute(
+                f"UPDATE {Gig._meta.db_table} SET search_vector = {PG_VECTOR_SQL} WHERE id = %s",
+                [gig.pk],
+            )
+        elif vendor == "sqlite":
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [gig.pk])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)",
+                [gig.pk, gig.title, gig.description],
+            )
+
+
+def index_gigs(pks: list[int], using: str | None = None) -> None:
+    """(Re)compute the search documents for many gigs with one statement."""
+    if not pks:
+        return
+    using = using or router.db_for_write(Gig)
+    vendor = _vendor(using)
+    table = Gig._meta.db_table
+    placeholders = ", ".join(["%s"] * len(pks))
+    with connections[using].cursor() as cursor:
+        if vendor == "postgresql":
+            cursor.execute(
+                f"UPDATE {table} SET search_vector = {PG_VECTOR_SQL} WHERE id IN ({placeholders})",
+                pks,
+            )
+        elif vendor == "sqlite":
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", pks)
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, description) "
+                f"SELECT id, title, description FROM {table} WHERE id IN ({placeholders})",
+                pks,
+            )
+
+
+def unindex_gig(pk: int) -> None:
+    """Drop a deleted gig from the search index (Postgres needs nothing)."""
+    using = router.db_for_write(Gig)
+    if _vendor(using) == "sqlite":
+        with connections[using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
+
+
+def rebuild_index(batch_size: int = 5000, using: str | None = None) -> int:
+    """Recompute every gig's search document. Returns the number of gigs indexed."""
+    using = using or router.db_for_write(Gig)
+    vendor = _vendor(using)
+    table = Gig._meta.db_table
+    ids = Gig.objects.using(using).order_by("pk").values_list("pk", flat=True)
+    total = 0
+
+    with connections[using].cursor() as cursor:
+        if vendor == "sqlite":
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        elif vendor != "postgresql":
+            return 0
+
+        last_pk = 0
+        while True:
+            batch = list(ids.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            lo, hi = batch[0], batch[-1]
+            if vendor == "postgresql":
+                cursor.execute(
+                    f"UPDATE {table} SET search_vector = {PG_VECTOR_SQL} "
+                    "WHERE id BETWEEN %s AND %s",
+                    [lo, hi],
+                )
+            else:
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE} (rowid, title, description) "
+                    f"SELECT id, title, description FROM {table} WHERE id BETWEEN %s AND %s",
+                    [lo, hi],
+                )
+            total += len(batch)
+            last_pk = hi
+    return total
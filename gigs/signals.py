@@ -0,0 +1,49 @@
+"""Signals for the gigs app.
+
+* Keeps the full-text search document (see ``gigs/search.py``) in step
+  with ``Gig.title`` / ``Gig.description``. Saves that only touch other
+  columns (``toggle_gig_status``, the webhook's featured flag) skip the
+  re-index.
+* Decrements ``Gig.application_count`` / ``pending_count`` when an
+  application is deleted. Creates and status changes are handled in
+  ``Application.save()`` so they share its transaction; deletes come here
+  because cascades (e.g. deleting a user) never call ``Application.delete()``.
+"""
+
+from __future__ import annotations
+
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import search
+from .models import Application, Gig
+
+SEARCHABLE_FIELDS = frozenset({"title", "description"})
+
+
+@receiver(post_save, sender=Gig)
+def index_gig_for_search(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not SEARCHABLE_FIELDS & set(update_fields):
+        return
+    search.index_gig(instance)
+
+
+@receiver(post_delete, sender=Gig)
+def unindex_gig_for_search(sender, instance, **kwargs):
+    search.unindex_gig(instance.pk)
+
+
+@receiver(post_delete, sender=Application)
+def decrement_gig_counters(sender, instance, origin=None, using=None, **kwargs):
+    # The gig itself is being deleted — no point updating it on the way out.
+    if isinstance(origin, Gig) and origin.pk == instance.gig_id:
+        return
+    pending = int(instance.status == Application.Status.PENDING)
+    Gig.objects.using(using).filter(pk=instance.gig_id).update(
+        application_count=Greatest(F("application_count") - 1, 0),
+        pending_count=Greatest(F("pending_count") - pending, 0),
+    )
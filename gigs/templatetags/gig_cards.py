@@ -0,0 +1,14 @@
+"""``{% gig_cards gigs %}`` — render a list of gig cards from the fragment cache."""
+
+from __future__ import annotations
+
+from django import template
+
+from gigs.cards import render_cards
+
+register = template.Library()
+
+
+@register.simple_tag
+def gig_cards(gigs):
+    return render_cards(gigs)
@@ -0,0 +1,132 @@
+"""Tests for the read-only JSON API (gigs/api.py)."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from gigs.models import Gig
+
+
+@pytest.fixture
+def gigs(employer):
+    return [
+        Gig.objects.create(
+            title=f"Gig {n}",
+            description="A long description. " * 20,
+            employer=employer,
+            budget=Decimal(100 * (n + 1)),
+            location="Remote" if n % 2 else "London",
+            category=Gig.Category.DESIGN if n < 3 else Gig.Category.WRITING,
+        )
+        for n in range(5)
+    ]
+
+
+@pytest.mark.django_db
+class TestGigList:
+    def test_lists_available_gigs_without_descriptions(self, client, gigs):
+        Gig.objects.filter(pk=gigs[0].pk).update(is_active=False)
+        resp = client.get(reverse("api:gig_list"))
+        assert resp.status_code == 200
+        assert resp["Content-Type"] == "application/json"
+        body = resp.json()
+        assert [row["id"] for row in body["results"]] == [g.pk for g in reversed(gigs[1:])]
+        assert "description" not in body["results"][0]
+        assert body["results"][0]["employer"] == "bob_employer"
+        assert body["results"][0]["budget"] == "500.00"
+        assert body["next"] is None and body["previous"] is None
+
+    def test_field_selection(self, client, gigs):
+        resp = client.get(reverse("api:gig_list"), {"fields": "title,budget", "limit": 1})
+        assert resp.json()["results"] == [{"title": "Gig 4", "budget": "500.00"}]
+        assert b'", "' not in resp.content and b'": ' not in resp.content
+
+    def test_unknown_field_is_a_400(self, client, gigs):
+        resp = client.get(reverse("api:gig_list"), {"fields": "title,password"})
+        assert resp.status_code == 400
+        assert "password" in resp.json()["error"]
+
+    def test_bad_limit_is_a_400(self, client):
+        assert client.get(reverse("api:gig_list"), {"limit": "1000"}).status_code == 400
+
+    def test_cursor_pages_with_filters_and_sort(self, client, gigs):
+        url = reverse("api:gig_list")
+        params = {"category": "design", "sort": "budget_desc", "limit": 2, "fields": "id"}
+        first = client.get(url, params).json()
+        second = client.get(first["next"]).json()
+        assert [row["id"] for row in first["results"] + second["results"]] == [
+            gigs[2].pk,
+            gigs[1].pk,
+            gigs[0].pk,
+        ]
+        assert second["next"] is None
+        assert client.get(second["previous"]).json()["results"] == first["results"]
+
+    def test_invalid_cursor_is_a_404(self, client):
+        resp = client.get(reverse("api:gig_list"), {"cursor": "garbage"})
+        assert resp.status_code == 404
+
+    def test_revalidates_with_one_query(self, client, gigs, django_assert_num_queries):
+        url = reverse("api:gig_list")
+        with django_assert_num_queries(2):
+            etag = client.get(url)["ETag"]
+        with django_assert_num_queries(1):
+            assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    def test_gig_write_changes_the_etag(self, client, gigs):
+        url = reverse("api:gig_list")
+        etag = client.get(url)["ETag"]
+        gigs[1].title = "Renamed"
+        gigs[1].save()
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_write_from_another_process_changes_the_etag(self, client, gigs):
+        # update() skips the signals that bump this process's generation,
+        # like a write made by another worker with a per-process cache.
+        url = reverse("api:gig_list")
+        etag = client.get(url)["ETag"]
+        Gig.objects.filter(pk=gigs[1].pk).update(title="Renamed", updated_at=timezone.now())
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_read_only(self, client):
+        assert client.post(reverse("api:gig_list")).status_code == 405
+
+
+@pytest.mark.django_db
+class TestGigDetail:
+    def test_returns_every_field(self, client, gigs):
+        resp = client.get(reverse("api:gig_detail", args=[gigs[0].pk]))
+        body = resp.json()
+        assert body["title"] == "Gig 0"
+        assert body["description"].startswith("A long description.")
+        assert body["days_left"] is None
+
+    def test_field_selection(self, client, gigs):
+        resp = client.get(reverse("api:gig_detail", args=[gigs[0].pk]), {"fields": "id"})
+        assert resp.json() == {"id": gigs[0].pk}
+
+    def test_gig_write_changes_the_etag(self, client, gigs):
+        url = reverse("api:gig_detail", args=[gigs[0].pk])
+        etag = client.get(url)["ETag"]
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        Gig.objects.filter(pk=gigs[0].pk).update(budget=1, updated_at=timezone.now())
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_unavailable_gig_is_a_404(self, client, gigs):
+        Gig.objects.filter(pk=gigs[0].pk).update(is_active=False)
+        resp = client.get(reverse("api:gig_detail", args=[gigs[0].pk]))
+        assert resp.status_code == 404
+        assert resp.json() == {"error": "No such gig."}
+
+
+@pytest.mark.django_db
+def test_categories_have_gig_counts(client, gigs):
+    results = client.get(reverse("api:categories")).json()["results"]
+    counts = {row["id"]: row["gig_count"] for row in results}
+    assert counts["design"] == 3
+    assert counts["writing"] == 2
+    assert len(results) == len(Gig.Category.choices)
@@ -0,0 +1,82 @@
+"""Tests for cached gig-card fragments (gigs/cards.py)."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.urls import reverse
+
+from core.cache import stats
+from gigs import cards
+from gigs.models import Gig
+
+
+def _listing():
+    return list(Gig.objects.available().select_related("employer"))
+
+
+@pytest.mark.django_db
+class TestRenderCards:
+    def test_matches_uncached_render(self, gig):
+        (row,) = _listing()
+        expected = get_template(cards.CARD_TEMPLATE).render({"gig": row})
+        assert cards.render_cards([row]) == expected
+        assert cards.render_cards([row]) == expected
+
+    def test_second_render_hits_cache(self, gig):
+        cards.render_cards(_listing())
+        html = cards.render_cards(_listing())
+        assert gig.title in html
+        assert stats([cards.STATS_NAME])[cards.STATS_NAME] == {
+            "hits": 1,
+            "misses": 1,
+            "hit_ratio": 0.5,
+        }
+
+    def test_one_cache_round_trip_per_page(self, gig, employer):
+        for n in range(3):
+            Gig.objects.create(
+                title=f"Gig {n}",
+                description="x",
+                employer=employer,
+                budget=10,
+                location="Remote",
+                category=Gig.Category.OTHER,
+            )
+        rows = _listing()
+        cards.render_cards(rows)
+        with patch.object(cache, "get_many", wraps=cache.get_many) as get_many:
+            cards.render_cards(rows)
+        assert get_many.call_count == 1
+        assert len(get_many.call_args.args[0]) == 4
+
+    def test_saving_the_gig_changes_its_card(self, gig):
+        cards.render_cards(_listing())
+        gig.title = "Renamed gig"
+        gig.save()
+        assert "Renamed gig" in cards.render_cards(_listing())
+
+    def test_renaming_the_employer_changes_their_cards(self, gig):
+        cards.render_cards(_listing())
+        employer = gig.employer
+        employer.username = "renamed_employer"
+        employer.save()
+        assert "by renamed_employer" in cards.render_cards(_listing())
+
+    def test_key_tracks_days_left_and_template(self, gig):
+        (row,) = _listing()
+        key = cards.card_key(row, "v1")
+        row.days_left = 4
+        assert cards.card_key(row, "v1") != key
+        assert cards.card_key(row, "v2") != cards.card_key(row, "v1")
+
+
+@pytest.mark.django_db
+def test_list_page_renders_cached_cards(client, gig):
+    first = client.get(reverse("gigs:gig_list"))
+    second = client.get(reverse("gigs:gig_list"))
+    assert gig.title.encode() in second.content
+    assert first.content == second.content
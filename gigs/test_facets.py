@@ -0,0 +1,128 @@
+"""Tests for the listing's facet counts (gigs/facets.py)."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from core.cache import stats
+from gigs import facets, listing
+from gigs.models import Gig
+
+
+def _facets(**params):
+    return facets.for_listing(listing.parse(params))
+
+
+def _counts(facet_list):
+    return {facet.value: facet.count for facet in facet_list}
+
+
+@pytest.fixture
+def gigs(employer):
+    rows = [
+        ("Logo design", Gig.Category.DESIGN, "Remote", 50),
+        ("Poster design", Gig.Category.DESIGN, "London", 250),
+        ("Shop website", Gig.Category.WEB_DEV, "remote", 1500),
+        ("Blog posts", Gig.Category.WRITING, "Leeds", 500),
+    ]
+    created = [
+        Gig.objects.create(
+            title=title,
+            description="Details to follow.",
+            employer=employer,
+            budget=budget,
+            location=location,
+            category=category,
+        )
+        for title, category, location, budget in rows
+    ]
+    # Neither counts: inactive, and past its deadline.
+    Gig.objects.create(
+        title="Old design job",
+        description="x",
+        employer=employer,
+        budget=50,
+        location="Remote",
+        category=Gig.Category.DESIGN,
+        is_active=False,
+    )
+    Gig.objects.create(
+        title="Expired design job",
+        description="x",
+        employer=employer,
+        budget=50,
+        location="Remote",
+        category=Gig.Category.DESIGN,
+        deadline=timezone.now().date() - timedelta(days=1),
+    )
+    return created
+
+
+@pytest.mark.django_db
+class TestForListing:
+    def test_counts_every_facet(self, gigs):
+        result = _facets()
+        assert _counts(result["category"])[Gig.Category.DESIGN] == 2
+        assert _counts(result["category"])[Gig.Category.WEB_DEV] == 1
+        assert _counts(result["category"])[Gig.Category.OTHER] == 0
+        assert _counts(result["location"]) == {"remote": 2, "onsite": 2}
+        assert _counts(result["budget"]) == {
+            "under-100": 1,
+            "100-500": 1,
+            "500-1000": 1,
+            "1000-plus": 1,
+        }
+
+    def test_category_narrows_the_other_facets_but_not_itself(self, gigs):
+        result = _facets(category=Gig.Category.DESIGN)
+        assert _counts(result["category"])[Gig.Category.WRITING] == 1
+        assert [f.value for f in result["category"] if f.selected] == [Gig.Category.DESIGN]
+        assert _counts(result["location"]) == {"remote": 1, "onsite": 1}
+        assert _counts(result["budget"])["1000-plus"] == 0
+
+    def test_search_narrows_every_facet(self, gigs):
+        result = _facets(search="design")
+        assert sum(_counts(result["category"]).values()) == 2
+        assert _counts(result["location"]) == {"remote": 1, "onsite": 1}
+
+    def test_one_grouped_query_then_cached(self, gigs, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            _facets(search="Design logo")
+        # Same terms in another order or case, and another category: cached.
+        with django_assert_num_queries(0):
+            _facets(search="logo  DESIGN", category=Gig.Category.DESIGN)
+
+    def test_other_filters_narrow_every_facet(self, gigs):
+        result = _facets(budget_min="100", location="REMOTE")
+        assert sum(_counts(result["category"]).values()) == 1
+        assert _counts(result["location"]) == {"remote": 1, "onsite": 0}
+        assert [f.value for f in result["location"] if f.selected] == ["remote"]
+
+    def test_gig_write_retires_cached_counts(self, gigs):
+        _facets()
+        gigs[0].category = Gig.Category.OTHER
+        gigs[0].save()
+        assert _counts(_facets()["category"])[Gig.Category.OTHER] == 1
+
+
+@pytest.mark.django_db
+class TestListingSidebar:
+    def test_sidebar_shows_counts(self, client, gigs):
+        resp = client.get(reverse("gigs:gig_list"))
+        assert resp.status_code == 200
+        facet = next(f for f in resp.context["facets"]["category"] if f.value == "design")
+        assert facet.count == 2
+        assert b"Graphic Design (2)" in resp.content
+
+    def test_repeat_with_other_category_skips_facet_query(self, client, gigs):
+        client.get(reverse("gigs:gig_list"), {"search": "design"})
+        client.get(reverse("gigs:gig_list"), {"search": "design", "category": "web_dev"})
+        assert stats([facets.STATS_NAME])[facets.STATS_NAME] == {
+            "hits": 1,
+            "misses": 1,
+            "hit_ratio": 0.5,
+        }
@@ -0,0 +1,129 @@
+"""Tests for featured-gig lifetime (gigs/featured.py)."""
+
+from __future__ import annotations
+
+import datetime as dt
+import time
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import OperationalError
+from django.urls import reverse
+from django.utils import timezone
+
+from gigs import featured
+from gigs.models import Gig
+
+
+def _feature(gig, **delta):
+    Gig.objects.filter(pk=gig.pk).update(
+        is_featured=True, featured_until=timezone.now() + dt.timedelta(**delta)
+    )
+    gig.refresh_from_db()
+    return gig
+
+
+@pytest.mark.django_db
+class TestFeatureGig:
+    def test_sets_featured_until(self, gig, settings):
+        settings.FEATURED_GIG_DAYS = 30
+        featured.feature_gig(gig)
+        gig.refresh_from_db()
+        assert gig.is_featured is True
+        remaining = gig.featured_until - timezone.now()
+        assert dt.timedelta(days=29, hours=23) < remaining <= dt.timedelta(days=30)
+
+    def test_extends_live_feature(self, gig):
+        _feature(gig, days=5)
+        featured.feature_gig(gig, days=30)
+        assert gig.featured_until - timezone.now() > dt.timedelta(days=34)
+
+    def test_lapsed_feature_restarts_from_now(self, gig):
+        _feature(gig, days=-5)
+        featured.feature_gig(gig, days=30)
+        assert gig.featured_until - timezone.now() < dt.timedelta(days=30, seconds=1)
+
+
+@pytest.mark.django_db
+class TestExpireFeatured:
+    def test_flips_only_lapsed_gigs(self, gig, employer):
+        live = Gig.objects.create(
+            title="Still featured",
+            description="x",
+            employer=employer,
+            budget=100,
+            location="Remote",
+            category=Gig.Category.OTHER,
+        )
+        _feature(gig, hours=-1)
+        _feature(live, days=3)
+
+        assert featured.expire_featured() == 1
+        gig.refresh_from_db()
+        live.refresh_from_db()
+        assert gig.is_featured is False
+        assert live.is_featured is True
+
+    def test_command(self, gig):
+        _feature(gig, minutes=-1)
+        out = StringIO()
+        call_command("expire_featured_gigs", stdout=out)
+        assert "Expired 1 featured gig(s)." in out.getvalue()
+
+    def test_featured_queryset_ignores_stale_flag(self, gig):
+        # Lapsed but the job hasn't run yet: no longer featured.
+        _feature(gig, minutes=-1)
+        assert gig.is_featured is True
+        assert not Gig.objects.featured().exists()
+
+    def test_home_hides_lapsed_feature_before_job_runs(self, client, gig):
+        _feature(gig, minutes=-1)
+        resp = client.get(reverse("core:home"))
+        assert resp.context["featured_gigs"] == []
+
+    def test_listing_drops_lapsed_feature_before_job_runs(self, client, gig, employer):
+        newer = Gig.objects.create(
+            title="Write a blog post",
+            description="x",
+            employer=employer,
+            budget=50,
+            location="Remote",
+            category=Gig.Category.WRITING,
+        )
+        _feature(gig, days=1)
+        resp = client.get(reverse("gigs:gig_list"))
+        assert [g.pk for g in resp.context["gigs"]] == [gig.pk, newer.pk]
+        assert b"ring-amber-200" in resp.content  # the card's badge
+
+        _feature(gig, minutes=-1)
+        resp = client.get(reverse("gigs:gig_list"), {"cursor": ""})
+        assert [g.pk for g in resp.context["gigs"]] == [newer.pk, gig.pk]
+        assert b"ring-amber-200" not in resp.content
+        api = client.get(reverse("api:gig_detail", args=[gig.pk])).json()
+        assert api["is_featured"] is False
+
+    def test_runner_disabled_by_default(self, settings):
+        settings.FEATURED_EXPIRY_INTERVAL = 0
+        assert featured.start_expiry_runner() is None
+
+
+# The runner thread has its own connection, so it must see committed rows.
+@pytest.mark.django_db(transaction=True)
+def test_runner_expires_in_background(gig):
+    _feature(gig, minutes=-1)
+    runner = featured.ExpiryRunner(interval=0.01)
+    runner.start()
+    try:
+        for _ in range(200):
+            time.sleep(0.01)
+            try:
+                if not Gig.objects.filter(pk=gig.pk, is_featured=True).exists():
+                    break
+            except OperationalError:  # shared-cache SQLite: runner mid-write
+                pass
+    finally:
+        runner.stop()
+        runner.join()
+    gig.refresh_from_db()
+    assert gig.is_featured is False
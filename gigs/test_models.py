@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import datetime as dt
+from io import StringIO
 
 import pytest
+from django.core.management import call_command
 from django.db import IntegrityError
 from django.utils import timezone
 
-from gigs.models import Application
+from gigs.models import Application, Gig
 
 
 @pytest.mark.django_db
@@ -39,6 +41,34 @@ class TestGigModel:
         assert gig.days_remaining is None
 
 
+@pytest.mark.django_db
+class TestAvailableQuerySet:
+    def _set_deadline(self, gig, days):
+        Gig.objects.filter(pk=gig.pk).update(deadline=timezone.now().date() + dt.timedelta(days))
+
+    def test_days_left_computed_in_sql(self, gig):
+        self._set_deadline(gig, 7)
+        assert Gig.objects.available().get().days_left == 7
+
+    def test_due_today_is_still_available(self, gig):
+        self._set_deadline(gig, 0)
+        assert Gig.objects.available().get().days_left == 0
+
+    def test_undated_gig_has_no_days_left(self, gig):
+        assert Gig.objects.available().get().days_left is None
+
+    def test_excludes_past_deadline_and_inactive(self, gig):
+        self._set_deadline(gig, -1)
+        assert not Gig.objects.available().exists()
+        Gig.objects.filter(pk=gig.pk).update(deadline=None, is_active=False)
+        assert not Gig.objects.available().exists()
+
+    def test_explicit_today(self, gig):
+        self._set_deadline(gig, 3)
+        tomorrow = timezone.now().date() + dt.timedelta(days=1)
+        assert Gig.objects.available(today=tomorrow).get().days_left == 2
+
+
 @pytest.mark.django_db
 class TestApplicationModel:
     def test_str(self, application):
@@ -66,3 +96,75 @@ class TestApplicationModel:
                 applicant=freelancer,
                 cover_letter="y" * 60,
             )
+
+
+@pytest.mark.django_db
+class TestApplicationCounters:
+    def _counts(self, gig):
+        gig.refresh_from_db()
+        return gig.application_count, gig.pending_count
+
+    def test_create_increments(self, application):
+        assert self._counts(application.gig) == (1, 1)
+
+    def test_status_change_moves_pending_only(self, application):
+        application.status = Application.Status.REVIEWED
+        application.save()
+        assert self._counts(application.gig) == (1, 0)
+        application.status = Application.Status.PENDING
+        application.save(update_fields=["status", "updated_at"])
+        assert self._counts(application.gig) == (1, 1)
+
+    def test_save_without_status_change_leaves_counts(self, application):
+        application.employer_notes = "Strong portfolio."
+        application.save(update_fields=["employer_notes", "updated_at"])
+        application.save()
+        assert self._counts(application.gig) == (1, 1)
+
+    def test_delete_decrements(self, application):
+        gig = application.gig
+        application.delete()
+        assert self._counts(gig) == (0, 0)
+
+    def test_cascade_from_applicant_delete_decrements(self, application):
+        gig = application.gig
+        application.applicant.delete()
+        assert self._counts(gig) == (0, 0)
+
+    def test_full_gig_save_does_not_clobber_counters(self, gig, freelancer):
+        stale = type(gig).objects.get(pk=gig.pk)
+        Application.objects.create(gig=gig, applicant=freelancer, cover_letter="x" * 60)
+        stale.title = "Edited while an application arrived"
+        stale.save()
+        assert self._counts(gig) == (1, 1)
+
+    def test_recount_command_repairs_drift(self, application):
+        gig = application.gig
+        type(gig).objects.filter(pk=gig.pk).update(application_count=7, pending_count=0)
+        out = StringIO()
+        call_command("recount_gigs", stdout=out)
+        assert f"gig {gig.pk}: applications 7 -> 1, pending 0 -> 1" in out.getvalue()
+        assert self._counts(gig) == (1, 1)
+
+    def test_recount_dry_run_changes_nothing(self, application):
+        gig = application.gig
+        type(gig).objects.filter(pk=gig.pk).update(application_count=7)
+        call_command("recount_gigs", "--dry-run", stdout=StringIO())
+        assert self._counts(gig) == (7, 1)
+
+    def test_set_status_updates_and_recounts(self, application):
+        gig = application.gig
+        changed = Application.objects.filter(gig=gig, status=Application.Status.PENDING)
+        assert changed.set_status(Application.Status.REJECTED) == 1
+        application.refresh_from_db()
+        assert application.status == Application.Status.REJECTED
+        assert application.updated_at > application.created_at
+        assert self._counts(gig) == (1, 0)
+
+    def test_set_status_skips_withdrawn_and_unchanged(self, application):
+        application.status = Application.Status.WITHDRAWN
+        application.save()
+        assert Application.objects.set_status(Application.Status.REVIEWED) == 0
+        assert Application.objects.set_status(Application.Status.WITHDRAWN) == 0
+        application.refresh_from_db()
+        assert application.status == Application.Status.WITHDRAWN
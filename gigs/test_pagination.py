@@ -0,0 +1,131 @@
+"""Tests for keyset (cursor) pagination."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.pagination import CursorPaginator, InvalidCursor
+from gigs.models import Gig
+
+ORDERING = ("-is_featured", "-created_at", "id")
+
+
+@pytest.fixture
+def gigs(employer):
+    """Seven gigs: two featured, and several sharing a created_at."""
+    Gig.objects.bulk_create(
+        [
+            Gig(
+                title=f"Gig {i}",
+                description="Some work.",
+                employer=employer,
+                budget=Decimal("100.00"),
+                location="Remote",
+                category=Gig.Category.OTHER,
+                is_featured=i in (2, 5),
+            )
+            for i in range(7)
+        ]
+    )
+    # Force ties on created_at so the id tie-breaker is exercised.
+    same_moment = timezone.now()
+    Gig.objects.filter(title__in=["Gig 0", "Gig 1", "Gig 3"]).update(created_at=same_moment)
+    return list(Gig.objects.order_by(*ORDERING))
+
+
+def _walk_forward(per_page):
+    paginator = CursorPaginator(Gig.objects.all(), ORDERING, per_page)
+    pages, cursor = [], None
+    while True:
+        page = paginator.page(cursor)
+        pages.append(page)
+        if not page.has_next():
+            return pages
+        cursor = page.next_cursor
+
+
+@pytest.mark.django_db
+class TestCursorPaginator:
+    def test_forward_walk_matches_full_ordering(self, gigs):
+        pages = _walk_forward(per_page=3)
+        assert [len(p) for p in pages] == [3, 3, 1]
+        assert [g.pk for p in pages for g in p] == [g.pk for g in gigs]
+
+    def test_walks_values_rows(self, gigs):
+        rows = Gig.objects.values("id", "title", "is_featured", "created_at")
+        paginator = CursorPaginator(rows, ORDERING, 4)
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        assert [row["id"] for row in [*first, *second]] == [g.pk for g in gigs]
+        assert [row["id"] for row in paginator.page(second.previous_cursor)] == [
+            g.pk for g in gigs[:4]
+        ]
+
+    def test_first_page_has_no_previous(self, gigs):
+        page = _walk_forward(per_page=3)[0]
+        assert page.has_previous() is False
+
+    def test_previous_cursor_returns_prior_page(self, gigs):
+        pages = _walk_forward(per_page=3)
+        paginator = CursorPaginator(Gig.objects.all(), ORDERING, 3)
+        back = paginator.page(pages[2].previous_cursor)
+        assert [g.pk for g in back] == [g.pk for g in pages[1]]
+        assert back.has_next() and back.has_previous()
+        first = paginator.page(back.previous_cursor)
+        assert [g.pk for g in first] == [g.pk for g in pages[0]]
+        assert first.has_previous() is False
+
+    def test_never_counts(self, gigs):
+        paginator = CursorPaginator(Gig.objects.all(), ORDERING, 3)
+        with CaptureQueriesContext(connection) as ctx:
+            paginator.page(paginator.page().next_cursor)
+        assert len(ctx.captured_queries) == 2
+        assert not any("COUNT(" in q["sql"].upper() for q in ctx.captured_queries)
+
+    @pytest.mark.parametrize("cursor", ["not-base64!", "bnVsbA", "WyJ4IixbXV0"])
+    def test_garbage_cursor_rejected(self, gigs, cursor):
+        paginator = CursorPaginator(Gig.objects.all(), ORDERING, 3)
+        with pytest.raises(InvalidCursor):
+            paginator.page(cursor)
+
+
+@pytest.mark.django_db
+class TestGigListCursorMode:
+    def test_html_defaults_to_page_numbers(self, client, gig):
+        resp = client.get(reverse("gigs:gig_list"))
+        assert resp.context["cursor_mode"] is False
+        assert resp.context["paginator"].count == 1
+
+    def test_cursor_param_opts_in_and_links_next_page(self, client, employer, gigs):
+        url = reverse("gigs:gig_list")
+        Gig.objects.bulk_create(
+            [
+                Gig(
+                    title=f"Extra {i}",
+                    description="More work.",
+                    employer=employer,
+                    budget=Decimal("10.00"),
+                    location="Remote",
+                    category=Gig.Category.OTHER,
+                )
+                for i in range(10)
+            ]
+        )
+        first = client.get(url, {"cursor": ""})
+        assert first.context["cursor_mode"] is True
+        page = first.context["page_obj"]
+        assert len(page) == 12 and page.has_next()
+        assert f"cursor={page.next_cursor}".encode() in first.content
+
+        second = client.get(url, {"cursor": page.next_cursor})
+        assert len(second.context["page_obj"]) == 5
+
+    def test_invalid_cursor_404s(self, client, gig):
+        resp = client.get(reverse("gigs:gig_list"), {"cursor": "garbage"})
+        assert resp.status_code == 404
@@ -0,0 +1,113 @@
+"""Tests for the gig full-text search index."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from gigs import search
+from gigs.models import Gig
+
+
+def _make_gig(employer, title, description="Details to follow.", **kwargs):
+    return Gig.objects.create(
+        title=title,
+        description=description,
+        employer=employer,
+        budget=Decimal("100.00"),
+        location="Remote",
+        category=Gig.Category.OTHER,
+        **kwargs,
+    )
+
+
+def _matches(query):
+    return list(search.search(Gig.objects.all(), query).values_list("title", flat=True))
+
+
+class TestTokenize:
+    def test_strips_punctuation_and_lowercases(self):
+        assert search.tokenize('  "Landing"  PAGE!! ') == ["landing", "page"]
+
+    def test_fts_operators_are_not_passed_through(self):
+        assert search.tokenize("logo OR -brand*") == ["logo", "or", "brand"]
+
+
+@pytest.mark.django_db
+class TestSearch:
+    def test_prefix_match_while_typing(self, gig):
+        assert _matches("land pag") == [gig.title]
+
+    def test_all_terms_must_match(self, gig):
+        assert _matches("landing spreadsheet") == []
+
+    def test_matches_description(self, gig):
+        assert _matches("next") == [gig.title]
+
+    def test_no_terms_matches_nothing(self, gig):
+        assert _matches("!!!") == []
+
+    def test_title_hits_rank_above_description_hits(self, employer):
+        _make_gig(employer, "Copy editing", description="Polish our logo guidelines doc.")
+        _make_gig(employer, "Logo refresh", description="New mark for a bakery.")
+        ranked = search.search(Gig.objects.all(), "logo").order_by("-search_rank")
+        assert [g.title for g in ranked] == ["Logo refresh", "Copy editing"]
+
+    def test_edit_reindexes(self, gig):
+        gig.title = "Translate a menu"
+        gig.save()
+        assert _matches("build") == []
+        assert _matches("menu") == ["Translate a menu"]
+
+    def test_delete_unindexes(self, gig):
+        gig.delete()
+        assert _matches("landing") == []
+
+    @pytest.mark.skipif(connection.vendor != "sqlite", reason="FTS5 table is sqlite-only")
+    def test_non_text_update_skips_reindex(self, gig, django_assert_num_queries):
+        gig.is_active = False
+        with django_assert_num_queries(1):
+            gig.save(update_fields=["is_active", "updated_at"])
+
+
+@pytest.mark.django_db
+class TestRebuildCommand:
+    def test_rebuild_recovers_rows_added_without_signals(self, employer):
+        Gig.objects.bulk_create(
+            [
+                Gig(
+                    title=f"Bulk gig {i}",
+                    description="Imported without signals.",
+                    employer=employer,
+                    budget=Decimal("50.00"),
+                    location="Remote",
+                    category=Gig.Category.OTHER,
+                )
+                for i in range(3)
+            ]
+        )
+        assert _matches("imported") == []
+        call_command("rebuild_search_index", batch_size=2, stdout=None)
+        assert len(_matches("imported")) == 3
+
+
+@pytest.mark.django_db
+class TestGigListSearch:
+    def test_ranked_results_keep_featured_first(self, client, employer):
+        _make_gig(employer, "Logo design", description="Logo, logo, logo.")
+        _make_gig(
+            employer,
+            "Brand kit",
+            description="Includes a logo.",
+            is_featured=True,
+            featured_until=timezone.now() + timedelta(days=1),
+        )
+        resp = client.get(reverse("gigs:gig_list"), {"search": "logo"})
+        titles = [g.title for g in resp.context["gigs"]]
+        assert titles == ["Brand kit", "Logo design"]
@@ -0,0 +1,182 @@
+"""Tests for bulk gig import and streaming export (gigs/transfer.py)."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+
+from core import page_cache
+from gigs import search, transfer
+from gigs.models import Gig
+
+HEADER = "title,description,budget,location,category,deadline\n"
+GOOD = "Logo design,A clean logo for a bakery,150,Remote,design,\n"
+BAD = "Nothing,,0,Remote,not-a-category,\n"
+
+
+def _import(text, employer, fmt="csv", **kwargs):
+    return transfer.import_gigs(transfer.read_rows(io.StringIO(text), fmt), employer, **kwargs)
+
+
+def _undecodable(good_rows: int) -> bytes:
+    # The bad byte lies past the first read buffer, so decoding fails mid-import.
+    return (HEADER + GOOD * good_rows).encode() + b"\xff\xfe" + GOOD.encode()
+
+
+@pytest.mark.django_db
+class TestImport:
+    def test_creates_valid_rows_and_reports_bad_ones(self, employer):
+        result = _import(HEADER + GOOD + BAD + GOOD, employer, batch_size=1)
+        assert result.created == 2
+        assert [error.line for error in result.errors] == [3]
+        assert set(result.errors[0].errors) == {"description", "budget", "category"}
+        assert Gig.objects.filter(employer=employer).count() == 2
+
+    def test_batches_are_one_insert_each(self, employer, django_assert_num_queries):
+        # Per batch: savepoint, INSERT, two search-index statements, release.
+        with django_assert_num_queries(10):
+            result = _import(HEADER + GOOD * 5, employer, batch_size=3)
+        assert result.created == 5
+
+    def test_imported_gigs_are_searchable(self, employer):
+        _import(HEADER + GOOD, employer)
+        assert search.search(Gig.objects.all(), "bakery").count() == 1
+
+    def test_jsonl(self, employer):
+        text = (
+            json.dumps(
+                {
+                    "title": "Translate a menu",
+                    "description": "French to English",
+                    "budget": 80,
+                    "location": "Paris",
+                    "category": "translation",
+                    "deadline": "2030-01-31",
+                }
+            )
+            + "\n\n[1, 2]\n{broken\n"
+        )
+        result = _import(text, employer, fmt="jsonl")
+        assert result.created == 1
+        assert [error.line for error in result.errors] == [3, 4]
+        assert Gig.objects.get().deadline.isoformat() == "2030-01-31"
+
+    def test_dry_run_creates_nothing(self, employer):
+        assert _import(HEADER + GOOD, employer, dry_run=True).created == 1
+        assert not Gig.objects.exists()
+
+    def test_bad_bytes_keep_earlier_batches(self, employer):
+        generation = page_cache.generation()
+        stream = io.TextIOWrapper(io.BytesIO(_undecodable(400)), encoding="utf-8", newline="")
+        result = transfer.import_gigs(transfer.read_rows(stream, "csv"), employer, batch_size=50)
+        assert result.stopped.startswith("Stopped reading after line ")
+        assert result.created > 0
+        assert Gig.objects.filter(employer=employer).count() == result.created
+        assert page_cache.generation() != generation
+
+    def test_empty_csv(self, employer):
+        with pytest.raises(transfer.ImportFormatError):
+            _import("", employer)
+
+
+@pytest.mark.django_db
+class TestImportViewAndCommand:
+    def test_upload(self, client, employer):
+        client.force_login(employer)
+        upload = SimpleUploadedFile("gigs.csv", (HEADER + GOOD + BAD).encode(), "text/csv")
+        resp = client.post(reverse("gigs:import_gigs"), {"file": upload})
+        assert resp.status_code == 200
+        assert resp.context["result"].created == 1
+        assert b"line 3" in resp.content
+        assert Gig.objects.filter(employer=employer).count() == 1
+
+    def test_upload_rejects_binary(self, client, employer):
+        client.force_login(employer)
+        upload = SimpleUploadedFile("gigs.csv", b"\xff\xfe\x00junk", "text/csv")
+        resp = client.post(reverse("gigs:import_gigs"), {"file": upload})
+        assert resp.context["form"].errors["file"]
+        assert not Gig.objects.exists()
+
+    def test_upload_shows_partial_import(self, client, employer):
+        client.force_login(employer)
+        upload = SimpleUploadedFile("gigs.csv", _undecodable(400), "text/csv")
+        resp = client.post(reverse("gigs:import_gigs"), {"file": upload})
+        assert resp.context["result"].created == Gig.objects.count() > 0
+        assert b"Stopped reading after line" in resp.content
+
+    def test_command(self, employer, tmp_path):
+        path = tmp_path / "gigs.csv"
+        path.write_text(HEADER + GOOD + BAD)
+        out, err = io.StringIO(), io.StringIO()
+        call_command("import_gigs", str(path), employer=employer.username, stdout=out, stderr=err)
+        assert "Imported 1 of 2 row(s); 1 error(s)." in out.getvalue()
+        assert "line 3" in err.getvalue()
+
+    def test_command_reports_where_it_stopped(self, employer, tmp_path):
+        path = tmp_path / "gigs.csv"
+        path.write_bytes(_undecodable(400))
+        out = io.StringIO()
+        with pytest.raises(CommandError, match="Stopped reading after line"):
+            call_command("import_gigs", str(path), employer=employer.username, stdout=out)
+        assert f"Imported {Gig.objects.count()} of" in out.getvalue()
+
+    def test_command_unknown_employer(self, tmp_path):
+        with pytest.raises(CommandError):
+            call_command("import_gigs", str(tmp_path / "x.csv"), employer="nobody")
+
+
+@pytest.mark.django_db
+class TestExport:
+    def _download(self, client, kind, fmt):
+        resp = client.get(reverse("gigs:export_gigs", args=[kind, fmt]))
+        assert resp.streaming
+        return b"".join(resp.streaming_content).decode()
+
+    def test_gigs_csv(self, client, gig, freelancer):
+        Gig.objects.create(
+            title="Someone else's",
+            description="x",
+            employer=freelancer,
+            budget=Decimal("5"),
+            location="Remote",
+            category=Gig.Category.OTHER,
+        )
+        client.force_login(gig.employer)
+        rows = list(csv.DictReader(io.StringIO(self._download(client, "gigs", "csv"))))
+        assert [(row["title"], row["budget"]) for row in rows] == [(gig.title, "800.00")]
+
+    def test_csv_neutralises_formulas(self, client, application):
+        formula = '=HYPERLINK("http://evil.example","Click")'
+        application.cover_letter = formula
+        application.save()
+        client.force_login(application.gig.employer)
+        (row,) = csv.DictReader(io.StringIO(self._download(client, "applications", "csv")))
+        assert row["cover_letter"] == "'" + formula
+        assert row["applicant_username"] == application.applicant.username
+        jsonl = json.loads(self._download(client, "applications", "jsonl"))
+        assert jsonl["cover_letter"] == formula
+
+    def test_applications_jsonl(self, client, application):
+        client.force_login(application.gig.employer)
+        lines = self._download(client, "applications", "jsonl").splitlines()
+        row = json.loads(lines[0])
+        assert len(lines) == 1
+        assert row["applicant_username"] == application.applicant.username
+        assert row["proposed_rate"] == "750.00"
+
+    def test_round_trip(self, client, gig):
+        client.force_login(gig.employer)
+        exported = self._download(client, "gigs", "csv")
+        assert _import(exported, gig.employer).created == 1
+        assert Gig.objects.filter(title=gig.title).count() == 2
+
+    def test_unknown_export_404s(self, client, employer):
+        client.force_login(employer)
+        assert client.get(reverse("gigs:export_gigs", args=["users", "csv"])).status_code == 404
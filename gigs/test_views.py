@@ -2,13 +2,22 @@
 
 from __future__ import annotations
 
+import threading
+import time
+from datetime import timedelta
 from decimal import Decimal
 
 import pytest
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.test import Client
 from django.urls import reverse
+from django.utils import timezone
 
 from gigs.models import Application, Gig
 
+User = get_user_model()
+
 
 @pytest.mark.django_db
 class TestGigList:
@@ -31,12 +40,158 @@ class TestGigList:
         assert b"logo" in resp.content.lower()
         assert b"landing page" not in resp.content.lower()
 
+    def test_hides_gigs_past_their_deadline(self, client, gig):
+        Gig.objects.filter(pk=gig.pk).update(deadline=timezone.now().date() - timedelta(days=1))
+        resp = client.get(reverse("gigs:gig_list"))
+        assert gig.title.encode() not in resp.content
+
+    def test_card_shows_days_left(self, client, gig):
+        Gig.objects.filter(pk=gig.pk).update(deadline=timezone.now().date() + timedelta(days=5))
+        resp = client.get(reverse("gigs:gig_list"))
+        assert b"5 days left" in resp.content
+
     def test_category_filter(self, client, gig):
         resp = client.get(reverse("gigs:gig_list"), {"category": Gig.Category.DESIGN})
         assert resp.status_code == 200
         assert gig.title.encode() not in resp.content
 
 
+@pytest.mark.django_db
+class TestListingFilters:
+    @pytest.fixture
+    def gigs(self, employer):
+        today = timezone.now().date()
+        rows = [
+            ("Cheap remote", "Remote", "50", today + timedelta(days=3)),
+            ("Mid london", "London", "400", today + timedelta(days=10)),
+            ("Pricey remote", "remote", "2000", None),
+        ]
+        for title, location, budget, deadline in rows:
+            Gig.objects.create(
+                title=title,
+                description="x",
+                employer=employer,
+                budget=Decimal(budget),
+                location=location,
+                category=Gig.Category.OTHER,
+                deadline=deadline,
+            )
+
+    def _titles(self, client, **params):
+        resp = client.get(reverse("gigs:gig_list"), params)
+        assert resp.status_code == 200
+        return [gig.title for gig in resp.context["gigs"]]
+
+    def test_budget_range_is_inclusive(self, client, gigs):
+        assert self._titles(client, budget_min="50", budget_max="400", sort="budget_asc") == [
+            "Cheap remote",
+            "Mid london",
+        ]
+
+    def test_location_ignores_case(self, client, gigs):
+        titles = self._titles(client, location="REMOTE", sort="budget_desc")
+        assert titles == ["Pricey remote", "Cheap remote"]
+
+    def test_deadline_before_drops_later_and_undated_gigs(self, client, gigs):
+        cutoff = timezone.now().date() + timedelta(days=5)
+        assert self._titles(client, deadline_before=cutoff.isoformat()) == ["Cheap remote"]
+
+    def test_closing_soon_puts_undated_gigs_last(self, client, gigs):
+        titles = self._titles(client, sort="closing")
+        assert titles == ["Cheap remote", "Mid london", "Pricey remote"]
+
+    def test_newest(self, client, gigs):
+        assert self._titles(client, sort="newest")[0] == "Pricey remote"
+
+    def test_invalid_values_are_ignored(self, client, gigs):
+        titles = self._titles(client, budget_min="lots", sort="random", deadline_before="soon")
+        assert len(titles) == 3
+
+    def test_cursor_pages_follow_the_sort(self, client, gigs):
+        resp = client.get(reverse("gigs:gig_list"), {"cursor": "", "sort": "budget_asc"})
+        assert [gig.title for gig in resp.context["gigs"]] == [
+            "Cheap remote",
+            "Mid london",
+            "Pricey remote",
+        ]
+        assert b"Sorted by budget: low to high." in resp.content
+        assert b"Featured gigs first" not in resp.content
+
+    def test_cursor_pages_without_a_keyset_sort_say_so(self, client, gigs):
+        resp = client.get(reverse("gigs:gig_list"), {"cursor": "", "sort": "closing"})
+        assert b"Featured gigs first, then newest." in resp.content
+
+    def test_pagination_links_keep_the_filters(self, client, employer):
+        for n in range(13):
+            Gig.objects.create(
+                title=f"Gig {n}",
+                description="x",
+                employer=employer,
+                budget=Decimal("100"),
+                location="Leeds",
+                category=Gig.Category.OTHER,
+            )
+        resp = client.get(reverse("gigs:gig_list"), {"location": "leeds", "sort": "newest"})
+        assert b"?location=leeds&amp;sort=newest&amp;page=2" in resp.content
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def test_detail_revalidates_with_304(self, client, gig, django_assert_max_num_queries):
+        url = reverse("gigs:gig_detail", args=[gig.pk])
+        first = client.get(url)
+        assert first.has_header("ETag") and first.has_header("Last-Modified")
+        assert "Cookie" in first["Vary"]
+
+        with django_assert_max_num_queries(1):
+            again = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        assert again.status_code == 304
+        assert again.content == b""
+        assert not again.templates
+
+        since = client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        assert since.status_code == 304
+
+    def test_detail_changes_when_gig_saved(self, client, gig):
+        url = reverse("gigs:gig_detail", args=[gig.pk])
+        etag = client.get(url)["ETag"]
+        gig.title = "Renamed"
+        gig.save()
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_logged_in_variant_has_its_own_etag(self, client, gig, freelancer):
+        url = reverse("gigs:gig_detail", args=[gig.pk])
+        anon = client.get(url)["ETag"]
+        client.force_login(freelancer)
+        resp = client.get(url, HTTP_IF_NONE_MATCH=anon)
+        assert resp.status_code == 200
+        assert resp["ETag"] != anon
+        assert not resp.has_header("Last-Modified")
+
+    def test_detail_changes_when_viewer_applies(self, client, gig, freelancer):
+        client.force_login(freelancer)
+        url = reverse("gigs:gig_detail", args=[gig.pk])
+        etag = client.get(url)["ETag"]
+        Application.objects.create(gig=gig, applicant=freelancer, cover_letter="x" * 60)
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_listing_revalidates_until_gigs_change(self, client, gig, employer):
+        url = reverse("gigs:gig_list")
+        etag = client.get(url)["ETag"]
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        assert client.get(url, {"search": "landing"}, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+        Gig.objects.create(
+            title="Another gig",
+            description="x",
+            employer=employer,
+            budget=Decimal("10"),
+            location="Remote",
+            category=Gig.Category.OTHER,
+        )
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
 @pytest.mark.django_db
 class TestGigDetail:
     def test_renders(self, client, gig):
@@ -124,6 +279,18 @@ class TestApplyFlow:
         resp = client.get(reverse("gigs:apply_to_gig", kwargs={"pk": application.gig.pk}))
         assert resp.status_code == 302
 
+    def test_repeat_submission_returns_existing(self, client, application):
+        # The form was open in two tabs: the second POST hits the constraint.
+        client.force_login(application.applicant)
+        resp = client.post(
+            reverse("gigs:apply_to_gig", kwargs={"pk": application.gig.pk}),
+            {"cover_letter": "y" * 60, "proposed_rate": "500"},
+        )
+        assert resp.url == application.get_absolute_url()
+        assert Application.objects.get().cover_letter == application.cover_letter
+        application.gig.refresh_from_db()
+        assert (application.gig.application_count, application.gig.pending_count) == (1, 1)
+
     def test_withdraw_only_by_applicant(self, client, application, employer):
         client.force_login(employer)
         resp = client.post(reverse("gigs:withdraw_application", kwargs={"pk": application.pk}))
@@ -146,3 +313,223 @@ class TestApplicationDetail:
         client.force_login(application.gig.employer)
         resp = client.get(reverse("gigs:application_detail", kwargs={"pk": application.pk}))
         assert resp.status_code == 200
+
+
+@pytest.mark.django_db
+class TestMyGigs:
+    def test_dashboard_counts_come_from_gig_columns(self, client, application):
+        employer = application.gig.employer
+        application.status = Application.Status.REJECTED
+        application.save()
+        client.force_login(employer)
+        resp = client.get(reverse("gigs:my_gigs"))
+        assert resp.context["total_applications"] == 1
+        assert resp.context["pending_applications"] == 0
+        row = resp.context["gigs"][0]
+        assert (row.application_count, row.pending_count) == (1, 0)
+
+    def test_withdraw_updates_pending_count(self, client, application):
+        client.force_login(application.applicant)
+        client.post(reverse("gigs:withdraw_application", kwargs={"pk": application.pk}))
+        application.gig.refresh_from_db()
+        assert application.gig.pending_count == 0
+        assert application.gig.application_count == 1
+
+    def test_status_update_view_updates_pending_count(self, client, application):
+        client.force_login(application.gig.employer)
+        client.post(
+            reverse("gigs:update_application_status", kwargs={"pk": application.pk}),
+            {"status": Application.Status.ACCEPTED, "employer_notes": ""},
+        )
+        application.gig.refresh_from_db()
+        assert application.gig.pending_count == 0
+
+
+@pytest.mark.django_db
+class TestBulkApplicationStatus:
+    @pytest.fixture
+    def applications(self, gig):
+        applicants = User.objects.bulk_create(
+            User(username=f"bulk{i}", password="!") for i in range(3)
+        )
+        return [
+            Application.objects.create(gig=gig, applicant=applicant, cover_letter="x" * 60)
+            for applicant in applicants
+        ]
+
+    def _post(self, client, gig, **data):
+        return client.post(reverse("gigs:bulk_update_applications", kwargs={"pk": gig.pk}), data)
+
+    def _statuses(self, applications):
+        return [a.status for a in Application.objects.filter(pk__in=[a.pk for a in applications])]
+
+    def test_updates_selected(self, client, gig, applications):
+        client.force_login(gig.employer)
+        resp = self._post(
+            client, gig, status="reviewed", applications=[applications[0].pk, applications[1].pk]
+        )
+        assert resp.status_code == 302
+        assert sorted(self._statuses(applications)) == ["pending", "reviewed", "reviewed"]
+        gig.refresh_from_db()
+        assert (gig.application_count, gig.pending_count) == (3, 1)
+
+    def test_reject_all_pending(self, client, gig, applications):
+        applications[0].status = Application.Status.ACCEPTED
+        applications[0].save()
+        client.force_login(gig.employer)
+        resp = self._post(client, gig, status="rejected", all_pending="1")
+        assert self._statuses(applications).count("rejected") == 2
+        assert "2 applications marked rejected." in [str(m) for m in resp.wsgi_request._messages]
+        gig.refresh_from_db()
+        assert gig.pending_count == 0
+
+    def test_rejects_applications_from_another_gig(self, client, gig, applications, application):
+        other = Gig.objects.create(
+            title="Other",
+            description="Work",
+            employer=gig.employer,
+            budget=Decimal("10"),
+            location="Remote",
+            category=Gig.Category.OTHER,
+        )
+        client.force_login(gig.employer)
+        resp = self._post(client, other, status="rejected", applications=[applications[0].pk])
+        assert resp.status_code == 403
+        assert self._statuses(applications) == ["pending"] * 3
+
+    def test_only_the_employer(self, client, gig, applications, freelancer):
+        client.force_login(freelancer)
+        resp = self._post(client, gig, status="rejected", all_pending="1")
+        assert resp.status_code == 403
+
+    def test_cannot_set_withdrawn(self, client, gig, applications):
+        client.force_login(gig.employer)
+        self._post(client, gig, status="withdrawn", applications=[applications[0].pk])
+        assert self._statuses(applications) == ["pending"] * 3
+
+    def test_thousands_in_constant_queries(self, client, gig, django_assert_max_num_queries):
+        applicants = User.objects.bulk_create(
+            User(username=f"many{i}", password="!") for i in range(2000)
+        )
+        Application.objects.bulk_create(
+            Application(gig=gig, applicant=applicant, cover_letter="x" * 60)
+            for applicant in applicants
+        )
+        ids = list(gig.applications.values_list("pk", flat=True))
+        client.force_login(gig.employer)
+        with django_assert_max_num_queries(9):
+            self._post(client, gig, status="reviewed", applications=",".join(map(str, ids)))
+        assert not gig.applications.filter(status="pending").exists()
+
+
+@pytest.mark.django_db
+class TestDashboardPagination:
+    @pytest.fixture
+    def many_applications(self, gig, employer):
+        """Three freelancers applied to ``gig``, oldest first."""
+        apps = []
+        for i in range(3):
+            applicant = User.objects.create_user(username=f"applicant{i}", password="x")
+            apps.append(
+                Application.objects.create(
+                    gig=gig, applicant=applicant, cover_letter=f"Letter {i}. " + "x" * 500
+                )
+            )
+        return apps
+
+    def test_gig_applications_pages_newest_first(self, client, gig, many_applications, monkeypatch):
+        monkeypatch.setattr("gigs.views.DASHBOARD_PAGE_SIZE", 2)
+        client.force_login(gig.employer)
+        url = reverse("gigs:gig_applications", kwargs={"pk": gig.pk})
+        first = client.get(url)
+        assert [a.pk for a in first.context["applications"]] == [
+            many_applications[2].pk,
+            many_applications[1].pk,
+        ]
+        assert b"3 applications received" in first.content
+        second = client.get(url, {"cursor": first.context["page_obj"].next_cursor})
+        assert [a.pk for a in second.context["applications"]] == [many_applications[0].pk]
+
+    def test_gig_applications_loads_excerpt_not_full_letter(self, client, gig, many_applications):
+        client.force_login(gig.employer)
+        resp = client.get(reverse("gigs:gig_applications", kwargs={"pk": gig.pk}))
+        application = resp.context["applications"][0]
+        assert "cover_letter" in application.get_deferred_fields()
+        assert len(application.cover_excerpt) == 300
+
+    def test_my_applications_pages(self, client, employer, freelancer, monkeypatch):
+        monkeypatch.setattr("gigs.views.DASHBOARD_PAGE_SIZE", 1)
+        for i in range(2):
+            posted = Gig.objects.create(
+                title=f"Gig {i}",
+                description="Work",
+                employer=employer,
+                budget=Decimal("10"),
+                location="Remote",
+                category=Gig.Category.OTHER,
+            )
+            Application.objects.create(gig=posted, applicant=freelancer, cover_letter="x" * 60)
+        client.force_login(freelancer)
+        first = client.get(reverse("gigs:my_applications"))
+        assert first.context["page_obj"].has_next()
+        assert b"Gig 1" in first.content and b"Gig 0" not in first.content
+        second = client.get(
+            reverse("gigs:my_applications"), {"cursor": first.context["page_obj"].next_cursor}
+        )
+        assert b"Gig 0" in second.content
+
+    def test_bad_cursor_404s(self, client, freelancer):
+        client.force_login(freelancer)
+        resp = client.get(reverse("gigs:my_applications"), {"cursor": "nope"})
+        assert resp.status_code == 404
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_applies_create_one_application_each(gig, settings):
+    # SQLite serialises writers, so this only races for real on Postgres
+    # (TEST_DATABASE_URL); there the old check-then-insert raised IntegrityError.
+    # The lock retries below would otherwise drain the shared IP bucket.
+    settings.RATE_LIMIT_ENABLED = False
+    applicants = User.objects.bulk_create(
+        User(username=f"rush{i}", password="!") for i in range(10)
+    )
+    # Each applicant submits three times at once, each from its own client.
+    attempts = []
+    for applicant in applicants * 3:
+        client = Client()
+        client.force_login(applicant)
+        attempts.append(client)
+    barrier = threading.Barrier(len(attempts))
+    statuses, errors = [], []
+    url = reverse("gigs:apply_to_gig", kwargs={"pk": gig.pk})
+
+    def apply(client):
+        try:
+            barrier.wait()
+            for _ in range(200):
+                try:
+                    resp = client.post(url, {"cover_letter": "x" * 60})
+                    statuses.append(resp.status_code)
+                    break
+                except OperationalError as exc:
+                    # The shared-cache in-memory SQLite test DB reports a held
+                    # write lock instead of waiting for it; back off and retry.
+                    if "locked" not in str(exc):
+                        raise
+                    time.sleep(0.01)
+        except Exception as exc:  # surfaced below
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=apply, args=[client]) for client in attempts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert statuses == [302] * len(attempts)
+    assert Application.objects.filter(gig=gig).count() == len(applicants)
+    gig.refresh_from_db()
+    assert (gig.application_count, gig.pending_count) == (len(applicants), len(applicants))
@@ -0,0 +1,219 @@
+"""Bulk gig import and streaming export.
+
+Import (``import_gigs``, used by the "Import gigs" page and
+``manage.py import_gigs``) reads CSV with a header row or JSON Lines, one
+object per line. Each row is validated by ``GigForm``, so it follows the
+same rules as the "Post a gig" page. The form's fields are the only
+columns read; any others are ignored. Valid rows are written with
+``bulk_create`` in batches of ``batch_size``, each batch in its own
+transaction together with its search-index rows. Invalid rows are skipped
+and reported with their line number, so a partly bad file imports
+everything else and only the reported lines need resending. Text that
+isn't UTF-8 or isn't CSV is only found once reading gets to it; the
+import stops there, keeps the batches already written and says where
+it stopped (``ImportResult.stopped``). ``bulk_create`` bypasses
+``post_save``, so the search index and the cached home page and pages
+are updated here instead, however the import ends.
+
+Export (``export_lines``) yields a CSV or JSON Lines file of an employer's
+gigs or of the applications to them. Rows come from ``.values_list()``
+over ``.iterator()``, so a ``StreamingHttpResponse`` sends a large account
+in constant memory. CSV text cells that a spreadsheet would run as a
+formula (``=``, ``+``, ``-``, ``@``, tab, CR) get a leading ``'``.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import router, transaction
+
+from core import home, page_cache
+
+from . import search
+from .forms import GigForm
+from .models import Application, Gig
+
+FORMATS = ("csv", "jsonl")
+UNREADABLE = "The file isn't UTF-8 CSV or JSON Lines text."
+IMPORT_BATCH_SIZE = 500
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORTS = {
+    "gigs": (
+        "id",
+        "title",
+        "description",
+        "budget",
+        "location",
+        "category",
+        "deadline",
+        "is_active",
+        "application_count",
+        "pending_count",
+        "created_at",
+    ),
+    "applications": (
+        "id",
+        "gig_id",
+        "gig__title",
+        "applicant__username",
+        "status",
+        "proposed_rate",
+        "cover_letter",
+        "created_at",
+    ),
+}
+
+
+class ImportFormatError(ValueError):
+    """The file as a whole can't be read (unknown format, no CSV header)."""
+
+
+@dataclass
+class RowError:
+    line: int
+    errors: dict[str, list[str]]
+
+    def __str__(self) -> str:
+        parts = [
+            f"{name}: {' '.join(messages)}" if name != "__all__" else " ".join(messages)
+            for name, messages in self.errors.items()
+        ]
+        return f"line {self.line}: {'; '.join(parts)}"
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    errors: list[RowError] = field(default_factory=list)
+    # Why reading stopped before the end of the file, if it did.
+    stopped: str | None = None
+
+    @property
+    def rows(self) -> int:
+        return self.created + len(self.errors)
+
+
+def format_for(filename: str) -> str:
+    """Guess the format from a file name: ``.jsonl`` / ``.ndjson`` or CSV."""
+    return "jsonl" if filename.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def read_rows(stream: io.TextIOBase, fmt: str) -> Iterator[tuple[int, dict | None]]:
+    """Yield ``(line number, row)``. ``row`` is None if the line isn't an object."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        if not reader.fieldnames:
+            raise ImportFormatError("The CSV file is empty or has no header row.")
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "jsonl":
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_no, row if isinstance(row, dict) else None
+    else:
+        raise ImportFormatError(f"Unknown format {fmt!r}; use one of {', '.join(FORMATS)}.")
+
+
+def import_gigs(
+    rows: Iterable[tuple[int, dict | None]],
+    employer,
+    *,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    dry_run: bool = False,
+    using: str | None = None,
+) -> ImportResult:
+    """Validate ``rows`` (from ``read_rows``) and create a gig for each valid one."""
+    using = using or router.db_for_write(Gig)
+    result = ImportResult()
+    batch: list[Gig] = []
+    line = 0
+
+    def flush():
+        with transaction.atomic(using=using):
+            created = Gig.objects.using(using).bulk_create(batch)
+            search.index_gigs([gig.pk for gig in created if gig.pk is not None], using)
+        result.created += len(created)
+        batch.clear()
+
+    try:
+        try:
+            for line, row in rows:
+                if row is None:
+                    result.errors.append(RowError(line, {"__all__": ["Not a JSON object."]}))
+                    continue
+                form = GigForm(data=row)
+                if not form.is_valid():
+                    result.errors.append(
+                        RowError(line, {name: list(errors) for name, errors in form.errors.items()})
+                    )
+                    continue
+                if dry_run:
+                    result.created += 1
+                    continue
+                gig = form.save(commit=False)
+                gig.employer = employer
+                batch.append(gig)
+                if len(batch) >= batch_size:
+                    flush()
+        except (UnicodeDecodeError, csv.Error):
+            where = f"after line {line}" if line else "at the start"
+            result.stopped = f"Stopped reading {where}: {UNREADABLE}"
+        if batch:
+            flush()
+    finally:
+        # Earlier batches are committed even if a later one failed.
+        if result.created and not dry_run:
+            home.invalidate_gigs()
+            page_cache.invalidate()
+    return result
+
+
+# Spreadsheets run a cell starting with one of these as a formula.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _spreadsheet_safe(value):
+    """``value``, with a ``'`` in front if it is text a spreadsheet would run as a formula."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class _Line:
+    """File-like sink for ``csv.writer`` that hands back what it wrote."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def export_lines(kind: str, fmt: str, employer) -> Iterator[str]:
+    """Yield the lines of an export of ``employer``'s ``kind`` (``EXPORTS``)."""
+    columns = EXPORTS[kind]
+    if kind == "gigs":
+        queryset = Gig.objects.filter(employer=employer).order_by("pk")
+    else:
+        queryset = Application.objects.filter(gig__employer=employer).order_by("pk")
+    values = queryset.values_list(*columns).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    header = [column.replace("__", "_") for column in columns]
+
+    if fmt == "csv":
+        writer = csv.writer(_Line())
+        yield writer.writerow(header)
+        # Titles, cover letters and usernames are typed by other users.
+        for row in values:
+            yield writer.writerow([_spreadsheet_safe(value) for value in row])
+    else:
+        for row in values:
+            yield json.dumps(dict(zip(header, row, strict=True)), cls=DjangoJSONEncoder) + "\n"
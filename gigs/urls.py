@@ -11,6 +11,8 @@ urlpatterns = [
     path("", views.GigListView.as_view(), name="gig_list"),
     path("post/", views.GigCreateView.as_view(), name="gig_create"),
     path("my-gigs/", views.my_gigs, name="my_gigs"),
+    path("my-gigs/import/", views.import_gigs, name="import_gigs"),
+    path("my-gigs/export/<slug:kind>.<slug:fmt>", views.export_gigs, name="export_gigs"),
     path("my-applications/", views.my_applications, name="my_applications"),
     # Single gig
     path("<int:pk>/", views.GigDetailView.as_view(), name="gig_detail"),
@@ -19,6 +21,11 @@ urlpatterns = [
     path("<int:pk>/toggle/", views.toggle_gig_status, name="toggle_gig_status"),
     path("<int:pk>/apply/", views.apply_to_gig, name="apply_to_gig"),
     path("<int:pk>/applications/", views.gig_applications, name="gig_applications"),
+    path(
+        "<int:pk>/applications/bulk/",
+        views.bulk_update_applications,
+        name="bulk_update_applications",
+    ),
     # Single application
     path(
         "application/<int:pk>/",
@@ -2,14 +2,24 @@
 
 from __future__ import annotations
 
+import hashlib
+import io
+
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db.models import Count, Q
-from django.http import Http404, HttpResponseForbidden
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import Coalesce, Substr
+from django.http import Http404, HttpResponseForbidden, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.defaultfilters import pluralize
 from django.urls import reverse_lazy
+from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views.decorators.http import require_POST
+from django.views.decorators.vary import vary_on_cookie
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -18,13 +28,40 @@ from django.views.generic import (
     UpdateView,
 )
 
-from .forms import ApplicationForm, ApplicationStatusForm, GigForm
+from core import page_cache
+from core.async_views import AsyncDispatchMixin, auser, condition
+from core.gather import gather
+from core.page_cache import cache_anonymous_page, has_pending_messages
+from core.pagination import CursorPaginator, InvalidCursor, cursor_page
+from core.ratelimit import rate_limit
+
+from . import facets, listing, transfer
+from .forms import (
+    ApplicationForm,
+    ApplicationStatusForm,
+    BulkApplicationStatusForm,
+    GigFilterForm,
+    GigForm,
+    GigImportForm,
+)
 from .models import Application, Gig
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+# Dashboard lists page by keyset, newest first, with no COUNT(*).
+DASHBOARD_ORDERING = ("-created_at", "-id")
+DASHBOARD_PAGE_SIZE = 20
+
+# Enough cover letter for the three-line clamp on the applications list.
+COVER_EXCERPT_CHARS = 300
+
+# Bad rows listed on the import page; any beyond are only counted.
+IMPORT_ERRORS_SHOWN = 50
+
+EXPORT_CONTENT_TYPES = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson"}
+
 
 class EmployerOwnsGigMixin(UserPassesTestMixin):
     """Only the gig's employer may proceed."""
@@ -41,55 +78,240 @@ class EmployerOwnsGigMixin(UserPassesTestMixin):
 
 
 # ---------------------------------------------------------------------------
-# Gig CRUD
+# Conditional GET
 # ---------------------------------------------------------------------------
+#
+# The public gig pages answer If-None-Match / If-Modified-Since with a 304
+# before any view code or template runs (``core.async_views.condition``).
+# Validators are cheap fingerprints of what the page shows:
+#
+#   detail   the gig's updated_at and counters (+ the viewer's application)
+#   listing  max(updated_at) and count of the filtered gigs, plus the query
+#
+# Both include today's date (deadline countdowns tick over at midnight) and
+# the viewer, and every response carries ``Vary: Cookie``, so a logged-in
+# variant is never revalidated against an anonymous one. Last-Modified is
+# only sent to anonymous viewers, whose page depends on nothing else.
+
+
+def _skip_conditional(request) -> bool:
+    # Queued flash messages must be rendered, not hidden behind a 304.
+    return has_pending_messages(request)
+
+
+def _viewer(request) -> str:
+    user = request.user
+    if not user.is_authenticated:
+        return "anon"
+    try:
+        role = user.userprofile.user_type
+    except ObjectDoesNotExist:
+        role = ""
+    return f"user:{user.pk}:{role}"
+
+
+def _etag(*parts) -> str:
+    return hashlib.md5("|".join(str(p) for p in parts).encode()).hexdigest()
+
+
+def _not_before_today(moment):
+    midnight = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return max(moment, midnight) if moment else midnight
+
+
+def _gig_state(request, pk):
+    if not hasattr(request, "_gig_state"):
+        request._gig_state = (
+            Gig.objects.filter(pk=pk)
+            .values_list("updated_at", "application_count", "pending_count")
+            .first()
+        )
+    return request._gig_state
+
+
+def gig_detail_etag(request, pk):
+    if _skip_conditional(request) or (state := _gig_state(request, pk)) is None:
+        return None
+    application = None
+    if request.user.is_authenticated:
+        # GigDetailView reuses this instead of querying again.
+        application = request._user_application = Application.objects.filter(
+            gig_id=pk, applicant=request.user
+        ).first()
+    return _etag(
+        *state,
+        application and (application.pk, application.status, application.updated_at),
+        timezone.now().date(),
+        _viewer(request),
+    )
+
+
+def gig_detail_last_modified(request, pk):
+    if _skip_conditional(request) or request.user.is_authenticated:
+        return None
+    state = _gig_state(request, pk)
+    return _not_before_today(state[0]) if state else None
+
+
+def _listing_state(request):
+    if not hasattr(request, "_listing_state"):
+        request._listing_state = (
+            listing.filter_listing(Gig.objects.available(), request.GET)
+            .order_by()
+            .aggregate(count=Count("pk"), last=Max("updated_at"))
+        )
+    return request._listing_state
+
+
+def gig_list_etag(request):
+    if _skip_conditional(request):
+        return None
+    state = _listing_state(request)
+    return _etag(
+        state["last"],
+        state["count"],
+        # The sidebar's facet counts span gigs outside the current filter.
+        page_cache.generation(),
+        sorted(request.GET.lists()),
+        timezone.now().date(),
+        _viewer(request),
+    )
+
+
+def gig_list_last_modified(request):
+    if _skip_conditional(request) or request.user.is_authenticated:
+        return None
+    return _not_before_today(_listing_state(request)["last"])
 
 
-class GigListView(ListView):
+@method_decorator(
+    [
+        cache_anonymous_page("gigs:gig_list"),
+        vary_on_cookie,
+        condition(etag_func=gig_list_etag, last_modified_func=gig_list_last_modified),
+    ],
+    name="dispatch",
+)
+class GigListView(AsyncDispatchMixin, ListView):
     model = Gig
     template_name = "gigs/gig_list.html"
     context_object_name = "gigs"
     paginate_by = 12
+    # "page" gives the HTML UI numbered pages and a total; "cursor" pages by
+    # keyset with no COUNT and is what JSON/feed views should use. A request
+    # carrying ?cursor= opts into cursor mode either way.
+    pagination_mode = "page"
+    # featured_now is worked out against the clock on every request, so a
+    # gig whose feature lapses between two page loads leaves the featured
+    # band: the next page may then skip it or show it again. Cursors don't
+    # pin the time, so the band is correct on every page, not across them.
+    cursor_ordering = ("-featured_now", "-created_at", "id")
+
+    def uses_cursor(self) -> bool:
+        return self.pagination_mode == "cursor" or "cursor" in self.request.GET
+
+    async def get(self, request, *args, **kwargs):
+        self.filters = listing.parse(request.GET)
+        self.object_list = self.get_queryset()
+        self.facets = await sync_to_async(facets.for_listing)(self.filters)
+        if self.uses_cursor():
+            context = await sync_to_async(self.get_context_data)()
+        else:
+            # Count and fetch the page with the async ORM; ListView's own
+            # pagination then runs no queries (see get_paginator).
+            self.total = await self.object_list.acount()
+            context = self.get_context_data()
+            page = context["page_obj"]
+            page.object_list = [gig async for gig in page.object_list]
+            context["object_list"] = context[self.context_object_name] = page.object_list
+        return self.render_to_response(context)
+
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        paginator = super().get_paginator(
+            queryset, per_page, orphans, allow_empty_first_page, **kwargs
+        )
+        if hasattr(self, "total"):
+            paginator.count = self.total
+        return paginator
 
     def get_queryset(self):
-        qs = Gig.objects.filter(is_active=True).select_related("employer")
-
-        q = self.request.GET.get("search", "").strip()
-        if q:
-            qs = qs.filter(Q(title__icontains=q) | Q(description__icontains=q))
-
-        category = self.request.GET.get("category", "").strip()
-        if category:
-            qs = qs.filter(category=category)
-
+        # available() also drops gigs whose deadline has passed.
+        qs = listing.apply(Gig.objects.available().select_related("employer"), self.filters)
+        if order := listing.ordering(self.filters):
+            qs = qs.order_by(*order)
+        elif self.filters["search"]:
+            # Featured gigs still lead; relevance orders within each band.
+            qs = qs.order_by("-featured_now", "-search_rank", "-created_at")
         return qs
 
+    def paginate_queryset(self, queryset, page_size):
+        if not self.uses_cursor():
+            return super().paginate_queryset(queryset, page_size)
+        # Keyset order wins over search rank here: rank isn't a stable key.
+        # "Closing soon" sorts on a nullable column, so it can't key cursors
+        # and falls back to the default order too.
+        ordering = listing.cursor_ordering(self.filters) or self.cursor_ordering
+        paginator = CursorPaginator(queryset, ordering, page_size)
+        try:
+            page = paginator.page(self.request.GET.get("cursor") or None)
+        except InvalidCursor as exc:
+            raise Http404("Invalid cursor.") from exc
+        return paginator, page, page.object_list, page.has_other_pages()
+
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        ctx["categories"] = Gig.Category.choices
-        ctx["current_category"] = self.request.GET.get("category", "")
-        ctx["search_query"] = self.request.GET.get("search", "")
+        ctx["cursor_mode"] = self.uses_cursor()
+        # The sort cursor pages actually follow (see paginate_queryset), or
+        # None for the featured-then-newest fallback.
+        if listing.cursor_ordering(self.filters):
+            ctx["cursor_sort_label"] = dict(GigFilterForm.SORT_CHOICES)[self.filters["sort"]]
+        ctx["facets"] = self.facets
+        ctx["filters"] = self.filters
+        ctx["sort_choices"] = GigFilterForm.SORT_CHOICES
+        ctx["filtered"] = any(value not in (None, "") for value in self.filters.values())
+        ctx["search_query"] = self.filters["search"]
         return ctx
 
 
-class GigDetailView(DetailView):
+@method_decorator(
+    [
+        cache_anonymous_page("gigs:gig_detail"),
+        vary_on_cookie,
+        condition(etag_func=gig_detail_etag, last_modified_func=gig_detail_last_modified),
+    ],
+    name="dispatch",
+)
+class GigDetailView(AsyncDispatchMixin, DetailView):
     model = Gig
     template_name = "gigs/gig_detail.html"
     context_object_name = "gig"
 
     def get_queryset(self):
-        return Gig.objects.select_related("employer", "employer__userprofile")
+        return Gig.objects.select_related("employer", "employer__userprofile").with_featured_now()
 
-    def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
-        user = self.request.user
+    async def get(self, request, *args, **kwargs):
+        try:
+            self.object = await self.get_queryset().aget(pk=self.kwargs["pk"])
+        except Gig.DoesNotExist as exc:
+            raise Http404("No gig found matching the query.") from exc
+
+        context = self.get_context_data(object=self.object)
+        user = await auser(request)
         if user.is_authenticated:
-            ctx["user_application"] = Application.objects.filter(
-                gig=self.object, applicant=user
-            ).first()
+            if hasattr(request, "_user_application"):
+                context["user_application"] = request._user_application
+            else:
+                context["user_application"] = await Application.objects.filter(
+                    gig=self.object, applicant=user
+                ).afirst()
             if user == self.object.employer:
-                ctx["application_count"] = self.object.applications.count()
-        return ctx
+                context["application_count"] = self.object.application_count
+        return self.render_to_response(context)
+
+
+# ---------------------------------------------------------------------------
+# Gig CRUD
+# ---------------------------------------------------------------------------
 
 
 class GigCreateView(LoginRequiredMixin, CreateView):
@@ -147,6 +369,12 @@ def toggle_gig_status(request, pk: int):
 # ---------------------------------------------------------------------------
 
 
+def _already_applied(request, application):
+    messages.info(request, "You've already applied to this gig.")
+    return redirect("gigs:application_detail", pk=application.pk)
+
+
+@rate_limit("apply", "ip", "gig", "user")
 @login_required
 def apply_to_gig(request, pk: int):
     gig = get_object_or_404(Gig, pk=pk)
@@ -159,21 +387,22 @@ def apply_to_gig(request, pk: int):
         messages.error(request, "This gig is no longer accepting applications.")
         return redirect("gigs:gig_detail", pk=pk)
 
-    existing = Application.objects.filter(gig=gig, applicant=request.user).first()
-    if existing:
-        messages.info(request, "You've already applied to this gig.")
-        return redirect("gigs:application_detail", pk=existing.pk)
-
     if request.method == "POST":
         form = ApplicationForm(request.POST)
         if form.is_valid():
             application = form.save(commit=False)
             application.gig = gig
             application.applicant = request.user
-            application.save()
+            # The unique constraint catches a repeat, even a simultaneous one.
+            application, created = Application.objects.submit(application)
+            if not created:
+                return _already_applied(request, application)
             messages.success(request, "Your application has been submitted.")
             return redirect("gigs:gig_detail", pk=pk)
     else:
+        existing = Application.objects.filter(gig=gig, applicant=request.user).first()
+        if existing:
+            return _already_applied(request, existing)
         form = ApplicationForm()
 
     return render(request, "gigs/apply_to_gig.html", {"form": form, "gig": gig})
@@ -198,56 +427,159 @@ class ApplicationDetailView(LoginRequiredMixin, DetailView):
 def my_applications(request):
     applications = (
         Application.objects.filter(applicant=request.user)
-        .select_related("gig", "gig__employer")
-        .order_by("-created_at")
+        .select_related("gig")
+        .only(
+            "id",
+            "status",
+            "created_at",
+            "gig__id",
+            "gig__title",
+            "gig__budget",
+            "gig__category",
+        )
+    )
+    page = cursor_page(request, applications, DASHBOARD_ORDERING, DASHBOARD_PAGE_SIZE)
+    return render(
+        request,
+        "gigs/my_applications.html",
+        {"applications": page.object_list, "page_obj": page},
     )
-    return render(request, "gigs/my_applications.html", {"applications": applications})
 
 
 @login_required
 def my_gigs(request):
     """Dashboard for employers — own gigs plus application counts."""
-    gigs = (
-        Gig.objects.filter(employer=request.user)
-        .annotate(
-            application_count=Count("applications"),
-            pending_count=Count(
-                "applications",
-                filter=Q(applications__status=Application.Status.PENDING),
-            ),
-        )
-        .order_by("-created_at")
-    )
-
-    summary = gigs.aggregate(
-        total_gigs=Count("id"),
-        active_gigs=Count("id", filter=Q(is_active=True)),
-        total_applications=Count("applications"),
-        pending_applications=Count(
-            "applications", filter=Q(applications__status=Application.Status.PENDING)
+    # Counts come from the denormalised Gig columns: no join, no GROUP BY.
+    gigs = Gig.objects.filter(employer=request.user).with_featured_now().order_by("-created_at")
+
+    # The rows and the summary are independent; fetch them at the same time.
+    rows, summary = gather(
+        lambda: list(gigs),
+        lambda: gigs.aggregate(
+            total_gigs=Count("id"),
+            active_gigs=Count("id", filter=Q(is_active=True)),
+            total_applications=Coalesce(Sum("application_count"), 0),
+            pending_applications=Coalesce(Sum("pending_count"), 0),
         ),
     )
 
     return render(
         request,
         "gigs/my_gigs.html",
-        {"gigs": gigs, **summary},
+        {"gigs": rows, **summary},
     )
 
 
+@login_required
+def import_gigs(request):
+    """Create many gigs from an uploaded CSV / JSON Lines file."""
+    result = None
+    if request.method == "POST":
+        form = GigImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data["file"]
+            stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+            try:
+                result = transfer.import_gigs(
+                    transfer.read_rows(stream, transfer.format_for(upload.name)),
+                    request.user,
+                    dry_run=form.cleaned_data["dry_run"],
+                )
+            except transfer.ImportFormatError as exc:
+                form.add_error("file", str(exc))
+            else:
+                if result.stopped and not result.rows:
+                    form.add_error("file", transfer.UNREADABLE)
+                    result = None
+    else:
+        form = GigImportForm()
+
+    return render(
+        request,
+        "gigs/import_gigs.html",
+        {
+            "form": form,
+            "result": result,
+            "errors_shown": result.errors[:IMPORT_ERRORS_SHOWN] if result else [],
+            "errors_hidden": max(0, len(result.errors) - IMPORT_ERRORS_SHOWN) if result else 0,
+        },
+    )
+
+
+@login_required
+def export_gigs(request, kind: str, fmt: str):
+    """Stream the employer's gigs or applications as CSV / JSON Lines."""
+    if kind not in transfer.EXPORTS or fmt not in transfer.FORMATS:
+        raise Http404("Unknown export.")
+    response = StreamingHttpResponse(
+        transfer.export_lines(kind, fmt, request.user), content_type=EXPORT_CONTENT_TYPES[fmt]
+    )
+    stamp = timezone.now().strftime("%Y%m%d")
+    response["Content-Disposition"] = f'attachment; filename="quickgigs-{kind}-{stamp}.{fmt}"'
+    return response
+
+
 @login_required
 def gig_applications(request, pk: int):
-    gig = get_object_or_404(Gig, pk=pk)
-    if request.user != gig.employer:
+    gig = get_object_or_404(Gig.objects.defer("description"), pk=pk)
+    if request.user.pk != gig.employer_id:
         return HttpResponseForbidden("You can only view applications for your own gigs.")
-    applications = gig.applications.select_related("applicant").order_by("-created_at")
+    applications = (
+        gig.applications.select_related("applicant")
+        .only(
+            "id",
+            "gig_id",
+            "status",
+            "proposed_rate",
+            "created_at",
+            "applicant__id",
+            "applicant__username",
+        )
+        .annotate(cover_excerpt=Substr("cover_letter", 1, COVER_EXCERPT_CHARS))
+    )
+    page = cursor_page(request, applications, DASHBOARD_ORDERING, DASHBOARD_PAGE_SIZE)
     return render(
         request,
         "gigs/gig_applications.html",
-        {"gig": gig, "applications": applications},
+        {
+            "gig": gig,
+            "applications": page.object_list,
+            "page_obj": page,
+            "bulk_form": BulkApplicationStatusForm(),
+        },
     )
 
 
+@login_required
+@require_POST
+def bulk_update_applications(request, pk: int):
+    """Set the status of many of a gig's applications in one UPDATE."""
+    gig = get_object_or_404(Gig.objects.only("id", "employer_id"), pk=pk)
+    if request.user.pk != gig.employer_id:
+        return HttpResponseForbidden("You can only manage applications for your own gigs.")
+
+    form = BulkApplicationStatusForm(request.POST)
+    if not form.is_valid():
+        for errors in form.errors.values():
+            messages.error(request, errors[0])
+        return redirect("gigs:gig_applications", pk=gig.pk)
+
+    status = form.cleaned_data["status"]
+    if form.cleaned_data["all_pending"]:
+        targets = gig.applications.filter(status=Application.Status.PENDING)
+    else:
+        ids = form.cleaned_data["applications"]
+        # One query however many IDs: refuse the lot if any isn't this gig's.
+        if Application.objects.filter(pk__in=ids).exclude(gig_id=gig.pk).exists():
+            return HttpResponseForbidden("You can only manage applications for your own gigs.")
+        targets = gig.applications.filter(pk__in=ids)
+
+    changed = targets.set_status(status)
+    label = Application.Status(status).label.lower()
+    messages.success(request, f"{changed} application{pluralize(changed)} marked {label}.")
+    return redirect("gigs:gig_applications", pk=gig.pk)
+
+
 @login_required
 def update_application_status(request, pk: int):
     application = get_object_or_404(Application.objects.select_related("gig"), pk=pk)
@@ -1,8 +1,9 @@
 """Admin registrations for the payments app."""
 
 from django.contrib import admin
+from django.utils import timezone
 
-from .models import Payment, PaymentEvent
+from .models import Payment, PaymentEvent, WebhookEvent
 
 
 @admin.register(Payment)
@@ -54,3 +55,37 @@ class PaymentEventAdmin(admin.ModelAdmin):
     def has_add_permission(self, request):
         # Events come from Stripe — never create them by hand.
         return False
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = (
+        "stripe_event_id",
+        "event_type",
+        "status",
+        "attempts",
+        "available_at",
+        "created_at",
+    )
+    list_filter = ("status", "event_type")
+    search_fields = ("stripe_event_id",)
+    readonly_fields = (
+        "stripe_event_id",
+        "event_type",
+        "payload",
+        "attempts",
+        "last_error",
+        "created_at",
+        "processed_at",
+    )
+    actions = ("retry_now",)
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Retry selected events now")
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status=WebhookEvent.Status.DONE).update(
+            status=WebhookEvent.Status.PENDING, available_at=timezone.now()
+        )
+        self.message_user(request, f"Requeued {updated} event(s).")
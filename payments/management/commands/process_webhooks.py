@@ -0,0 +1,63 @@
+"""Drain the queue of Stripe webhook events."""
+
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from gigs.featured import start_expiry_runner
+from payments import webhooks
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply queued Stripe webhook events in batches, retrying failures with "
+        "exponential backoff. Runs until interrupted unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Events claimed per transaction (default: 50).",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=webhooks.MAX_ATTEMPTS,
+            help=f"Give up on an event after this many tries (default: {webhooks.MAX_ATTEMPTS}).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when the queue is empty (default: 2).",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Exit as soon as no events are due."
+        )
+
+    def handle(
+        self, *args, batch_size: int, max_attempts: int, interval: float, once: bool, **options
+    ):
+        total = 0
+        if not once:
+            # The worker is the one long-lived process every deployment has.
+            start_expiry_runner()
+        try:
+            while True:
+                claimed = webhooks.drain(batch_size=batch_size, max_attempts=max_attempts)
+                total += claimed
+                if claimed:
+                    continue
+                if once:
+                    break
+                # Long-running process: drop connections the DB has closed.
+                close_old_connections()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Processed {total} event(s)."))
@@ -7,6 +7,7 @@ from decimal import Decimal
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.utils import timezone
 
 from gigs.models import Gig
 
@@ -81,3 +82,39 @@ class PaymentEvent(models.Model):
 
     def __str__(self) -> str:
         return f"{self.event_type} ({self.stripe_event_id})"
+
+
+class WebhookEvent(models.Model):
+    """A verified Stripe event waiting for ``manage.py process_webhooks``.
+
+    The webhook view only verifies the signature and inserts a row here;
+    the worker applies it later, retrying with backoff on failure. The
+    unique ``stripe_event_id`` means Stripe's redeliveries never queue the
+    same event twice.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    stripe_event_id = models.CharField(max_length=255, unique=True)
+    event_type = models.CharField(max_length=80)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(
+        default=timezone.now, help_text="Not retried before this time."
+    )
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "available_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event_type} ({self.stripe_event_id}) · {self.status}"
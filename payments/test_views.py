@@ -13,7 +13,7 @@ from unittest.mock import patch
 import pytest
 from django.urls import reverse
 
-from payments.models import Payment, PaymentEvent
+from payments.models import Payment, WebhookEvent
 
 
 @pytest.mark.django_db
@@ -42,6 +42,24 @@ class TestPaymentHistory:
         assert b"My payment" in resp.content
         assert b"Other person" not in resp.content
 
+    def test_paginates_by_cursor(self, client, employer, monkeypatch):
+        monkeypatch.setattr("payments.views.HISTORY_PAGE_SIZE", 1)
+        for label in ("First", "Second"):
+            Payment.objects.create(
+                user=employer,
+                amount=Decimal("9.99"),
+                payment_type=Payment.Type.FEATURED_GIG,
+                description=f"{label} payment",
+            )
+        client.force_login(employer)
+        first = client.get(reverse("payments:payment_history"))
+        assert b"Second payment" in first.content and b"First payment" not in first.content
+        second = client.get(
+            reverse("payments:payment_history"),
+            {"cursor": first.context["page_obj"].next_cursor},
+        )
+        assert b"First payment" in second.content
+
 
 @pytest.mark.django_db
 class TestFeatureGigCheckout:
@@ -78,7 +96,7 @@ class TestStripeWebhook:
         assert resp.status_code == 400
 
     @patch("stripe.Webhook.construct_event")
-    def test_checkout_completed_marks_payment_and_features_gig(
+    def test_checkout_completed_is_queued_not_applied(
         self, mock_construct, client, settings, employer, gig
     ):
         settings.STRIPE_WEBHOOK_SECRET = "whsec_test"
@@ -101,39 +119,43 @@ class TestStripeWebhook:
             HTTP_STRIPE_SIGNATURE="sig",
         )
         assert resp.status_code == 200
+        assert json.loads(resp.content)["status"] == "queued"
+        queued = WebhookEvent.objects.get(stripe_event_id="evt_test_1")
+        assert queued.status == WebhookEvent.Status.PENDING
         payment.refresh_from_db()
-        gig.refresh_from_db()
-        assert payment.status == Payment.Status.COMPLETED
-        assert payment.stripe_payment_intent == "pi_xyz"
-        assert gig.is_featured is True
-        assert PaymentEvent.objects.filter(stripe_event_id="evt_test_1").count() == 1
+        assert payment.status == Payment.Status.PENDING
 
     @patch("stripe.Webhook.construct_event")
-    def test_duplicate_event_is_idempotent(self, mock_construct, client, settings, employer, gig):
+    def test_redelivered_event_is_not_queued_twice(self, mock_construct, client, settings):
         settings.STRIPE_WEBHOOK_SECRET = "whsec_test"
-        payment = Payment.objects.create(
-            user=employer,
-            gig=gig,
-            amount=Decimal("9.99"),
-            payment_type=Payment.Type.FEATURED_GIG,
-            stripe_session_id="cs_test_999",
-        )
-        PaymentEvent.objects.create(
-            payment=payment,
-            event_type="checkout.session.completed",
-            stripe_event_id="evt_dup",
-            raw={},
-        )
         mock_construct.return_value = {
             "id": "evt_dup",
             "type": "checkout.session.completed",
             "data": {"object": {"id": "cs_test_999"}},
         }
+        statuses = [
+            json.loads(
+                client.post(
+                    reverse("payments:stripe_webhook"),
+                    data=b"{}",
+                    content_type="application/json",
+                    HTTP_STRIPE_SIGNATURE="sig",
+                ).content
+            )["status"]
+            for _ in range(2)
+        ]
+        assert statuses == ["queued", "duplicate"]
+        assert WebhookEvent.objects.count() == 1
+
+    @patch("stripe.Webhook.construct_event")
+    def test_unhandled_event_type_is_ignored(self, mock_construct, client, settings):
+        settings.STRIPE_WEBHOOK_SECRET = "whsec_test"
+        mock_construct.return_value = {"id": "evt_x", "type": "customer.created", "data": {}}
         resp = client.post(
             reverse("payments:stripe_webhook"),
             data=b"{}",
             content_type="application/json",
             HTTP_STRIPE_SIGNATURE="sig",
         )
-        assert resp.status_code == 200
-        assert json.loads(resp.content)["status"] == "duplicate"
+        assert json.loads(resp.content)["status"] == "ignored"
+        assert not WebhookEvent.objects.exists()
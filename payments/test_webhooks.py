@@ -0,0 +1,208 @@
+"""Tests for the queued Stripe webhook worker."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from payments import webhooks
+from payments.models import Payment, PaymentEvent, WebhookEvent
+
+
+def _event(event_id="evt_1", session_id="cs_test_123"):
+    return {
+        "id": event_id,
+        "type": "checkout.session.completed",
+        "data": {"object": {"id": session_id, "payment_intent": "pi_xyz"}},
+    }
+
+
+@pytest.fixture
+def payment(employer, gig):
+    return Payment.objects.create(
+        user=employer,
+        gig=gig,
+        amount=Decimal("9.99"),
+        payment_type=Payment.Type.FEATURED_GIG,
+        stripe_session_id="cs_test_123",
+    )
+
+
+@pytest.mark.django_db
+class TestDrain:
+    def test_applies_checkout_completed(self, payment, gig):
+        webhooks.enqueue(_event())
+        assert webhooks.drain() == 1
+
+        payment.refresh_from_db()
+        gig.refresh_from_db()
+        assert payment.status == Payment.Status.COMPLETED
+        assert payment.stripe_payment_intent == "pi_xyz"
+        assert gig.is_featured is True
+        assert gig.featured_until > timezone.now() + timedelta(days=29)
+        assert PaymentEvent.objects.filter(stripe_event_id="evt_1").count() == 1
+        queued = WebhookEvent.objects.get()
+        assert queued.status == WebhookEvent.Status.DONE
+        assert queued.processed_at is not None
+
+    def test_already_applied_event_is_skipped(self, payment):
+        PaymentEvent.objects.create(
+            payment=payment, event_type="checkout.session.completed", stripe_event_id="evt_1"
+        )
+        webhooks.enqueue(_event())
+        webhooks.drain()
+        payment.refresh_from_db()
+        assert payment.status == Payment.Status.PENDING
+        assert WebhookEvent.objects.get().status == WebhookEvent.Status.DONE
+
+    def test_failure_is_retried_with_backoff(self, payment):
+        webhooks.enqueue(_event())
+        with patch.dict(webhooks.HANDLERS, {"checkout.session.completed": _boom}):
+            webhooks.drain()
+
+        queued = WebhookEvent.objects.get()
+        assert queued.status == WebhookEvent.Status.PENDING
+        assert queued.attempts == 1
+        assert "RuntimeError: stripe is down" in queued.last_error
+        assert queued.available_at > timezone.now() + timedelta(seconds=20)
+        # Not due yet, so the next pass leaves it alone.
+        assert webhooks.drain() == 0
+
+        WebhookEvent.objects.update(available_at=timezone.now())
+        webhooks.drain()
+        assert WebhookEvent.objects.get().status == WebhookEvent.Status.DONE
+
+    def test_gives_up_after_max_attempts(self, payment):
+        webhooks.enqueue(_event())
+        with patch.dict(webhooks.HANDLERS, {"checkout.session.completed": _boom}):
+            webhooks.drain(max_attempts=1)
+        assert WebhookEvent.objects.get().status == WebhookEvent.Status.FAILED
+
+    def test_one_bad_event_does_not_block_the_batch(self, payment):
+        webhooks.enqueue(_event("evt_bad", session_id="cs_missing"))
+        webhooks.enqueue(_event("evt_good"))
+        original = webhooks.HANDLERS["checkout.session.completed"]
+
+        def flaky(event):
+            if event["id"] == "evt_bad":
+                raise RuntimeError("bad payload")
+            original(event)
+
+        with patch.dict(webhooks.HANDLERS, {"checkout.session.completed": flaky}):
+            assert webhooks.drain() == 2
+        payment.refresh_from_db()
+        assert payment.status == Payment.Status.COMPLETED
+
+    def test_backoff_is_capped(self):
+        assert webhooks.backoff(1) == timedelta(seconds=webhooks.BACKOFF_BASE)
+        assert webhooks.backoff(50) == timedelta(seconds=webhooks.BACKOFF_CAP)
+
+
+@pytest.mark.django_db
+class TestClaim:
+    def test_second_claim_loses(self, payment):
+        assert webhooks.claim(payment, _event()) is True
+        assert webhooks.claim(payment, _event()) is False
+        event = PaymentEvent.objects.get(stripe_event_id="evt_1")
+        assert event.payment == payment
+        assert event.raw["data"]["object"]["payment_intent"] == "pi_xyz"
+
+    def test_replay_costs_two_queries(self, payment):
+        webhooks.handle_checkout_completed(_event())
+        with CaptureQueriesContext(connection) as ctx:
+            webhooks.handle_checkout_completed(_event())
+        # Lock the payment, lose the claim; nothing else.
+        statements = [q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]]
+        assert len(statements) == 2
+        assert "ON CONFLICT" in statements[1]
+
+
+def _deliver_concurrently(events: list[dict]) -> list[Exception]:
+    """Apply ``events`` from one thread each, all released at once; return the errors."""
+    barrier = threading.Barrier(len(events))
+    errors = []
+
+    def deliver(event):
+        try:
+            barrier.wait()
+            for _ in range(100):
+                try:
+                    webhooks.handle_checkout_completed(event)
+                    break
+                except OperationalError as exc:
+                    # The shared-cache in-memory SQLite test DB reports a
+                    # held write lock instead of waiting for it. Back off
+                    # and retry, as the webhook worker would.
+                    if "locked" not in str(exc):
+                        raise
+                    time.sleep(0.01)
+        except Exception as exc:  # surfaced by the caller
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=deliver, args=(event,)) for event in events]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_deliveries_apply_once(payment, gig):
+    # SQLite serialises writers, so this only races for real on Postgres
+    # (TEST_DATABASE_URL); there a check-then-insert loses with IntegrityError.
+    errors = _deliver_concurrently([_event()] * 4)
+
+    assert errors == []
+    assert PaymentEvent.objects.filter(stripe_event_id="evt_1").count() == 1
+    payment.refresh_from_db()
+    gig.refresh_from_db()
+    assert payment.status == Payment.Status.COMPLETED
+    assert gig.is_featured is True
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_checkouts_for_one_gig_both_count(payment, gig, employer, settings):
+    # Two payments hold two payment locks; only the gig lock orders their
+    # read-extend-write of featured_until. Races for real on Postgres.
+    settings.FEATURED_GIG_DAYS = 30
+    Payment.objects.create(
+        user=employer,
+        gig=gig,
+        amount=Decimal("9.99"),
+        payment_type=Payment.Type.FEATURED_GIG,
+        stripe_session_id="cs_test_456",
+    )
+    started = timezone.now()
+    errors = _deliver_concurrently([_event(), _event("evt_2", session_id="cs_test_456")])
+
+    assert errors == []
+    gig.refresh_from_db()
+    assert gig.featured_until - started >= timedelta(days=60)
+    assert gig.featured_until - timezone.now() < timedelta(days=60, minutes=1)
+
+
+@pytest.mark.django_db
+def test_process_webhooks_once(payment):
+    webhooks.enqueue(_event())
+    out = StringIO()
+    call_command("process_webhooks", "--once", stdout=out)
+    assert "Processed 1 event(s)." in out.getvalue()
+    payment.refresh_from_db()
+    assert payment.status == Payment.Status.COMPLETED
+
+
+def _boom(event):
+    raise RuntimeError("stripe is down")
@@ -7,7 +7,8 @@ The flow:
 2. Stripe redirects them to ``payment_success`` (which is JUST a UX
    confirmation page — it does NOT mark the payment complete).
 3. The actual source of truth is the Stripe webhook
-   ``checkout.session.completed``, handled in ``stripe_webhook``.
+   ``checkout.session.completed``. ``stripe_webhook`` queues it and
+   ``payments.webhooks`` applies it (see ``manage.py process_webhooks``).
 
 This keeps the success page replay-safe and ensures customers can't fake
 a featured gig by hitting the success URL directly.
@@ -21,16 +22,19 @@ import stripe
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db import transaction
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
+from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 
+from core.pagination import cursor_page
+from core.ratelimit import rate_limit
 from gigs.models import Gig
 
-from .models import Payment, PaymentEvent
+from . import webhooks
+from .models import Payment
 
 logger = logging.getLogger("quickgigs.payments")
 
@@ -43,6 +47,8 @@ if settings.STRIPE_SECRET_KEY:
 # ---------------------------------------------------------------------------
 
 
+# Each call creates a Stripe Checkout Session; it's a GET link.
+@rate_limit("checkout", "user", methods=None)
 @login_required
 def feature_gig_checkout(request, gig_id: int):
     gig = get_object_or_404(Gig, id=gig_id, employer=request.user)
@@ -54,7 +60,7 @@ def feature_gig_checkout(request, gig_id: int):
         )
         return redirect("gigs:gig_detail", pk=gig.id)
 
-    if gig.is_featured:
+    if gig.is_featured and gig.featured_until and gig.featured_until > timezone.now():
         messages.warning(request, "This gig is already featured.")
         return redirect("gigs:gig_detail", pk=gig.id)
 
@@ -68,7 +74,10 @@ def feature_gig_checkout(request, gig_id: int):
                         "currency": settings.STRIPE_CURRENCY,
                         "product_data": {
                             "name": f"Feature gig: {gig.title}",
-                            "description": "Top placement & featured badge for 30 days.",
+                            "description": (
+                                "Top placement & featured badge for "
+                                f"{settings.FEATURED_GIG_DAYS} days."
+                            ),
                         },
                         "unit_amount": int(settings.FEATURED_GIG_PRICE * 100),
                     },
@@ -125,12 +134,21 @@ def payment_cancel(request, gig_id: int):
     return render(request, "payments/cancel.html", {"gig": gig})
 
 
+HISTORY_PAGE_SIZE = 20
+
+
 @login_required
 def payment_history(request):
+    # Only the gig's title is shown; leave its description behind.
     payments = (
-        Payment.objects.filter(user=request.user).select_related("gig").order_by("-created_at")
+        Payment.objects.filter(user=request.user).select_related("gig").defer("gig__description")
+    )
+    page = cursor_page(request, payments, ("-created_at", "-id"), HISTORY_PAGE_SIZE)
+    return render(
+        request,
+        "payments/history.html",
+        {"payments": page.object_list, "page_obj": page},
     )
-    return render(request, "payments/history.html", {"payments": payments})
 
 
 # ---------------------------------------------------------------------------
@@ -141,7 +159,7 @@ def payment_history(request):
 @csrf_exempt
 @require_POST
 def stripe_webhook(request):
-    """Receive checkout.session.completed and mark the payment complete."""
+    """Verify a Stripe event and queue it for ``manage.py process_webhooks``."""
     payload = request.body
     sig_header = request.META.get("HTTP_STRIPE_SIGNATURE", "")
     webhook_secret = settings.STRIPE_WEBHOOK_SECRET
@@ -156,49 +174,12 @@ def stripe_webhook(request):
         logger.warning("Invalid Stripe webhook signature")
         return HttpResponse(status=400)
 
-    event_id = event["id"]
-    event_type = event["type"]
+    if event["type"] not in webhooks.HANDLERS:
+        logger.info("Ignoring Stripe event %s", event["type"])
+        return JsonResponse({"status": "ignored"})
 
-    # Idempotency: skip if we've already processed this event.
-    if PaymentEvent.objects.filter(stripe_event_id=event_id).exists():
+    # Applied later by `manage.py process_webhooks`; Stripe only needs to
+    # know we have it.
+    if not webhooks.enqueue(event):
         return JsonResponse({"status": "duplicate"})
-
-    if event_type == "checkout.session.completed":
-        _handle_checkout_completed(event)
-    else:
-        logger.info("Ignoring Stripe event %s", event_type)
-
-    return JsonResponse({"status": "ok"})
-
-
-def _handle_checkout_completed(event: dict) -> None:
-    session = event["data"]["object"]
-    session_id = session.get("id")
-    payment_intent_id = session.get("payment_intent") or ""
-
-    try:
-        payment = Payment.objects.select_related("gig").get(stripe_session_id=session_id)
-    except Payment.DoesNotExist:
-        logger.warning("Stripe webhook for unknown session_id=%s", session_id)
-        return
-
-    with transaction.atomic():
-        if payment.status != Payment.Status.COMPLETED:
-            payment.status = Payment.Status.COMPLETED
-            payment.stripe_payment_intent = payment_intent_id
-            payment.save(update_fields=["status", "stripe_payment_intent", "updated_at"])
-
-            if (
-                payment.payment_type == Payment.Type.FEATURED_GIG
-                and payment.gig
-                and not payment.gig.is_featured
-            ):
-                payment.gig.is_featured = True
-                payment.gig.save(update_fields=["is_featured", "updated_at"])
-
-        PaymentEvent.objects.create(
-            payment=payment,
-            event_type=event["type"],
-            stripe_event_id=event["id"],
-            raw=event,
-        )
+    return JsonResponse({"status": "queued"})
@@ -0,0 +1,165 @@
+"""Durable processing of Stripe webhook events.
+
+``stripe_webhook`` verifies the signature and calls ``enqueue``, which
+writes a single queue row. Stripe gets its 200 straight away, even during a burst of
+redeliveries after an outage. ``manage.py process_webhooks`` then calls
+``drain`` in a loop. ``drain`` claims due events in batches and applies
+each one in its own savepoint. A failed event is rescheduled with
+exponential backoff, and after ``MAX_ATTEMPTS`` tries it is parked as
+``failed`` for a human to look at.
+
+The handlers are idempotent. Each one claims its ``PaymentEvent`` row
+(see ``claim``) in the same transaction as its updates, so replays and
+concurrent deliveries of one event apply it exactly once, and a worker
+that dies halfway through a batch is harmless.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+
+from django.db import connection, connections, router, transaction
+from django.utils import timezone
+
+from gigs import featured
+from gigs.models import Gig
+
+from .models import Payment, PaymentEvent, WebhookEvent
+
+logger = logging.getLogger("quickgigs.payments")
+
+MAX_ATTEMPTS = 8
+BACKOFF_BASE = 30  # seconds before the first retry; doubles each time
+BACKOFF_CAP = 60 * 60
+
+
+def backoff(attempts: int) -> timedelta:
+    """Delay before retry number ``attempts`` (1-based)."""
+    return timedelta(seconds=min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_CAP))
+
+
+# ---------------------------------------------------------------------------
+# Handlers
+# ---------------------------------------------------------------------------
+
+
+def claim(payment: Payment, event: dict) -> bool:
+    """Record ``event`` against ``payment``; False if it was recorded already.
+
+    One ``INSERT ... ON CONFLICT DO NOTHING RETURNING``: the unique
+    ``stripe_event_id`` decides which delivery wins, so there is no
+    exists-check to race and the loser never raises ``IntegrityError``.
+    Call it inside the transaction that applies the event so a failure
+    un-claims it.
+    """
+    using = router.db_for_write(PaymentEvent)
+    conn = connections[using]
+    values = {
+        "payment_id": payment.pk,
+        "event_type": event["type"],
+        "stripe_event_id": event["id"],
+        "raw": event,
+        "created_at": timezone.now(),
+    }
+    fields = [PaymentEvent._meta.get_field(name) for name in values]
+    qn = conn.ops.quote_name
+    sql = (
+        f"INSERT INTO {qn(PaymentEvent._meta.db_table)} "
+        f"({', '.join(qn(f.column) for f in fields)}) "
+        f"VALUES ({', '.join(['%s'] * len(fields))}) "
+        f"ON CONFLICT ({qn('stripe_event_id')}) DO NOTHING "
+        f"RETURNING {qn(PaymentEvent._meta.pk.column)}"
+    )
+    params = [f.get_db_prep_save(v, conn) for f, v in zip(fields, values.values(), strict=True)]
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone() is not None
+
+
+def handle_checkout_completed(event: dict) -> None:
+    session = event["data"]["object"]
+    session_id = session.get("id")
+    payment_intent_id = session.get("payment_intent") or ""
+
+    with transaction.atomic():
+        # Lock the payment (not the gig, which may be NULL) so concurrent
+        # deliveries for one checkout apply one after the other.
+        payment = Payment.objects.select_for_update().filter(stripe_session_id=session_id).first()
+        if payment is None:
+            logger.warning("Stripe webhook for unknown session_id=%s", session_id)
+            return
+        if not claim(payment, event):
+            logger.info("Stripe event %s already applied", event["id"])
+            return
+
+        if payment.status != Payment.Status.COMPLETED:
+            payment.status = Payment.Status.COMPLETED
+            payment.stripe_payment_intent = payment_intent_id
+            payment.save(update_fields=["status", "stripe_payment_intent", "updated_at"])
+
+            if payment.payment_type == Payment.Type.FEATURED_GIG and payment.gig_id:
+                # Two checkouts for one gig hold different payment locks, so
+                # lock the gig too and extend the featured_until it has now.
+                gig = Gig.objects.select_for_update().get(pk=payment.gig_id)
+                featured.feature_gig(gig)
+
+
+HANDLERS = {
+    "checkout.session.completed": handle_checkout_completed,
+}
+
+
+def process_event(event: dict) -> None:
+    """Apply one Stripe event. Handlers skip events they have already applied."""
+    HANDLERS[event["type"]](event)
+
+
+# ---------------------------------------------------------------------------
+# Queue
+# ---------------------------------------------------------------------------
+
+
+def enqueue(event: dict) -> bool:
+    """Queue a verified event. Returns False if it was already queued."""
+    _, created = WebhookEvent.objects.get_or_create(
+        stripe_event_id=event["id"],
+        defaults={"event_type": event["type"], "payload": event},
+    )
+    return created
+
+
+def drain(batch_size: int = 50, max_attempts: int = MAX_ATTEMPTS) -> int:
+    """Process one batch of due events. Returns how many were claimed."""
+    now = timezone.now()
+    with transaction.atomic():
+        due = WebhookEvent.objects.filter(
+            status=WebhookEvent.Status.PENDING, available_at__lte=now
+        ).order_by("available_at", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            # Concurrent workers each get a disjoint batch.
+            due = due.select_for_update(skip_locked=True)
+        batch = list(due[:batch_size])
+
+        for queued in batch:
+            queued.attempts += 1
+            try:
+                with transaction.atomic():
+                    process_event(queued.payload)
+            except Exception as exc:
+                logger.exception(
+                    "Stripe event %s failed (attempt %s)", queued.stripe_event_id, queued.attempts
+                )
+                queued.last_error = f"{type(exc).__name__}: {exc}"
+                if queued.attempts >= max_attempts:
+                    queued.status = WebhookEvent.Status.FAILED
+                else:
+                    queued.available_at = timezone.now() + backoff(queued.attempts)
+            else:
+                queued.status = WebhookEvent.Status.DONE
+                queued.processed_at = timezone.now()
+                queued.last_error = ""
+            queued.save(
+                update_fields=["status", "attempts", "available_at", "last_error", "processed_at"]
+            )
+    return len(batch)
@@ -7,3 +7,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "quickgigs_project.settings")
 
 application = get_asgi_application()
+
+# After setup, so settings and the app registry are ready.
+from gigs.featured import start_expiry_runner  # noqa: E402
+
+start_expiry_runner()
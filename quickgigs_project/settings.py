@@ -12,6 +12,7 @@ hardcoded hostnames or platform-specific branches.
 from __future__ import annotations
 
 import sys
+import tempfile
 from pathlib import Path
 
 import environ
@@ -21,6 +22,7 @@ import environ
 # ---------------------------------------------------------------------------
 
 BASE_DIR = Path(__file__).resolve().parent.parent
+TESTING = "test" in sys.argv or "pytest" in sys.modules
 
 env = environ.Env(
     DJANGO_DEBUG=(bool, False),
@@ -28,6 +30,25 @@ env = environ.Env(
     DJANGO_CSRF_TRUSTED_ORIGINS=(list, []),
     DJANGO_SECURE_SSL_REDIRECT=(bool, False),
     FEATURED_GIG_PRICE=(float, 9.99),
+    FEATURED_GIG_DAYS=(int, 30),
+    FEATURED_EXPIRY_INTERVAL=(int, 0),
+    HOME_CACHE_TTL=(int, 60),
+    GIG_CARD_CACHE_TTL=(int, 60 * 60 * 24),
+    PAGE_CACHE_TTL=(int, 60),
+    FACET_CACHE_TTL=(int, 300),
+    DATABASE_REPLICA_URLS=(list, []),
+    DB_CONN_MAX_AGE=(int, 600),
+    DB_POOL=(bool, False),
+    DB_POOL_MIN_SIZE=(int, 2),
+    DB_POOL_MAX_SIZE=(int, 4),
+    DB_POOL_TIMEOUT=(float, 10.0),
+    DB_POOL_MAX_IDLE=(float, 300.0),
+    DB_POOL_MAX_LIFETIME=(float, 3600.0),
+    REPLICA_PIN_SECONDS=(int, 10),
+    QUERY_GATHER_WORKERS=(int, 4),
+    RATE_LIMIT_ENABLED=(bool, True),
+    RATE_LIMIT_IP_HEADER=(str, ""),
+    REQUEST_METRICS=(bool, False),
 )
 
 # Read .env if present; in containers env vars are already in the process.
@@ -59,6 +80,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Read-your-writes for replica routing; a no-op without replicas.
+    "core.middleware.ReplicaPinMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.middleware.gzip.GZipMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -69,13 +92,40 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Query count, DB / template / total time per request, as a Server-Timing
+# header and a "quickgigs.metrics" log line. Always on under test so that
+# QUERY_BUDGETS below are enforced by conftest.py.
+REQUEST_METRICS = env("REQUEST_METRICS") or TESTING
+if REQUEST_METRICS:
+    MIDDLEWARE.insert(0, "core.middleware.RequestMetricsMiddleware")
+
+# Most queries a view may run, keyed by URL name. Exceeding one logs a
+# warning in production and fails the test that made the request.
+# Counts include the session and user lookups of a logged-in request.
+QUERY_BUDGETS = {
+    "core:home": 5,
+    # One more than a warm visit: the facet counts on a cold cache.
+    "gigs:gig_list": 6,
+    "gigs:gig_detail": 5,
+    "gigs:my_gigs": 5,
+    "gigs:my_applications": 4,
+    "gigs:gig_applications": 5,
+    "gigs:bulk_update_applications": 7,
+    "payments:payment_history": 4,
+    "accounts:profile": 3,
+    "api:gig_list": 2,
+    "api:gig_detail": 2,
+    "api:categories": 2,
+}
+
 ROOT_URLCONF = "quickgigs_project.urls"
 WSGI_APPLICATION = "quickgigs_project.wsgi.application"
 ASGI_APPLICATION = "quickgigs_project.asgi.application"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates plus render timing for RequestMetricsMiddleware.
+        "BACKEND": "core.template_backend.DjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -101,10 +151,114 @@ DATABASES = {
     ),
 }
 
-# Tune connection pooling when a real DB is configured.
-if DATABASES["default"]["ENGINE"] != "django.db.backends.sqlite3":
-    DATABASES["default"]["CONN_MAX_AGE"] = 600
-    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# Connection reuse for a real DB, one of:
+#
+# * persistent connections (default): each worker thread keeps its own
+#   connection for DB_CONN_MAX_AGE seconds, so the server sees
+#   workers x threads connections;
+# * DB_POOL=True (Postgres): a psycopg 3 pool per worker process, shared by
+#   its threads, holding DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections.
+#   Pair it with gthread workers (entrypoint mode `web-threaded`). A request
+#   that can't get a connection within DB_POOL_TIMEOUT seconds fails.
+def _tune_connections(db: dict) -> dict:
+    if db["ENGINE"] == "django.db.backends.sqlite3":
+        return db
+    if env("DB_POOL") and db["ENGINE"] == "django.db.backends.postgresql":
+        # Django returns connections to the pool after each request; it
+        # refuses to combine a pool with persistent connections.
+        db["CONN_MAX_AGE"] = 0
+        # Django passes ConnectionPool.check_connection to the pool when this
+        # is on, validating a connection as it leaves the pool. (A "check"
+        # pool option would be passed twice.)
+        db["CONN_HEALTH_CHECKS"] = True
+        db.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": env("DB_POOL_MIN_SIZE"),
+            "max_size": env("DB_POOL_MAX_SIZE"),
+            "timeout": env("DB_POOL_TIMEOUT"),
+            "max_idle": env("DB_POOL_MAX_IDLE"),
+            "max_lifetime": env("DB_POOL_MAX_LIFETIME"),
+        }
+    else:
+        db["CONN_MAX_AGE"] = env("DB_CONN_MAX_AGE")
+        db["CONN_HEALTH_CHECKS"] = True
+    return db
+
+
+_tune_connections(DATABASES["default"])
+
+# Read replicas: a comma-separated DATABASE_REPLICA_URLS (or a single
+# DATABASE_REPLICA_URL). Reads go to a random replica, writes and anything
+# read shortly after a client's write go to the primary (core/db_router.py).
+_replica_urls = env("DATABASE_REPLICA_URLS") or [
+    url for url in [env("DATABASE_REPLICA_URL", default="")] if url
+]
+DATABASE_REPLICAS = []
+for _index, _url in enumerate(_replica_urls, start=1):
+    _alias = f"replica{_index}"
+    DATABASES[_alias] = _tune_connections(
+        # Under test a replica is the primary; see the TESTING block below.
+        {**env.db_url_config(_url), "TEST": {"MIRROR": "default"}}
+    )
+    DATABASE_REPLICAS.append(_alias)
+
+DATABASE_ROUTERS = ["core.db_router.PrimaryReplicaRouter"]
+
+# Seconds a client's reads stay on the primary after it writes. Cover the
+# replicas' worst normal lag.
+REPLICA_PIN_SECONDS = env("REPLICA_PIN_SECONDS")
+
+# Threads per process that core.gather uses to run a page's independent
+# queries at once; each may hold a DB connection. 0 runs them in turn.
+QUERY_GATHER_WORKERS = env("QUERY_GATHER_WORKERS")
+
+# ---------------------------------------------------------------------------
+# Cache  (CACHE_URL picks the backend; per-process memory by default)
+# ---------------------------------------------------------------------------
+#
+#   locmemcache://                      per-process memory (default)
+#   filecache:///var/tmp/quickgigs      shared between workers on one host
+#   redis://host:6379/1                 shared everywhere; needs `pip install redis`
+
+CACHES = {
+    "default": env.cache_url("CACHE_URL", default="locmemcache://"),
+}
+
+# Safety net for cached blocks whose invalidation signal was bypassed
+# (queryset.update(), raw SQL). Signals handle the normal case.
+HOME_CACHE_TTL = env("HOME_CACHE_TTL")
+# Rendered gig cards are keyed on the gig's updated_at, so this only bounds
+# how long superseded fragments linger (gigs/cards.py).
+GIG_CARD_CACHE_TTL = env("GIG_CARD_CACHE_TTL")
+# Whole-page cache for anonymous visitors (core/page_cache.py). Seconds per
+# URL name, PAGE_CACHE_TTL for the rest; PAGE_CACHE_TTL=0 switches it off.
+# Gig writes and role changes retire every cached page, so these mostly
+# bound staleness of what signals can't see (e.g. queryset.update()).
+PAGE_CACHE_TTL = env("PAGE_CACHE_TTL")
+PAGE_CACHE_TTLS = {
+    "core:about": 60 * 60,
+    "core:contact": 60 * 60,
+}
+# Grouped facet counts for the listing's sidebar, per normalised search
+# (gigs/facets.py). Keyed on the page cache's generation, so gig writes
+# retire them; this bounds what signals can't see.
+FACET_CACHE_TTL = env("FACET_CACHE_TTL")
+
+# Token buckets in front of the write paths (core/ratelimit.py), keyed by
+# scope, then by what a bucket is per. "N/period" allows a burst of N, then
+# N per period. Buckets live in the cache above, so production needs a
+# shared one (Redis) for the limits to hold across workers.
+RATE_LIMIT_ENABLED = env("RATE_LIMIT_ENABLED")
+RATE_LIMITS = {
+    "apply": {"user": "20/h", "ip": "60/h", "gig": "120/m"},
+    "signup": {"ip": "5/h"},
+    "login": {"ip": "30/10m", "username": "10/10m"},
+    "checkout": {"user": "10/10m"},
+}
+# Behind a proxy REMOTE_ADDR is the proxy. Name the META key of the header
+# it appends the client address to (e.g. HTTP_X_FORWARDED_FOR); the last
+# entry is used, since earlier ones come from the client.
+RATE_LIMIT_IP_HEADER = env("RATE_LIMIT_IP_HEADER")
 
 # ---------------------------------------------------------------------------
 # Passwords / auth
@@ -120,6 +274,10 @@ AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.NumericPasswordValidator"},
 ]
 
+# Same checks as ModelBackend; also joins the profile so the navbar's
+# user.userprofile lookups don't cost a query per request.
+AUTHENTICATION_BACKENDS = ["accounts.backends.UserProfileBackend"]
+
 LOGIN_URL = "accounts:login"
 LOGIN_REDIRECT_URL = "gigs:gig_list"
 LOGOUT_REDIRECT_URL = "core:home"
@@ -189,6 +347,10 @@ STRIPE_PUBLISHABLE_KEY = env("STRIPE_PUBLISHABLE_KEY", default="")
 STRIPE_SECRET_KEY = env("STRIPE_SECRET_KEY", default="")
 STRIPE_WEBHOOK_SECRET = env("STRIPE_WEBHOOK_SECRET", default="")
 FEATURED_GIG_PRICE = env("FEATURED_GIG_PRICE")
+FEATURED_GIG_DAYS = env("FEATURED_GIG_DAYS")
+# Seconds between in-process featured-expiry runs (gigs/featured.py);
+# 0 leaves it to `manage.py expire_featured_gigs` from cron.
+FEATURED_EXPIRY_INTERVAL = env("FEATURED_EXPIRY_INTERVAL")
 STRIPE_CURRENCY = "gbp"
 PAYMENTS_ENABLED = bool(STRIPE_SECRET_KEY and STRIPE_PUBLISHABLE_KEY)
 
@@ -222,10 +384,22 @@ LOGGING = {
     },
 }
 
-# Tests use in-memory sqlite for speed & isolation.
-if "test" in sys.argv or "pytest" in sys.modules:
-    DATABASES["default"] = {
+# Tests use in-memory sqlite for speed & isolation. Point TEST_DATABASE_URL
+# at a Postgres server to run them (including the concurrency tests, which
+# SQLite serialises) against the production engine.
+if TESTING:
+    DATABASES["default"] = env.db_url("TEST_DATABASE_URL", default="sqlite://:memory:")
+    # A separate SQLite file standing in for a replica that never catches
+    # up, so core/test_db_router.py can see which database served a read.
+    # Tests opt in with DATABASE_REPLICAS = ["replica"].
+    for _alias in DATABASE_REPLICAS:
+        del DATABASES[_alias]
+    _replica_file = str(Path(tempfile.gettempdir()) / "quickgigs-test-replica.sqlite3")
+    DATABASES["replica"] = {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": ":memory:",
+        "NAME": _replica_file,
+        "TEST": {"NAME": _replica_file},
     }
+    DATABASE_REPLICAS = []
     PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
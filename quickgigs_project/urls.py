@@ -10,6 +10,7 @@ urlpatterns = [
     path("accounts/", include("accounts.urls")),
     path("gigs/", include("gigs.urls")),
     path("payments/", include("payments.urls")),
+    path("api/v1/", include("gigs.api_urls")),
 ]
 
 if settings.DEBUG:
@@ -12,3 +12,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "quickgigs_project.settings")
 
 application = get_wsgi_application()
+
+# After setup, so settings and the app registry are ready.
+from gigs.featured import start_expiry_runner  # noqa: E402
+
+start_expiry_runner()
@@ -0,0 +1,86 @@
+"""Benchmark gig-card rendering: plain includes vs the fragment cache.
+
+Usage::
+
+    python scripts/bench_cards.py                        # 12, 48, 100 cards
+    python scripts/bench_cards.py --cards 12 --repeat 200
+    CACHE_URL=redis://localhost:6379/9 python scripts/bench_cards.py
+
+For each page size it times rendering that many ``_gig_card.html`` cards
+three ways: one render per card (the old ``{% include %}`` loop), the
+fragment cache from cold (every card a miss) and warm (one ``get_many``).
+The cache is whatever ``CACHE_URL`` selects; set it to a Redis server to
+include the network round trip.
+"""
+
+from __future__ import annotations
+
+import argparse
+from decimal import Decimal
+
+from benchlib import report, sample, setup_django
+
+
+def seed(count: int) -> None:
+    from django.contrib.auth import get_user_model
+
+    from gigs.models import Gig
+
+    existing = Gig.objects.count()
+    if existing >= count:
+        return
+    employer, _ = get_user_model().objects.get_or_create(username="bench_employer")
+    Gig.objects.bulk_create(
+        Gig(
+            title=f"Benchmark gig {i}: build a landing page",
+            description="A clean, fast landing page in Next.js. " * 8,
+            employer=employer,
+            budget=Decimal(100 + i),
+            location="Remote",
+            category=Gig.Category.WEB_DEV,
+            is_featured=i % 10 == 0,
+        )
+        for i in range(existing, count)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, nargs="+", default=[12, 48, 100])
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    url = setup_django()
+
+    from django.core.cache import cache, caches
+    from django.template.loader import get_template
+
+    from gigs import cards
+    from gigs.models import Gig
+
+    seed(max(args.cards))
+    template = get_template(cards.CARD_TEMPLATE)
+
+    print(f"Database: {url}")
+    print(f"Cache:    {type(caches['default']).__name__}")
+    for count in sorted(args.cards):
+        gigs = list(Gig.objects.available().select_related("employer")[:count])
+
+        def uncached(gigs=gigs):
+            return "".join(template.render({"gig": gig}) for gig in gigs)
+
+        def cold(gigs=gigs):
+            cache.clear()
+            return cards.render_cards(gigs)
+
+        def warm(gigs=gigs):
+            return cards.render_cards(gigs)
+
+        print(f"\n{count} cards")
+        report("render every card", sample(uncached, args.repeat))
+        report("fragment cache, cold", sample(cold, args.repeat))
+        report("fragment cache, warm", sample(warm, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
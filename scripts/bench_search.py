@@ -0,0 +1,120 @@
+"""Benchmark gig search: full-text index vs the old icontains scan.
+
+Usage::
+
+    python scripts/bench_search.py                      # 10k, 100k, 1M gigs
+    python scripts/bench_search.py --sizes 10000 --repeat 50
+    BENCH_DATABASE_URL=postgres://… python scripts/bench_search.py
+
+For each catalogue size it seeds that many gigs, then times what
+``GigListView`` does for a search — the first page plus the paginator's
+COUNT — through both paths and prints p50/p95 latency.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from benchlib import report, sample, setup_django
+
+DOMAIN_WORDS = (
+    "landing page react django python logo brand design copy blog seo email "
+    "newsletter video edit podcast translate spanish french data entry excel "
+    "spreadsheet shopify wordpress api backend frontend mobile ios android "
+    "illustration animation marketing campaign social audit research report "
+    "migration postgres cloud aws docker kubernetes testing qa accessibility"
+).split()
+QUERIES = ["logo", "django api", "translate spanish", "shop", "kubernetes docker migration"]
+
+
+def vocabulary(rng: random.Random) -> tuple[list[str], list[float]]:
+    """Domain terms mixed into a Zipf-weighted filler vocabulary.
+
+    Real descriptions are mostly filler with the occasional domain term, so
+    a search for "logo" should hit a few percent of the catalogue, not all of it.
+    """
+    filler = [
+        "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 9))) for _ in range(5000)
+    ]
+    words = filler + DOMAIN_WORDS
+    weights = [1 / (rank + 1) for rank in range(len(filler))] + [0.002] * len(DOMAIN_WORDS)
+    return words, weights
+
+
+def seed(target: int) -> None:
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from gigs import search
+    from gigs.models import Gig
+
+    existing = Gig.objects.count()
+    if existing >= target:
+        return
+    employer, _ = get_user_model().objects.get_or_create(username="bench_employer")
+    rng = random.Random(target)
+    categories = [c for c, _ in Gig.Category.choices]
+    words, weights = vocabulary(random.Random(0))
+    featured_until = timezone.now() + timedelta(days=30)
+    batch = []
+    for i in range(existing, target):
+        batch.append(
+            Gig(
+                title=" ".join(rng.choices(DOMAIN_WORDS, k=3)).capitalize(),
+                description=" ".join(rng.choices(words, weights, k=rng.randint(60, 180))),
+                employer=employer,
+                budget=Decimal(rng.randint(50, 5000)),
+                location=rng.choice(["Remote", "London", "Berlin", "New York"]),
+                category=rng.choice(categories),
+                is_featured=i % 50 == 0,
+                featured_until=featured_until if i % 50 == 0 else None,
+            )
+        )
+        if len(batch) == 5000:
+            Gig.objects.bulk_create(batch)
+            batch.clear()
+    if batch:
+        Gig.objects.bulk_create(batch)
+    search.rebuild_index()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    url = setup_django()
+
+    from django.db.models import Q
+
+    from gigs import search
+    from gigs.models import Gig
+
+    def icontains(q):
+        qs = Gig.objects.filter(is_active=True).select_related("employer")
+        qs = qs.filter(Q(title__icontains=q) | Q(description__icontains=q))
+        return lambda: (list(qs[:12]), qs.count())
+
+    def indexed(q):
+        qs = Gig.objects.filter(is_active=True).select_related("employer")
+        qs = search.search(qs.with_featured_now(), q)
+        qs = qs.order_by("-featured_now", "-search_rank", "-created_at")
+        return lambda: (list(qs[:12]), qs.count())
+
+    print(f"Database: {url}")
+    for size in sorted(args.sizes):
+        seed(size)
+        print(f"\n{size:,} gigs")
+        for label, build in (("icontains", icontains), ("full-text index", indexed)):
+            timings = []
+            for q in QUERIES:
+                timings += sample(build(q), max(1, args.repeat // len(QUERIES)))
+            report(label, timings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark application triage: one save per row vs one bulk UPDATE.
+
+Usage::
+
+    python scripts/bench_triage.py                     # 100, 1000, 5000 applications
+    python scripts/bench_triage.py --applications 2000 --repeat 5
+
+For each size it seeds a gig with that many pending applications, then
+times moving all of them to "reviewed" and back two ways: the
+``update_application_status`` path (load each application with its gig,
+save it) and ``ApplicationQuerySet.set_status`` (what the bulk triage
+endpoint runs).
+"""
+
+from __future__ import annotations
+
+import argparse
+from decimal import Decimal
+
+from benchlib import report, sample, setup_django
+
+
+def seed(count: int):
+    from django.contrib.auth import get_user_model
+
+    from gigs.models import Application, Gig
+
+    User = get_user_model()
+    employer, _ = User.objects.get_or_create(username="bench_employer")
+    gig = Gig.objects.create(
+        title=f"Triage benchmark ({count} applications)",
+        description="A popular gig.",
+        employer=employer,
+        budget=Decimal(500),
+        location="Remote",
+        category=Gig.Category.WEB_DEV,
+    )
+    applicants = User.objects.bulk_create(
+        User(username=f"bench_triage_{gig.pk}_{i}", password="!") for i in range(count)
+    )
+    Application.objects.bulk_create(
+        Application(gig=gig, applicant=applicant, cover_letter="x" * 200)
+        for applicant in applicants
+    )
+    Gig.objects.filter(pk=gig.pk).recount_applications()
+    return gig
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--applications", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    url = setup_django()
+
+    from gigs.models import Application
+
+    print(f"Database: {url}")
+    for count in sorted(args.applications):
+        gig = seed(count)
+        ids = list(gig.applications.values_list("pk", flat=True))
+        flip = iter([Application.Status.REVIEWED, Application.Status.PENDING] * 1000)
+
+        def per_row(ids=ids, flip=flip):
+            status = next(flip)
+            for pk in ids:
+                application = Application.objects.select_related("gig").get(pk=pk)
+                application.status = status
+                application.save()
+
+        def bulk(ids=ids, flip=flip):
+            Application.objects.filter(pk__in=ids).set_status(next(flip))
+
+        print(f"\n{count} applications")
+        report("save per application", sample(per_row, args.repeat))
+        report("set_status (one UPDATE)", sample(bulk, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
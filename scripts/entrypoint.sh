@@ -4,7 +4,13 @@
 #
 # Modes:
 #   web       — production: collectstatic, migrate, gunicorn (default)
+#   web-threaded — as web, but gthread workers sharing a per-process
+#                  psycopg connection pool (DB_POOL=True)
+#   web-asgi  — as web, but ASGI: uvicorn workers under gunicorn, serving
+#               the async read views natively
 #   web-dev   — development: migrate, runserver with autoreload
+#   worker    — apply queued Stripe webhook events (process_webhooks) and
+#               expire featured gigs every FEATURED_EXPIRY_INTERVAL seconds
 #   migrate   — run migrations and exit
 #   manage    — pass remaining args to manage.py
 #   bash      — drop into a shell
@@ -24,23 +30,51 @@ collect_static() {
   python manage.py collectstatic --noinput --clear
 }
 
+start_gunicorn() {
+  exec gunicorn "${GUNICORN_APP:-quickgigs_project.wsgi:application}" \
+    --bind "0.0.0.0:${PORT:-8000}" \
+    --workers "${GUNICORN_WORKERS:-3}" \
+    --timeout "${GUNICORN_TIMEOUT:-60}" \
+    --access-logfile - \
+    --error-logfile - \
+    "$@"
+}
+
 case "$cmd" in
   web)
     collect_static
     run_migrations
     echo "→ Starting gunicorn on :${PORT:-8000}…"
-    exec gunicorn quickgigs_project.wsgi:application \
-      --bind "0.0.0.0:${PORT:-8000}" \
-      --workers "${GUNICORN_WORKERS:-3}" \
-      --timeout "${GUNICORN_TIMEOUT:-60}" \
-      --access-logfile - \
-      --error-logfile -
+    start_gunicorn
+    ;;
+  web-threaded)
+    collect_static
+    run_migrations
+    # One pool per worker process; size it to the thread count so a thread
+    # never waits for a connection unless the database is the bottleneck.
+    threads=${GUNICORN_THREADS:-4}
+    export DB_POOL=${DB_POOL:-True}
+    export DB_POOL_MAX_SIZE=${DB_POOL_MAX_SIZE:-$threads}
+    echo "→ Starting gunicorn (gthread, ${threads} threads, pooled DB) on :${PORT:-8000}…"
+    start_gunicorn --worker-class gthread --threads "$threads"
+    ;;
+  web-asgi)
+    collect_static
+    run_migrations
+    echo "→ Starting gunicorn (uvicorn workers, ASGI) on :${PORT:-8000}…"
+    GUNICORN_APP=quickgigs_project.asgi:application \
+      start_gunicorn --worker-class uvicorn_worker.UvicornWorker
     ;;
   web-dev)
     run_migrations
     echo "→ Starting Django runserver on :${PORT:-8000}…"
     exec python manage.py runserver "0.0.0.0:${PORT:-8000}"
     ;;
+  worker)
+    export FEATURED_EXPIRY_INTERVAL=${FEATURED_EXPIRY_INTERVAL:-300}
+    echo "→ Starting Stripe webhook worker (featured expiry every ${FEATURED_EXPIRY_INTERVAL}s)…"
+    exec python manage.py process_webhooks "$@"
+    ;;
   migrate)
     run_migrations
     ;;
@@ -52,7 +86,7 @@ case "$cmd" in
     ;;
   *)
     echo "Unknown command: $cmd" >&2
-    echo "Usage: $0 {web|web-dev|migrate|manage [args]|bash}" >&2
+    echo "Usage: $0 {web|web-threaded|web-asgi|web-dev|worker|migrate|manage [args]|bash}" >&2
     exit 1
     ;;
 esac